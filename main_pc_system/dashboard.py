@@ -297,6 +297,57 @@ with tab1:
                 format="%.3f"
             )
             
+            adc_mode = st.selectbox(
+                "ADC Mode",
+                options=["precision", "fast"],
+                help="precision: 128 SPS, lower noise. fast: 860 SPS, shorter sweeps"
+            )
+            
+            settle_mode = st.selectbox(
+                "Settle Mode",
+                options=["fixed", "adaptive"],
+                help="fixed: wait Settle Time at every point. adaptive: move on once readings are stable (Settle Time is the upper bound)"
+            )
+            
+            oversample_max_samples = st.number_input(
+                "Max Samples per Point",
+                min_value=1,
+                max_value=64,
+                value=1,
+                step=1,
+                help="Average up to this many readings per point, stopping early once the standard error is small (1 = off)"
+            )
+            
+            stop_after_voc_points = st.number_input(
+                "Stop Points past Voc (0 = off)",
+                min_value=0,
+                max_value=50,
+                value=0,
+                step=1,
+                help="End each sweep this many points after the current changes sign"
+            )
+            
+            predict_current_limit = st.checkbox(
+                "Stop before Current Limit",
+                value=False,
+                help="Extrapolate the current and end the sweep before a point would exceed the current limit"
+            )
+            
+            sweep_mode = st.selectbox(
+                "Sweep Mode",
+                options=["linear", "adaptive"],
+                help="linear: every Voltage Step. adaptive: coarse pass refined around MPP and Voc"
+            )
+            
+            max_points = st.number_input(
+                "Max Points (adaptive)",
+                min_value=5,
+                max_value=500,
+                value=40,
+                step=1,
+                help="Point budget per pixel sweep in adaptive mode"
+            )
+            
             sweep_interval = st.number_input(
                 "IV Sweep Interval (minutes) *",
                 min_value=1,
@@ -374,7 +425,14 @@ with tab1:
                 "voltage_step": voltage_step,
                 "settle_time": settle_time,
                 "sweep_interval_minutes": sweep_interval,
-                "measurement_type": "iv_sweep"
+                "measurement_type": "iv_sweep",
+                "adc_mode": adc_mode,
+                "settle_mode": settle_mode,
+                "oversample_max_samples": oversample_max_samples,
+                "stop_after_voc_points": stop_after_voc_points or None,
+                "predict_current_limit": predict_current_limit,
+                "sweep_mode": sweep_mode,
+                "max_points": max_points
             }
             
             with st.spinner(f"Starting measurement on {selected_rpi_name}..."):
@@ -8,7 +8,7 @@ Raspberry Pi API Server
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, File, UploadFile
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Sequence
 import uvicorn
 import os
 import threading
@@ -29,9 +29,29 @@ from software.hardware.constants import (
     IV_SWEEP_INTERVAL_HOURS,
     MAIN_PC_IP,
     MAIN_PC_PORT,
-    FILE_TRANSFER_TIMEOUT
+    FILE_TRANSFER_TIMEOUT,
+    ADC_DATA_RATE_MODES,
+    ADC_DEFAULT_MODE,
+    ADAPTIVE_MAX_POINTS,
+    ADAPTIVE_PMAX_TOLERANCE,
+    ADAPTIVE_FF_TOLERANCE,
+    SETTLE_MODES,
+    SETTLE_TOLERANCE,
+    SETTLE_MIN_TIME,
+    OVERSAMPLE_MAX_SAMPLES,
+    OVERSAMPLE_STDERR_VOLTAGE,
+    OVERSAMPLE_STDERR_CURRENT,
+    SPOT_MAX_POINTS,
+    SPOT_DEFAULT_INTERVAL,
+    MPPT_DEFAULT_STRATEGY,
+    BUS_OPERATION_TIMEOUT,
+    BOARD_SCAN_CACHE_DIRECTORY
 )
-from software import get_hardware_classes
+from software.hardware.sweep import (
+    SweepPlan, AdaptiveGrid, SettleCriterion, Oversampling, TerminationPolicy, SpotSearch, iv_summary,
+    mpp_curvature
+)
+from software.hardware.mppt import MPPTEngine, MPPT_STRATEGIES
 
 app = FastAPI(title="OctoBoard RPi API", version="2.0.0")
 
@@ -39,7 +59,15 @@ app = FastAPI(title="OctoBoard RPi API", version="2.0.0")
 board_manager = None
 measurement_tasks = {}  # {sample_id: {pixel: {status, start_time, ...}}}
 sample_configs = {}  # {sample_id: MeasurementConfig}
+iv_summaries = {}  # {(sample_id, pixel): iv_summary of the latest sweep}
+mppt_engine = None  # MPPTEngine holding the pixels of "mppt" samples at MPP between sweeps
+mppt_engine_lock = threading.Lock()
 rpi_id = os.environ.get('RPI_ID', 'rpi_1')
+scheduler_wakeup = threading.Event()  # Set when jobs are added, so the scheduler picks them up at once
+
+SWEEP_MODES = ["linear", "adaptive"]
+MEASUREMENT_TYPES = ["iv_sweep", "spot", "mppt"]
+SPOT_LOG_FIELDS = ["timestamp", "isc", "voc", "vmpp", "impp", "pmax", "ff", "points", "stop_reason"]
 
 # ==================== Data Models ====================
 
@@ -52,11 +80,28 @@ class MeasurementConfig(BaseModel):
     start_voltage: float  # V
     stop_voltage: float  # V
     voltage_step: float  # V
-    settle_time: float  # seconds
+    settle_time: float  # seconds (maximum dwell in adaptive settle mode)
     sweep_interval_minutes: int = 60  # IV sweep interval in minutes (1-1000)
-    measurement_type: str = "iv_sweep"  # or "mppt"
+    measurement_type: str = "iv_sweep"  # "iv_sweep", "spot" (IV sweeps plus quick Isc/Voc/MPP in between) or "mppt" (IV sweeps, held at MPP in between)
+    spot_interval_seconds: int = SPOT_DEFAULT_INTERVAL  # Spot: interval between spot measurements
+    spot_max_points: int = SPOT_MAX_POINTS  # Spot: point budget per pixel
     mppt_iterations: Optional[int] = 100
     mppt_interval: Optional[float] = 0.01
+    mppt_strategy: str = MPPT_DEFAULT_STRATEGY  # MPPT: "perturb_observe", "incremental_conductance" or "golden_section"
+    adc_mode: str = ADC_DEFAULT_MODE  # "fast" (860 SPS) or "precision" (128 SPS)
+    adc_data_rate: Optional[int] = None  # Explicit ADS1115 data rate (SPS), overrides adc_mode
+    sweep_mode: str = "linear"  # "linear" (start/stop/step grid) or "adaptive" (refined around MPP/Voc)
+    max_points: int = ADAPTIVE_MAX_POINTS  # Adaptive: point budget per pixel sweep
+    pmax_tolerance: float = ADAPTIVE_PMAX_TOLERANCE  # Adaptive: relative Pmax change to stop refining
+    ff_tolerance: float = ADAPTIVE_FF_TOLERANCE  # Adaptive: relative FF change to stop refining
+    settle_mode: str = "fixed"  # "fixed" (dwell settle_time) or "adaptive" (read until stable)
+    settle_tolerance: float = SETTLE_TOLERANCE  # Adaptive settle: max change between readings (V)
+    min_settle_time: float = SETTLE_MIN_TIME  # Adaptive settle: minimum dwell (seconds)
+    oversample_max_samples: int = OVERSAMPLE_MAX_SAMPLES  # Readings averaged per point at most (1 = off)
+    oversample_stderr_voltage: float = OVERSAMPLE_STDERR_VOLTAGE  # Stop averaging below this standard error (V)
+    oversample_stderr_current: float = OVERSAMPLE_STDERR_CURRENT  # Stop averaging below this standard error (A)
+    stop_after_voc_points: Optional[int] = None  # End the sweep this many points past Voc (None = sweep to stop_voltage)
+    predict_current_limit: bool = False  # End the sweep before a point predicted to exceed current_limit
 
 
 class RPiStatus(BaseModel):
@@ -67,6 +112,10 @@ class RPiStatus(BaseModel):
     total_samples_capacity: int
     active_samples: int
     main_pc_connected: bool
+    i2c_buses: List[int] = []
+    hardware: Optional[Dict[str, Any]] = None  # Board bring-up state per bus
+    bus_stats: Optional[Dict[int, Any]] = None  # I2C executor latency stats per bus
+    mppt: Optional[Dict[str, Any]] = None  # MPP tracker rate and convergence (once "mppt" samples ran)
 
 
 # ==================== Hardware Initialization ====================
@@ -81,12 +130,15 @@ async def startup_event():
     print(f"[{rpi_id}] Total Channels: {TOTAL_CHANNELS_PER_RPI}")
     print(f"[{rpi_id}] Sample Capacity: {SAMPLES_PER_RPI}")
     
-    # Initialize hardware
-    OBoardManager, _, _, _ = get_hardware_classes()
-    i2c_num = int(os.environ.get('OCTOBOARD_I2C_BUS', '1'))
-    board_manager = OBoardManager(i2c_num=i2c_num)
+    # Initialize hardware: one manager and one worker per I2C bus, boards
+    # numbered across buses in the order given (e.g. OCTOBOARD_I2C_BUSES="1,3").
+    # Boards come up in the background (see /status) so the API is available at once.
+    from software.hardware import MultiBusManager
+    buses = os.environ.get('OCTOBOARD_I2C_BUSES', os.environ.get('OCTOBOARD_I2C_BUS', '1'))
+    i2c_nums = [int(bus) for bus in buses.replace(',', ' ').split()]
+    board_manager = MultiBusManager(i2c_nums, scan_cache=BOARD_SCAN_CACHE_DIRECTORY, background=True)
     
-    print(f"[{rpi_id}] Initialized {len(board_manager.oboards)} boards")
+    print(f"[{rpi_id}] Bringing up boards on I2C buses {i2c_nums}")
     
     # Start scheduler thread for periodic IV sweeps
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
@@ -94,11 +146,24 @@ async def startup_event():
     print(f"[{rpi_id}] Scheduler started (per-sample intervals)")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop MPP tracking; the channels stay at their last set point."""
+    if mppt_engine is not None:
+        mppt_engine.stop()
+
+
 def run_scheduler():
-    """Run the scheduler in background thread - checks every minute."""
+    """Run the scheduler in background thread.
+
+    Sleeps until the next job is due (at most a minute) or jobs are added,
+    so that spot measurements with intervals below a minute run on time.
+    """
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        idle = schedule.idle_seconds()
+        scheduler_wakeup.wait(60 if idle is None else min(max(idle, 0.1), 60))
+        scheduler_wakeup.clear()
 
 
 # ==================== API Endpoints ====================
@@ -132,7 +197,11 @@ async def get_status():
         total_channels=actual_channels,  # Actual available channels
         total_samples_capacity=actual_samples_capacity,  # Actual sample capacity
         active_samples=len(sample_configs),
-        main_pc_connected=main_pc_connected
+        main_pc_connected=main_pc_connected,
+        i2c_buses=board_manager.i2c_nums if board_manager else [],
+        hardware=board_manager.status() if board_manager else None,
+        bus_stats=board_manager.bus_stats() if board_manager else None,
+        mppt=get_mppt_status()
     )
 
 
@@ -150,10 +219,12 @@ async def list_channels():
             board_idx = ch_idx // 8
             local_ch = ch_idx % 8
             
+            available = board_manager is not None and board_idx < len(board_manager.oboards)
             sample_channels.append({
                 "pixel": pixel_name,
                 "channel_index": ch_idx,
                 "board_index": board_idx,
+                "i2c_bus": board_manager.oboards[board_idx].i2c_num if available else None,
                 "local_channel": local_ch,
                 "status": "active" if is_channel_active(ch_idx) else "idle"
             })
@@ -175,6 +246,11 @@ async def start_measurement(config: MeasurementConfig, background_tasks: Backgro
     # Check actual available channels based on connected boards
     actual_channels = len(board_manager.oboards) * 8 if board_manager else 0
     
+    # Boards join in offset order during bring-up, so channel indices only
+    # point at fixed cells once every bus is ready
+    if board_manager is not None and board_manager.state != "ready":
+        raise HTTPException(503, f"Boards still coming up ({actual_channels} channels available so far)")
+    
     # Validate channel range
     if config.start_channel < 0 or config.start_channel + 3 >= actual_channels:
         raise HTTPException(400, f"Invalid start_channel. Only {actual_channels} channels available (must be 0-{actual_channels-4})")
@@ -182,6 +258,36 @@ async def start_measurement(config: MeasurementConfig, background_tasks: Backgro
     if config.start_channel % 4 != 0:
         raise HTTPException(400, "start_channel must be divisible by 4 (sample alignment)")
     
+    if config.adc_mode not in ADC_DATA_RATE_MODES:
+        raise HTTPException(400, f"Invalid adc_mode. Must be one of {list(ADC_DATA_RATE_MODES)}")
+    
+    if config.sweep_mode not in SWEEP_MODES:
+        raise HTTPException(400, f"Invalid sweep_mode. Must be one of {SWEEP_MODES}")
+    
+    if config.measurement_type not in MEASUREMENT_TYPES:
+        raise HTTPException(400, f"Invalid measurement_type. Must be one of {MEASUREMENT_TYPES}")
+    
+    if config.mppt_strategy not in MPPT_STRATEGIES:
+        raise HTTPException(400, f"Invalid mppt_strategy. Must be one of {list(MPPT_STRATEGIES)}")
+    
+    if config.measurement_type == "spot" and config.spot_interval_seconds < 1:
+        raise HTTPException(400, "spot_interval_seconds must be at least 1")
+    
+    if config.measurement_type == "spot" and config.spot_max_points < 3:
+        raise HTTPException(400, "spot_max_points must be at least 3")
+    
+    if config.settle_mode not in SETTLE_MODES:
+        raise HTTPException(400, f"Invalid settle_mode. Must be one of {SETTLE_MODES}")
+    
+    if config.stop_after_voc_points is not None and config.stop_after_voc_points < 1:
+        raise HTTPException(400, "stop_after_voc_points must be at least 1")
+    
+    if config.oversample_max_samples < 1:
+        raise HTTPException(400, "oversample_max_samples must be at least 1")
+    
+    if config.sweep_mode == "adaptive" and config.max_points < 2:
+        raise HTTPException(400, "max_points must be at least 2")
+    
     # Check if already running
     if config.sample_id in sample_configs:
         raise HTTPException(400, f"Sample {config.sample_id} already running")
@@ -204,12 +310,28 @@ async def start_measurement(config: MeasurementConfig, background_tasks: Backgro
     
     # Schedule periodic IV sweeps for this sample
     schedule.every(config.sweep_interval_minutes).minutes.do(
-        perform_iv_sweep_for_sample, 
+        queue_iv_sweep_for_sample, 
         sample_id=config.sample_id
     ).tag(config.sample_id)  # Tag allows us to cancel later
     
+    # Spot mode: quick Isc/Voc/MPP measurements between the full sweeps
+    if config.measurement_type == "spot":
+        schedule.every(config.spot_interval_seconds).seconds.do(
+            queue_spot_for_sample,
+            sample_id=config.sample_id
+        ).tag(config.sample_id)
+        print(f"[{rpi_id}] Spot measurement interval: {config.spot_interval_seconds} s")
+    scheduler_wakeup.set()
+    
+    # MPPT mode: the pixels are held at MPP from the end of the initial sweep on
+    if config.measurement_type == "mppt":
+        engine = get_mppt_engine()
+        if engine is not None:
+            engine.set_strategy(sample_channel_keys(config.sample_id), config.mppt_strategy)
+        print(f"[{rpi_id}] MPP tracking between sweeps ({config.mppt_strategy})")
+    
     # Perform initial IV sweep immediately
-    background_tasks.add_task(perform_iv_sweep_for_sample, config.sample_id)
+    background_tasks.add_task(queue_iv_sweep_for_sample, config.sample_id)
     
     return {
         "status": "started",
@@ -228,9 +350,12 @@ async def stop_measurement(sample_id: str):
     
     # Cancel scheduled jobs for this sample
     schedule.clear(sample_id)
+    release_mppt_for_sample(sample_id)
     
     del sample_configs[sample_id]
     del measurement_tasks[sample_id]
+    for key in [key for key in iv_summaries if key[0] == sample_id]:
+        del iv_summaries[key]
     
     print(f"[{rpi_id}] Stopped sample {sample_id}")
     
@@ -243,23 +368,123 @@ async def stop_measurement(sample_id: str):
     }
 
 
+@app.post("/measurement/sweep_all")
+async def sweep_all_samples(background_tasks: BackgroundTasks):
+    """Run one interleaved IV sweep round across all active samples."""
+    if not sample_configs:
+        raise HTTPException(400, "No active samples")
+    
+    sample_ids = list(sample_configs.keys())
+    background_tasks.add_task(perform_iv_sweep_round, sample_ids)
+    
+    return {
+        "status": "started",
+        "sample_ids": sample_ids,
+        "message": f"Interleaved IV sweep round started for {len(sample_ids)} sample(s)"
+    }
+
+
+@app.post("/hardware/rescan")
+def rescan_hardware():
+    """Scan all I2C buses again and add boards plugged in since startup.
+
+    New boards get channel indices after the existing ones, whatever their
+    bus and address offset, so running samples, MPP tracking and sweep
+    summaries keep pointing at the same cells.
+    """
+    if board_manager is None:
+        raise HTTPException(503, "Hardware not initialized")
+    if board_manager.state != "ready":
+        raise HTTPException(409, f"Board bring-up in progress ({board_manager.state})")
+    
+    added = board_manager.rescan()
+    print(f"[{rpi_id}] Rescan added boards: {added}")
+    if mppt_engine is not None:
+        get_mppt_engine()  # Track the channels of the new boards too
+    
+    return {
+        "added": added,
+        "total_channels": len(board_manager.oboards) * 8,
+        "hardware": board_manager.status()
+    }
+
+
+@app.get("/snapshot")
+def get_snapshot():
+    """Read voltage and current of every channel in one pass.
+
+    The buses are read in parallel, each pass queued between the steps of
+    any sweep in progress, so the sweep schedule is not disturbed. Values
+    are returned as arrays in channel order (V, A, epoch seconds).
+    """
+    if board_manager is None:
+        raise HTTPException(503, "Hardware not initialized")
+    if board_manager.state != "ready":
+        raise HTTPException(503, f"Board bring-up in progress ({board_manager.state})")
+
+    timestamp = datetime.now().isoformat()
+    start = time.perf_counter()
+    readings = board_manager.snapshot()
+    duration = time.perf_counter() - start
+
+    channel_indices = [board_idx * 8 + ch for board_idx, ch in readings]
+    return {
+        "timestamp": timestamp,
+        "duration": duration,
+        "channel_index": channel_indices,
+        "i2c_bus": [board_manager.oboards[board_idx].i2c_num for board_idx, _ in readings],
+        "active": [is_channel_active(ch_idx) for ch_idx in channel_indices],
+        "voltage": [voltage for voltage, _, _ in readings.values()],
+        "current": [current for _, current, _ in readings.values()],
+        "time": [reading_time for _, _, reading_time in readings.values()],
+    }
+
+
 @app.get("/measurement/{sample_id}")
 async def get_measurement_status(sample_id: str):
     """Get status of a sample measurement."""
     if sample_id not in measurement_tasks:
         raise HTTPException(404, f"Sample {sample_id} not found")
     
-    return {
+    status = {
         "sample_id": sample_id,
         "pixels": measurement_tasks[sample_id],
         "config": sample_configs.get(sample_id)
     }
+    if sample_configs[sample_id]["measurement_type"] == "mppt" and mppt_engine is not None:
+        channels = mppt_engine.stats()["channels"]
+        status["mppt"] = {
+            pixel_name: channels.get(key)
+            for key, pixel_name in zip(sample_channel_keys(sample_id), ['a', 'b', 'c', 'd'])
+        }
+    return status
 
 
 # ==================== Measurement Functions ====================
 
+def queue_iv_sweep_for_sample(sample_id: str):
+    """Hand the IV sweep of a sample to the worker of the I2C bus its board is on.
+
+    Samples on different buses are swept in parallel; samples sharing a bus
+    queue on that bus's worker instead of holding up the scheduler.
+    """
+    if sample_id not in sample_configs:
+        return
+    
+    board_idx = sample_configs[sample_id]["start_channel"] // 8
+    if board_idx >= len(board_manager.oboards):
+        perform_iv_sweep_for_sample(sample_id)  # Reports the missing board
+        return
+    board_manager.submit(board_idx, perform_iv_sweep_for_sample, sample_id)
+
+
 def perform_iv_sweep_for_sample(sample_id: str):
-    """Perform IV sweep for all 4 pixels of a sample."""
+    """Perform IV sweep for all 4 pixels of a sample.
+
+    The 4 pixels of a sample always sit on the same Octoboard, so they are
+    swept together in lockstep: one shared settle per voltage point instead
+    of one per pixel.
+    """
     if sample_id not in sample_configs:
         return
     
@@ -268,63 +493,459 @@ def perform_iv_sweep_for_sample(sample_id: str):
     
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     
+    # Group pixels by board: {board_idx: {local_ch: pixel_name}}
+    boards = {}
+    for pixel_idx, pixel_name in enumerate(['a', 'b', 'c', 'd']):
+        ch_idx = config.start_channel + pixel_idx
+        board_idx = ch_idx // 8
+        local_ch = ch_idx % 8
+        
+        if board_idx >= len(board_manager.oboards):
+            print(f"[{rpi_id}] ERROR: Board {board_idx} not available")
+            continue
+        
+        boards.setdefault(board_idx, {})[local_ch] = pixel_name
+    
+    plan = SweepPlan.for_config(config.start_voltage, config.stop_voltage, config.voltage_step)
+    
+    # MPPT mode: take the pixels off the tracker only while they are swept
+    paused = pause_mppt([sample_id])
+    try:
+        for board_idx, pixels in boards.items():
+            board = board_manager.oboards[board_idx]
+        
+            for local_ch, pixel_name in pixels.items():
+                # Update status
+                measurement_tasks[sample_id][pixel_name]["status"] = "measuring"
+                print(f"[{rpi_id}] IV sweep: {sample_id}/{pixel_name} on channel {board_idx * 8 + local_ch}")
+        
+            try:
+                board.reset_io_stats()
+                if config.sweep_mode == "adaptive":
+                    # Refinement passes run all pixels of the board together
+                    grids = board_manager.run_adaptive_sweep(
+                        {(board_idx, local_ch): create_adaptive_grid(config, sample_id, pixel_name)
+                         for local_ch, pixel_name in pixels.items()},
+                        settle_time=config.settle_time,
+                        current_limits={(board_idx, local_ch): config.current_limit / 1000 for local_ch in pixels},
+                        data_rate=get_adc_data_rate(config),
+                        settle=get_settle_criterion([config]),
+                        oversampling=get_oversampling(config),
+                        termination=get_termination_policy(config)
+                    )
+                    data = {local_ch: grids[(board_idx, local_ch)].columns() for local_ch in pixels}
+                    stops = {local_ch: grids[(board_idx, local_ch)].stop_reason for local_ch in pixels}
+                else:
+                    # Perform lockstep IV sweep (current_limit is in mA)
+                    result = board.run_sweep(
+                        list(pixels.keys()),
+                        plan,
+                        settle_time=config.settle_time,
+                        current_limit=config.current_limit / 1000,
+                        data_rate=get_adc_data_rate(config),
+                        settle=get_settle_criterion([config]),
+                        oversampling=get_oversampling(config),
+                        termination=get_termination_policy(config)
+                    )
+                    data = {local_ch: result.columns(local_ch) for local_ch in pixels}
+                    stops = {local_ch: result.stop_reasons.get(local_ch) for local_ch in pixels}
+            except Exception as e:
+                print(f"[{rpi_id}] ERROR in IV sweep {sample_id} on board {board_idx}: {e}")
+                for pixel_name in pixels.values():
+                    measurement_tasks[sample_id][pixel_name]["status"] = "error"
+                continue
+        
+            io_stats = board.reset_io_stats()
+            print(f"[{rpi_id}] Mux cache on board {board_idx}: {io_stats}")
+        
+            for local_ch, pixel_name in pixels.items():
+                measurement_tasks[sample_id][pixel_name]["io_stats"] = io_stats
+                store_pixel_sweep(sample_id, pixel_name, timestamp, data[local_ch], stops[local_ch])
+    finally:
+        resume_mppt(paused)
+
+
+def queue_spot_for_sample(sample_id: str):
+    """Hand the spot measurement of a sample to the worker of its I2C bus.
+
+    Like full sweeps, spot measurements queue on the bus worker, so they
+    run between sweeps instead of during them.
+    """
+    if sample_id not in sample_configs:
+        return
+    
+    board_idx = sample_configs[sample_id]["start_channel"] // 8
+    if board_idx >= len(board_manager.oboards):
+        print(f"[{rpi_id}] ERROR: Board {board_idx} not available")
+        return
+    board_manager.submit(board_idx, perform_spot_for_sample, sample_id)
+
+
+def perform_spot_for_sample(sample_id: str):
+    """Measure Isc, Voc and MPP of all 4 pixels of a sample with a few dozen points.
+
+    The pixels are measured in lockstep on their board (see OBoard.run_spot),
+    each search seeded with the pixel's latest sweep summary. One line per
+    pixel is appended to its spot log.
+    """
+    if sample_id not in sample_configs:
+        return
+    
+    config = MeasurementConfig(**sample_configs[sample_id])
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    
+    boards = {}
     for pixel_idx, pixel_name in enumerate(['a', 'b', 'c', 'd']):
+        ch_idx = config.start_channel + pixel_idx
+        boards.setdefault(ch_idx // 8, {})[ch_idx % 8] = pixel_name
+    
+    for board_idx, pixels in boards.items():
+        if board_idx >= len(board_manager.oboards):
+            print(f"[{rpi_id}] ERROR: Board {board_idx} not available")
+            continue
+        board = board_manager.oboards[board_idx]
+        searches = {
+            local_ch: SpotSearch(config.start_voltage, config.stop_voltage,
+                                 max_points=config.spot_max_points,
+                                 prior=iv_summaries.get((sample_id, pixel_name)))
+            for local_ch, pixel_name in pixels.items()
+        }
         try:
+            summaries = board.run_spot(
+                searches,
+                settle_time=config.settle_time,
+                current_limit=config.current_limit / 1000,
+                data_rate=get_adc_data_rate(config)
+            )
+        except Exception as e:
+            print(f"[{rpi_id}] ERROR in spot measurement {sample_id} on board {board_idx}: {e}")
+            continue
+        
+        for local_ch, pixel_name in pixels.items():
+            summary = {
+                name: (value if value == value else None)
+                for name, value in summaries[local_ch].items()
+            }
+            summary["stop_reason"] = searches[local_ch].stop_reason
+            measurement_tasks[sample_id][pixel_name]["last_spot"] = {"timestamp": timestamp, **summary}
+            append_spot_log(sample_id, pixel_name, timestamp, summary)
+
+
+def perform_iv_sweep_round(sample_ids: Optional[List[str]] = None):
+    """Perform one IV sweep round for several samples at once.
+
+    All pixels of all requested samples are swept together with the
+    bus-wide interleaved acquisition of OBoardManager, so DAC settling and
+    ADC conversions on one board overlap with bus traffic to the others.
+    Each I2C bus runs its share of the round on its own worker, in parallel.
+    """
+    if sample_ids is None:
+        sample_ids = list(sample_configs.keys())
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    plans = {}
+    grids = {}
+    current_limits = {}
+    oversampling = {}
+    termination = {}
+    pixel_keys = {}  # {(board_idx, local_ch): (sample_id, pixel_name)}
+    settle_time = 0.0
+    data_rate = None
+    configs = []
+    
+    for sample_id in sample_ids:
+        if sample_id not in sample_configs:
+            continue
+        config = MeasurementConfig(**sample_configs[sample_id])
+        configs.append(config)
+        plan = SweepPlan.for_config(config.start_voltage, config.stop_voltage, config.voltage_step)
+        settle_time = max(settle_time, config.settle_time)
+        # Boards are shared, so the quietest requested data rate wins
+        sample_rate = get_adc_data_rate(config)
+        data_rate = sample_rate if data_rate is None else min(data_rate, sample_rate)
+        
+        for pixel_idx, pixel_name in enumerate(['a', 'b', 'c', 'd']):
             ch_idx = config.start_channel + pixel_idx
-            board_idx = ch_idx // 8
-            local_ch = ch_idx % 8
-            
-            if board_idx >= len(board_manager.oboards):
-                print(f"[{rpi_id}] ERROR: Board {board_idx} not available")
+            key = (ch_idx // 8, ch_idx % 8)
+            if key[0] >= len(board_manager.oboards):
+                print(f"[{rpi_id}] ERROR: Board {key[0]} not available")
                 continue
-            
-            channel = board_manager.oboards[board_idx].channel[local_ch]
-            
-            # Update status
+            if config.sweep_mode == "adaptive":
+                grids[key] = create_adaptive_grid(config, sample_id, pixel_name)
+            else:
+                plans[key] = plan
+            current_limits[key] = config.current_limit / 1000  # mA -> A
+            if get_oversampling(config) is not None:
+                oversampling[key] = get_oversampling(config)
+            if get_termination_policy(config) is not None:
+                termination[key] = get_termination_policy(config)
+            pixel_keys[key] = (sample_id, pixel_name)
             measurement_tasks[sample_id][pixel_name]["status"] = "measuring"
-            
-            print(f"[{rpi_id}] IV sweep: {sample_id}/{pixel_name} on channel {ch_idx}")
-            
-            # Perform IV sweep
-            import numpy as np
-            data = []
-            
-            for voltage in np.arange(config.start_voltage, 
-                                    config.stop_voltage + config.voltage_step, 
-                                    config.voltage_step):
-                channel.set_voltage(voltage)
-                time.sleep(config.settle_time)
-                
-                v = channel.read_voltage()
-                i = channel.read_current()
-                
-                # Check current limit
-                if abs(i * 1000) > config.current_limit:
-                    print(f"[{rpi_id}] Current limit exceeded: {sample_id}/{pixel_name}")
-                    break
-                
-                data.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "voltage": v,
-                    "current": i,
-                    "power": v * i
-                })
-            
-            channel.set_voltage(0)  # Safety
-            
-            # Save IV data locally
-            local_file = save_iv_data_locally(sample_id, pixel_name, timestamp, data)
-            
-            # Transfer to Main PC
-            transfer_file_to_main_pc(sample_id, pixel_name, local_file)
-            
-            # Update status
-            measurement_tasks[sample_id][pixel_name]["status"] = "idle"
-            measurement_tasks[sample_id][pixel_name]["last_iv"] = timestamp
-            
+    
+    if not pixel_keys:
+        return
+    
+    print(f"[{rpi_id}] Interleaved IV sweep round: {len(plans)} linear, {len(grids)} adaptive channels")
+    
+    settle = get_settle_criterion(configs)
+    
+    # MPPT mode: take the pixels off the tracker only while they are swept
+    paused = pause_mppt(sample_ids)
+    try:
+        try:
+            board_manager.reset_io_stats()
+            data = {}
+            stops = {}
+            if plans:
+                results = board_manager.run_interleaved_sweep(
+                    plans, settle_time=settle_time, current_limits=current_limits, data_rate=data_rate,
+                    settle=settle, oversampling=oversampling or None, termination=termination or None
+                )
+                data.update({key: results[key].columns(key) for key in plans})
+                stops.update({key: results[key].stop_reasons.get(key) for key in plans})
+            if grids:
+                grids = board_manager.run_adaptive_sweep(
+                    grids, settle_time=settle_time, current_limits=current_limits, data_rate=data_rate,
+                    settle=settle, oversampling=oversampling or None, termination=termination or None
+                )
+                data.update({key: grid.columns() for key, grid in grids.items()})
+                stops.update({key: grid.stop_reason for key, grid in grids.items()})
         except Exception as e:
-            print(f"[{rpi_id}] ERROR in IV sweep {sample_id}/{pixel_name}: {e}")
-            measurement_tasks[sample_id][pixel_name]["status"] = "error"
+            print(f"[{rpi_id}] ERROR in interleaved IV sweep round: {e}")
+            for sample_id, pixel_name in pixel_keys.values():
+                measurement_tasks[sample_id][pixel_name]["status"] = "error"
+            return
+    
+        io_stats = board_manager.reset_io_stats()
+        print(f"[{rpi_id}] Mux cache for sweep round: {io_stats}")
+    
+        for key, (sample_id, pixel_name) in pixel_keys.items():
+            measurement_tasks[sample_id][pixel_name]["io_stats"] = io_stats
+            store_pixel_sweep(sample_id, pixel_name, timestamp, data[key], stops[key])
+    finally:
+        resume_mppt(paused)
+
+
+# ==================== MPP Tracking ====================
+
+def get_mppt_engine() -> Optional[MPPTEngine]:
+    """Get the MPPT engine over every channel of the connected boards, starting it on first use.
+
+    One engine tracks all channels in shared passes (see MPPTEngine); only
+    the pixels of "mppt" samples that were swept before and are not being
+    swept now are active, the others are paused and cost no bus time. The engine is rebuilt when
+    boards were added. Returns None while the boards are coming up.
+    """
+    global mppt_engine
+    if board_manager is None or board_manager.state != "ready":
+        return None
+
+    with mppt_engine_lock:
+        if mppt_engine is not None and len(mppt_engine.channels) == len(board_manager.oboards) * 8:
+            return mppt_engine
+        if mppt_engine is not None:
+            mppt_engine.stop()
+
+        engine = MPPTEngine(board_manager)
+        engine.pause()
+        for sample_id, config in sample_configs.items():
+            if config["measurement_type"] != "mppt":
+                continue
+            keys = sample_channel_keys(sample_id)
+            engine.set_strategy(keys, config["mppt_strategy"])
+            # Only pixels swept before are held; the others start after their first sweep
+            summaries = get_mppt_warm_starts(sample_id)
+            idle = [key for key, pixel_name in zip(keys, ['a', 'b', 'c', 'd'])
+                    if key in summaries and measurement_tasks[sample_id][pixel_name]["status"] != "measuring"]
+            engine.resume(idle, summaries)
+        engine.start()
+        mppt_engine = engine
+        print(f"[{rpi_id}] MPP tracking started on {len(engine.channels)} channels")
+        return mppt_engine
+
+
+def get_mppt_status() -> Optional[Dict[str, Any]]:
+    """Tracking rate, per-bus pass stats and convergence of the MPPT engine (None if not started)."""
+    if mppt_engine is None:
+        return None
+    stats = mppt_engine.stats()
+    return {
+        "target_rate": stats["target_rate"],
+        "rate": stats["rate"],
+        "tracking": sum(bus["active"] for bus in stats["buses"].values()),
+        "buses": stats["buses"],
+        "convergence": stats["convergence"],
+    }
+
+
+def sample_channel_keys(sample_id: str) -> List[tuple]:
+    """(board_index, channel_index) of the 4 pixels of a sample, in pixel order."""
+    start_channel = sample_configs[sample_id]["start_channel"]
+    return [((start_channel + pixel_idx) // 8, (start_channel + pixel_idx) % 8)
+            for pixel_idx in range(PIXELS_PER_SAMPLE)]
+
+
+def get_mppt_warm_starts(sample_id: str) -> Dict[tuple, Dict[str, float]]:
+    """Latest sweep summaries of a sample's pixels by channel, for MPPTEngine.warm_start (None -> NaN)."""
+    summaries = {}
+    for key, pixel_name in zip(sample_channel_keys(sample_id), ['a', 'b', 'c', 'd']):
+        summary = iv_summaries.get((sample_id, pixel_name))
+        if summary is not None:
+            summaries[key] = {
+                name: float("nan") if summary.get(name) is None else summary[name]
+                for name in ("vmpp", "pmax", "curvature")
+            }
+    return summaries
+
+
+def pause_mppt(sample_ids: List[str]) -> List[str]:
+    """Take the pixels of the "mppt" samples among ``sample_ids`` off the tracker, e.g. for their sweep.
+
+    Returns once no tracking pass writes them any more.
+
+    Returns:
+        list: The paused sample IDs, to hand to resume_mppt afterwards.
+    """
+    paused = [sample_id for sample_id in sample_ids
+              if sample_configs.get(sample_id, {}).get("measurement_type") == "mppt"]
+    engine = get_mppt_engine() if paused else None
+    if engine is None:
+        return []
+    engine.pause([key for sample_id in paused for key in sample_channel_keys(sample_id)])
+    return paused
+
+
+def resume_mppt(sample_ids: List[str]):
+    """Put the pixels of samples back on the tracker, warm-started at the MPP of their latest sweep."""
+    engine = get_mppt_engine() if sample_ids else None
+    if engine is None:
+        return
+    for sample_id in sample_ids:
+        if sample_id not in sample_configs:  # Stopped during the sweep
+            continue
+        engine.resume(sample_channel_keys(sample_id), get_mppt_warm_starts(sample_id))
+        for pixel in measurement_tasks[sample_id].values():
+            if pixel["status"] == "idle":
+                pixel["status"] = "tracking"
+
+
+def release_mppt_for_sample(sample_id: str):
+    """Stop tracking the pixels of a stopped "mppt" sample and set them to 0 V, as after a sweep."""
+    if sample_configs[sample_id]["measurement_type"] != "mppt" or mppt_engine is None:
+        return
+    keys = sample_channel_keys(sample_id)
+    mppt_engine.pause(keys)
+    for board_idx in sorted({board_idx for board_idx, _ in keys}):
+        if board_idx >= len(board_manager.oboards):
+            continue
+        board = board_manager.oboards[board_idx]
+        try:
+            board.bus.call(board.set_voltages, {ch: 0 for b, ch in keys if b == board_idx},
+                           boards=[board], timeout=BUS_OPERATION_TIMEOUT)
+        except (OSError, TimeoutError) as e:
+            print(f"[{rpi_id}] ERROR setting sample {sample_id} to 0 V on board {board_idx}: {e}")
+
+
+def get_adc_data_rate(config: MeasurementConfig) -> int:
+    """ADC data rate (SPS) for a sample: explicit adc_data_rate or the adc_mode preset."""
+    return config.adc_data_rate or ADC_DATA_RATE_MODES[config.adc_mode]
+
+
+def get_settle_criterion(configs: List[MeasurementConfig]) -> Optional[SettleCriterion]:
+    """Settle detection shared by the given samples, or None for a fixed dwell.
+
+    Samples swept together share every settle, so detection is only used
+    when all of them ask for it, with the strictest of their limits.
+    """
+    if not configs or any(config.settle_mode != "adaptive" for config in configs):
+        return None
+    return SettleCriterion(
+        max_time=max(config.settle_time for config in configs),
+        tolerance=min(config.settle_tolerance for config in configs),
+        min_time=max(config.min_settle_time for config in configs)
+    )
+
+
+def get_oversampling(config: MeasurementConfig) -> Optional[Oversampling]:
+    """Per-point oversampling of a sample, or None when it reads every point once."""
+    if config.oversample_max_samples <= 1:
+        return None
+    return Oversampling(
+        config.oversample_max_samples,
+        stderr_voltage=config.oversample_stderr_voltage,
+        stderr_current=config.oversample_stderr_current
+    )
+
+
+def get_termination_policy(config: MeasurementConfig) -> Optional[TerminationPolicy]:
+    """Early sweep termination of a sample, or None to sweep to stop_voltage."""
+    if config.stop_after_voc_points is None and not config.predict_current_limit:
+        return None
+    return TerminationPolicy(
+        points_past_voc=config.stop_after_voc_points,
+        predict_current_limit=config.predict_current_limit
+    )
+
+
+def create_adaptive_grid(config: MeasurementConfig, sample_id: str, pixel_name: str) -> AdaptiveGrid:
+    """Adaptive grid for one pixel, using its previous sweep as prior when available."""
+    return AdaptiveGrid(
+        config.start_voltage,
+        config.stop_voltage,
+        max_points=config.max_points,
+        pmax_tolerance=config.pmax_tolerance,
+        ff_tolerance=config.ff_tolerance,
+        prior=iv_summaries.get((sample_id, pixel_name))
+    )
+
+
+def store_pixel_sweep(sample_id: str, pixel_name: str, timestamp: str, data: Dict[str, Sequence],
+                      stop: Optional[tuple] = None):
+    """Save one pixel's IV data, transfer it to the Main PC and update its status.
+
+    ``stop`` is the (reason, voltage) the sweep ended with (see
+    TerminationPolicy); it is added to the CSV as constant ``stop_reason`` and
+    ``stop_voltage`` columns and to the pixel status.
+    """
+    if stop is not None:
+        reason, stop_voltage = stop
+        stop_voltage = stop_voltage if stop_voltage == stop_voltage else None
+        measurement_tasks[sample_id][pixel_name]["stop_reason"] = reason
+        measurement_tasks[sample_id][pixel_name]["stop_voltage"] = stop_voltage
+        if reason != "completed" and stop_voltage is not None:
+            print(f"[{rpi_id}] Sweep {sample_id}/{pixel_name} stopped at {stop_voltage:.3f} V: {reason}")
+        elif reason != "completed":
+            print(f"[{rpi_id}] Sweep {sample_id}/{pixel_name} stopped: {reason}")
+        points = len(data["voltage"])
+        data = {**data, "stop_reason": [reason] * points, "stop_voltage": [stop_voltage] * points}
+    
+    # Figures of merit (NaN -> None for JSON); prior for the next adaptive sweep,
+    # the curvature sizes the first MPPT step after the sweep
+    summary = {
+        name: (value if value == value else None)
+        for name, value in dict(iv_summary(data["voltage"], data["current"]),
+                                curvature=mpp_curvature(data["voltage"], data["current"])).items()
+    }
+    iv_summaries[(sample_id, pixel_name)] = summary
+    measurement_tasks[sample_id][pixel_name]["last_summary"] = summary
+    
+    try:
+        # Save IV data locally
+        local_file = save_iv_data_locally(sample_id, pixel_name, timestamp, data)
+        
+        # Transfer to Main PC, with the spot log measured since the last sweep
+        transfer_file_to_main_pc(sample_id, pixel_name, local_file)
+        spot_log = spot_log_path(sample_id, pixel_name)
+        if spot_log.exists():
+            transfer_file_to_main_pc(sample_id, pixel_name, spot_log)
+        
+        # Update status
+        measurement_tasks[sample_id][pixel_name]["status"] = "idle"
+        measurement_tasks[sample_id][pixel_name]["last_iv"] = timestamp
+        
+    except Exception as e:
+        print(f"[{rpi_id}] ERROR in IV sweep {sample_id}/{pixel_name}: {e}")
+        measurement_tasks[sample_id][pixel_name]["status"] = "error"
 
 
 def update_samples_status_file():
@@ -396,7 +1017,27 @@ def save_config_file(sample_id: str, config: MeasurementConfig):
         f.write(f"Stop Voltage: {config.stop_voltage} V\n")
         f.write(f"Voltage Step: {config.voltage_step} V\n")
         f.write(f"Settle Time: {config.settle_time} s\n")
+        if config.settle_mode == "adaptive":
+            f.write(f"Settle Mode: adaptive (min {config.min_settle_time} s, "
+                    f"tolerance {config.settle_tolerance} V)\n")
+        if config.stop_after_voc_points is not None or config.predict_current_limit:
+            f.write(f"Early Termination: {config.stop_after_voc_points} point(s) past Voc, "
+                    f"current limit prediction {'on' if config.predict_current_limit else 'off'}\n")
+        if config.oversample_max_samples > 1:
+            f.write(f"Oversampling: up to {config.oversample_max_samples} samples, target standard error "
+                    f"{config.oversample_stderr_voltage} V / {config.oversample_stderr_current} A\n")
         f.write(f"Measurement Type: {config.measurement_type}\n")
+        if config.measurement_type == "spot":
+            f.write(f"Spot Measurements: every {config.spot_interval_seconds} s, "
+                    f"up to {config.spot_max_points} points per pixel\n")
+        if config.measurement_type == "mppt":
+            f.write(f"MPPT Strategy: {config.mppt_strategy}\n")
+        f.write(f"ADC Data Rate: {get_adc_data_rate(config)} SPS ({config.adc_mode})\n")
+        if config.sweep_mode == "adaptive":
+            f.write(f"Sweep Mode: adaptive (max {config.max_points} points, "
+                    f"Pmax tolerance {config.pmax_tolerance}, FF tolerance {config.ff_tolerance})\n")
+        else:
+            f.write(f"Sweep Mode: linear\n")
         f.write(f"IV Sweep Interval: {config.sweep_interval_minutes} minute(s)\n")
         f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
@@ -425,8 +1066,12 @@ def save_config_file(sample_id: str, config: MeasurementConfig):
         traceback.print_exc()
 
 
-def save_iv_data_locally(sample_id: str, pixel: str, timestamp: str, data: List[Dict]) -> Path:
-    """Save IV data to local file."""
+def save_iv_data_locally(sample_id: str, pixel: str, timestamp: str, data: Dict[str, Sequence]) -> Path:
+    """Save IV data to local file.
+    
+    ``data`` holds one column per CSV field (e.g. SweepResult.columns), all
+    of equal length.
+    """
     import csv
     
     # Create directory structure
@@ -438,16 +1083,42 @@ def save_iv_data_locally(sample_id: str, pixel: str, timestamp: str, data: List[
     filepath = local_dir / filename
     
     # Write CSV using csv module instead of pandas
-    if data:
+    if data and len(next(iter(data.values()))):
         with open(filepath, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(f)
+            writer.writerow(data.keys())
+            writer.writerows(zip(*data.values()))
     
     print(f"[{rpi_id}] Saved: {filepath}")
     return filepath
 
 
+def spot_log_path(sample_id: str, pixel: str) -> Path:
+    """Local path of a pixel's spot log (CSV, one line per spot measurement).
+
+    The log is not named ``*.csv`` so that it is not listed among the IV files.
+    """
+    return Path(f"/tmp/octoboard_{rpi_id}/IV/{sample_id}/{pixel}/Spot.log")
+
+
+def append_spot_log(sample_id: str, pixel: str, timestamp: str, summary: Dict[str, Any]):
+    """Append one spot measurement to the pixel's spot log, writing the header first if new.
+
+    The log is transferred to the Main PC together with the pixel's next IV
+    sweep (see store_pixel_sweep) rather than after every spot measurement.
+    """
+    import csv
+    
+    filepath = spot_log_path(sample_id, pixel)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    new = not filepath.exists()
+    with open(filepath, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(SPOT_LOG_FIELDS)
+        writer.writerow([timestamp] + [summary.get(field) for field in SPOT_LOG_FIELDS[1:]])
+
+
 def transfer_file_to_main_pc(sample_id: str, pixel: str, filepath: Path):
     """Transfer IV file to Main PC via HTTP POST."""
     try:
@@ -223,8 +223,7 @@ def run_iv_sweep_with_pixels(channel, config: MeasurementConfig, channel_id: str
                 import time
                 time.sleep(config.settle_time)
                 
-                v = channel.read_voltage()
-                i = channel.read_current()
+                v, i, timestamp = channel.read_vi()
                 
                 # Check current limit
                 if abs(i * 1000) > config.current_limit:  # Convert A to mA
@@ -232,7 +231,7 @@ def run_iv_sweep_with_pixels(channel, config: MeasurementConfig, channel_id: str
                     break
                 
                 data.append({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": timestamp,
                     "voltage": v,
                     "current": i,
                     "pixel": pixel,
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import time
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Octoboard acquisition strategies",
+        epilog="Example: python -m software.benchmark 1 local  (simulated bus with hardware-like timing)"
+    )
+    parser.add_argument("i2c_nums", type=str, nargs='+',
+                       help="List of I2C bus numbers (e.g., 1 2 3) or '1 local' for simulation")
+    parser.add_argument("--points", type=int, default=3,
+                       help="Voltage points per IV sweep (default: 3)")
+    parser.add_argument("--settle", type=float, default=0.01,
+                       help="Settle time after setting the DACs in seconds (default: 0.01)")
+    parser.add_argument("--boards", type=int, default=12,
+                       help="Number of simulated boards per bus (simulation only, default: 12)")
+    args = parser.parse_args()
+
+    i2c_nums = []
+    simulation_mode = False
+
+    for arg in args.i2c_nums:
+        if arg.lower() == 'local':
+            simulation_mode = True
+        else:
+            try:
+                i2c_nums.append(int(arg))
+            except ValueError:
+                print(f"Error: '{arg}' is not a valid I2C bus number")
+                sys.exit(1)
+
+    if not i2c_nums:
+        print("Error: At least one I2C bus number is required")
+        sys.exit(1)
+
+    if simulation_mode:
+        os.environ['OCTOBOARD_SIMULATION'] = 'True'
+        os.environ['OCTOBOARD_SIMULATION_TIMING'] = 'True'
+        os.environ['OCTOBOARD_SIMULATION_BOARDS'] = str(args.boards)
+    else:
+        os.environ['OCTOBOARD_SIMULATION'] = 'False'
+
+    # Import after setting environment variables
+    import numpy as np
+    from . import get_hardware_classes
+    from .hardware.sweep import SettleCriterion
+    OBoardManager, _, _, _ = get_hardware_classes()
+
+    voltages = np.linspace(0.0, 1.2, args.points)
+
+    for i2c_num in i2c_nums:
+        manager = OBoardManager(i2c_num=i2c_num)
+        channels = [
+            (board_idx, ch)
+            for board_idx, oboard in enumerate(manager.oboards)
+            for ch in range(len(oboard.channel))
+        ]
+        print("=" * 60)
+        print(f"I2C bus {i2c_num}: {len(manager.oboards)} boards, {len(channels)} channels, "
+              f"{args.points} points per sweep")
+        print("=" * 60)
+
+        results = {}
+
+        # Baseline: one board after another, each board swept in lockstep
+        start = time.perf_counter()
+        for oboard in manager.oboards:
+            oboard.lockstep_iv_sweep(range(len(oboard.channel)), voltages, settle_time=args.settle)
+        results["sequential"] = time.perf_counter() - start
+
+        # Bus-wide: all boards interleaved on the bus
+        start = time.perf_counter()
+        manager.interleaved_iv_sweep({key: voltages for key in channels}, settle_time=args.settle)
+        results["interleaved"] = time.perf_counter() - start
+
+        # Bus-wide with settle detection instead of the fixed dwell
+        settle = SettleCriterion(max_time=args.settle)
+        start = time.perf_counter()
+        manager.run_interleaved_sweep({key: voltages for key in channels}, settle_time=args.settle,
+                                      settle=settle)
+        results["settle-detect"] = time.perf_counter() - start
+
+        for name, elapsed in results.items():
+            print(f"{name:<14} {elapsed:8.2f} s per sweep round")
+        print(f"{'speed-up':<14} {results['sequential'] / results['interleaved']:8.2f} x")
+
+if __name__ == "__main__":
+    main()
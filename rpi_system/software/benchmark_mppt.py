@@ -0,0 +1,131 @@
+import argparse
+import os
+import sys
+import time
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark MPPT strategies: convergence, tracking efficiency and I2C cost",
+        epilog="Example: python -m software.benchmark_mppt 1 local --warm  (simulated bus with hardware-like timing)"
+    )
+    parser.add_argument("i2c_nums", type=str, nargs='+',
+                       help="List of I2C bus numbers (e.g., 1 2 3) or '1 local' for simulation")
+    parser.add_argument("--passes", type=int, default=40,
+                       help="Tracking passes per strategy (default: 40)")
+    parser.add_argument("--settle", type=float, default=None,
+                       help="Settle time after setting the DACs in seconds (default: MPPT_SETTLE_TIME)")
+    parser.add_argument("--strategies", type=str, nargs='+', default=None,
+                       help="Strategies to compare (default: all)")
+    parser.add_argument("--warm", action="store_true",
+                       help="Warm-start every strategy from the reference sweep instead of 0 V")
+    parser.add_argument("--boards", type=int, default=12,
+                       help="Number of simulated boards per bus (simulation only, default: 12)")
+    args = parser.parse_args()
+
+    i2c_nums = []
+    simulation_mode = False
+
+    for arg in args.i2c_nums:
+        if arg.lower() == 'local':
+            simulation_mode = True
+        else:
+            try:
+                i2c_nums.append(int(arg))
+            except ValueError:
+                print(f"Error: '{arg}' is not a valid I2C bus number")
+                sys.exit(1)
+
+    if not i2c_nums:
+        print("Error: At least one I2C bus number is required")
+        sys.exit(1)
+
+    if simulation_mode:
+        os.environ['OCTOBOARD_SIMULATION'] = 'True'
+        os.environ['OCTOBOARD_SIMULATION_TIMING'] = 'True'
+        os.environ['OCTOBOARD_SIMULATION_BOARDS'] = str(args.boards)
+    else:
+        os.environ['OCTOBOARD_SIMULATION'] = 'False'
+
+    # Import after setting environment variables
+    import numpy as np
+    from . import get_hardware_classes
+    from .hardware.constants import MPPT_SETTLE_TIME
+    from .hardware.mppt import MPPTEngine, MPPT_STRATEGIES
+    from .hardware.sweep import iv_summary, mpp_curvature
+    OBoardManager, _, _, _ = get_hardware_classes()
+
+    strategies = args.strategies or list(MPPT_STRATEGIES)
+    for name in strategies:
+        if name not in MPPT_STRATEGIES:
+            print(f"Error: unknown strategy '{name}', expected one of {list(MPPT_STRATEGIES)}")
+            sys.exit(1)
+    settle = MPPT_SETTLE_TIME if args.settle is None else args.settle
+
+    for i2c_num in i2c_nums:
+        manager = OBoardManager(i2c_num=i2c_num)
+        channels = [
+            (board_idx, ch)
+            for board_idx, oboard in enumerate(manager.oboards)
+            for ch in range(len(oboard.channel))
+        ]
+        print("=" * 60)
+        print(f"I2C bus {i2c_num}: {len(manager.oboards)} boards, {len(channels)} channels, "
+              f"{args.passes} passes per strategy, {'warm' if args.warm else 'cold'} start")
+        print("=" * 60)
+
+        # Reference curves: Pmax to rate tracking against, Vmpp/curvature for warm starts
+        data = manager.interleaved_iv_sweep({key: np.arange(0.0, 1.2, 0.01) for key in channels},
+                                            settle_time=settle)
+        summaries = {}
+        for key in channels:
+            voltage = [point["voltage"] for point in data[key]]
+            current = [point["current"] for point in data[key]]
+            summaries[key] = dict(iv_summary(voltage, current), curvature=mpp_curvature(voltage, current))
+        pmax = np.array([summaries[key]["pmax"] for key in channels])
+
+        if simulation_mode:
+            from .hardware.mock_hardware import get_bus_state_by_id
+            bus_state = get_bus_state_by_id(i2c_num)
+
+        print(f"{'strategy':<24} {'conv. passes':>12} {'conv. time':>10} {'efficiency':>10} "
+              f"{'steady':>8} {'I2C/step':>9} {'pass':>8}")
+        for name in strategies:
+            for board_idx, ch in channels:
+                manager.oboards[board_idx].channel[ch].warm_start(0.0)
+            engine = MPPTEngine(manager, channels=channels, settle_time=settle, strategy=name)
+            if args.warm:
+                engine.warm_start(summaries)
+            manager.bus.reset_stats()
+            transactions = bus_state.transactions if simulation_mode else None
+
+            # Tracking efficiency: power delivered over the passes relative to Pmax
+            efficiency = []
+            start = time.perf_counter()
+            for _ in range(args.passes):
+                engine.step()
+                readings = engine.stats()["channels"]
+                power = np.array([readings[key]["power"] for key in channels])
+                efficiency.append(np.mean(power / pmax))
+            elapsed = time.perf_counter() - start
+
+            stats = engine.stats()
+            convergence = stats["convergence"]
+            steady = np.mean(efficiency[-max(args.passes // 4, 1):])
+            if simulation_mode:
+                i2c_per_step = f"{(bus_state.transactions - transactions) / (args.passes * len(channels)):9.2f}"
+            else:
+                operations = manager.bus.stats()["operations"]
+                bus_ops = sum(operations.get(op, {}).get("count", 0) for op in ("mppt_set", "mppt_read"))
+                i2c_per_step = f"{bus_ops / args.passes:6.2f} op"  # Bus operations per pass
+            conv_passes = convergence["passes_mean"]
+            conv_time = convergence["time_mean"]
+            print(f"{name:<24} "
+                  f"{'-' if conv_passes is None else f'{conv_passes:.1f}':>12} "
+                  f"{'-' if conv_time is None else f'{conv_time:.2f} s':>10} "
+                  f"{np.mean(efficiency):10.1%} {steady:8.1%} {i2c_per_step:>9} "
+                  f"{elapsed / args.passes * 1000:6.1f}ms")
+            if convergence["converging"]:
+                print(f"{'':<24} {convergence['converging']} channels not converged")
+
+if __name__ == "__main__":
+    main()
@@ -45,16 +45,12 @@ def main():
     
     # Import after setting environment variable
     import time
-    from . import get_hardware_classes
-    OBoardManager, _, _, _ = get_hardware_classes()
+    from .hardware import MultiBusManager
     
-    board_managers = []
-    
-    # Initialize all board managers
-    for i2c_num in i2c_nums:
-        print(f"Initializing MPP tracking on I2C bus {i2c_num}")
-        board_managers.append(OBoardManager(i2c_num=i2c_num))
-        time.sleep(.1)
+    # Initialize one board manager (and one worker) per bus
+    print(f"Initializing MPP tracking on I2C buses {i2c_nums}")
+    bus_manager = MultiBusManager(i2c_nums)
+    board_managers = bus_manager.managers
 
     # time.sleep(10)
     ######################################### ADC CURRENT TEST #########################################
@@ -91,12 +87,16 @@ def main():
     # ######################################### ALL CHANNEL IV SWEEP ########################################
     # Run operations on each board manager
     print("Starting IV Sweep")    #DEBUG
-    for board_manager in board_managers:
-        time.sleep(.1)
+    def sweep_bus(board_manager):
         for oboard in board_manager.oboards:
             for ch in range(8):
-                print(f"CH{ch}")
+                print(f"{oboard.ID}CH{ch}")
                 oboard.channel[ch].perform_iv_sweep() #ch2 current reading not working (maybe an issue with the MUX? Maybe a snap in the wires?)
+    # Buses sweep in parallel, each on its own worker
+    sweeps = [bus_manager.submit_bus(bus_idx, sweep_bus, board_manager)
+              for bus_idx, board_manager in enumerate(board_managers)]
+    for sweep in sweeps:
+        sweep.result()
     print("Done")   #DEBUG
     ################################################# END ##############################################
 
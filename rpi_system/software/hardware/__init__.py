@@ -2,4 +2,9 @@ from .i2c import ExtendedI2C
 from .oboard import OBoard
 from .channel import Channel
 from .sdac import Softdac
-from .manager import OBoardManager
\ No newline at end of file
+from .gpio import GpioLatch
+from .bus import BusExecutor
+from .health import BusHealth
+from .manager import OBoardManager, MultiBusManager
+from .mppt import MPPTEngine, MPPTState, MPPTStrategy, MPPT_STRATEGIES, warm_start_step
+from .sweep import SweepPlan, SweepResult, AdaptiveGrid, SettleCriterion, Oversampling, TerminationPolicy, SpotSearch, iv_summary, mpp_curvature
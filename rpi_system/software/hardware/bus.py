@@ -0,0 +1,284 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from .i2c import ExtendedI2C, I2CDev
+from .health import BusHealth
+from .constants import (
+    BUS_PRIORITY_NORMAL,
+    BUS_EXECUTOR_MAX_BATCH,
+    I2C_FAST_PATH,
+)
+
+
+class BusExecutor:
+    """Owns one I2C bus and runs every operation on it from a dedicated thread.
+
+    Boards, sweeps, MPPT and API requests submit callables instead of
+    touching the bus directly. Operations are queued by priority (lower
+    runs first, FIFO within a priority) and executed one after another by
+    the executor thread, so concurrent users never interleave inside an
+    operation. Operations that are already queued when the thread wakes up
+    run as one batch under a single bus lock. Keeping operations small (one
+    DAC write, one acquisition) lets a long sweep yield the bus between
+    points rather than hold it for the whole sweep.
+
+    Operations submitted with ``boards=`` are guarded by the bus
+    :class:`BusHealth` monitor, which recovers from bus faults and retries
+    the failed operation. An operation that hangs past the timeout of a
+    :meth:`call` has its thread abandoned and replaced (see
+    :meth:`replace_worker`), so one stuck transfer does not block the bus
+    for good.
+
+    Use :meth:`for_bus` to get the shared executor of a bus number.
+
+    Attributes:
+        i2c_num (int): I2C bus number
+        i2c (ExtendedI2C): The one bus object shared by all boards on the bus
+        transport (I2CDev): Direct i2c-dev transport for the hot path, or None
+            unless ``I2C_FAST_PATH`` is enabled
+        max_batch (int): Most queued operations run under one bus lock
+        health (BusHealth): Fault counters and recovery of the bus
+    """
+
+    _executors = {}
+    _executors_lock = threading.Lock()
+
+    @classmethod
+    def for_bus(cls, i2c_num):
+        """Get the shared executor of an I2C bus, creating it on first use.
+
+        Args:
+            i2c_num (int): I2C bus number
+
+        Returns:
+            BusExecutor: The executor owning ``/dev/i2c-<i2c_num>``
+        """
+        with cls._executors_lock:
+            if i2c_num not in cls._executors:
+                cls._executors[i2c_num] = cls(i2c_num)
+            return cls._executors[i2c_num]
+
+    def __init__(self, i2c_num, i2c=None, max_batch=BUS_EXECUTOR_MAX_BATCH, fast_path=I2C_FAST_PATH):
+        """Initialize the executor; the thread starts with the first submission.
+
+        Args:
+            i2c_num (int): I2C bus number
+            i2c (ExtendedI2C, optional): Existing bus object. Defaults to a new one.
+            max_batch (int, optional): Most queued operations run under one bus lock.
+            fast_path (bool, optional): Open the direct i2c-dev transport.
+        """
+        self.i2c_num = i2c_num
+        self.i2c = i2c if i2c is not None else ExtendedI2C(i2c_num)
+        self.transport = I2CDev(i2c_num) if fast_path else None
+        self.max_batch = max_batch
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._generation = 0
+        self._batch = []
+        self._worker = threading.local()
+        self._stats = self._new_stats()
+        self.health = BusHealth(self)
+
+    def submit(self, fn, *args, priority=BUS_PRIORITY_NORMAL, name=None, boards=None, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` for execution on the bus thread.
+
+        Args:
+            fn (callable): Operation to run with exclusive use of the bus
+            priority (int, optional): Lower runs first, see BUS_PRIORITY_*
+            name (str, optional): Operation name for the latency stats.
+                Defaults to the function name.
+            boards (list[OBoard], optional): Boards the operation talks to. If
+                given, bus faults are recovered from and ``fn`` is retried
+                (see BusHealth.run).
+
+        Returns:
+            concurrent.futures.Future: Resolves to the return value of ``fn``.
+        """
+        future = Future()
+        name = name or getattr(fn, "__name__", "operation")
+        if boards is not None:
+            fn, args, kwargs = self.health.run, (fn, args, kwargs, boards), {}
+        operation = (fn, args, kwargs, name, future, time.perf_counter())
+        with self._condition:
+            if not self._running:
+                self._start()
+            heapq.heappush(self._queue, (priority, next(self._sequence), operation))
+            self._condition.notify()
+        return future
+
+    def call(self, fn, *args, priority=BUS_PRIORITY_NORMAL, name=None, boards=None, timeout=None,
+             **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the bus thread and wait for its result.
+
+        Called from the bus thread itself (an operation running further
+        operations), ``fn`` runs inline instead of deadlocking on the queue.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the operation. On
+                expiry it is cancelled if it has not started yet, counted in
+                ``health`` and TimeoutError is raised. If it is already running
+                it is taken to be hung: ``health`` reopens the bus and replaces
+                the bus thread. Choose a timeout well above the operation's
+                normal run time. Defaults to waiting forever.
+
+        Returns:
+            The return value of ``fn``; exceptions raised by ``fn`` propagate.
+        """
+        if getattr(self._worker, "generation", None) is not None:
+            if boards is not None:
+                return self.health.run(fn, args, kwargs, boards)
+            return fn(*args, **kwargs)
+        future = self.submit(fn, *args, priority=priority, name=name, boards=boards, **kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            hung = not future.cancel() and not future.done()
+            name = name or getattr(fn, "__name__", "operation")
+            self.health.record_timeout(name, hung=hung)
+            raise TimeoutError(f"I2C bus {self.i2c_num}: {name} did not finish "
+                               f"within {timeout} s") from None
+
+    def reset_bus(self):
+        """Reopen the bus device and the direct transport, e.g. to clear a stuck SDA.
+
+        Runs on the bus thread (from BusHealth.recover); devices created on
+        ``i2c`` stay valid.
+        """
+        self.i2c.reopen()
+        if self.transport is not None:
+            self.transport.reopen()
+
+    def replace_worker(self):
+        """Abandon a bus thread that hangs in an operation and start a new one.
+
+        Called from another thread (see BusHealth.record_timeout). The hung
+        thread keeps the bus lock, so the bus gets a new one; the operations
+        of its batch that had not started are queued again, and the bus
+        device is reopened before the new thread runs anything. If the hung
+        operation ever returns, its thread exits without touching the bus.
+
+        Raises:
+            OSError: Reopening the bus failed. The new thread runs regardless.
+        """
+        with self._condition:
+            if not self._running:
+                return
+            self._generation += 1
+            for entry in self._batch:
+                heapq.heappush(self._queue, entry)
+            self._batch = []
+            self.i2c.replace_lock()
+            self._start()  # Waits for the condition, i.e. until the bus is reopened
+            self.reset_bus()
+
+    def shutdown(self, wait=True):
+        """Stop the bus thread after the queued operations have run.
+
+        Args:
+            wait (bool, optional): Block until the thread has exited.
+        """
+        with self._condition:
+            thread = self._thread
+            self._running = False
+            self._condition.notify()
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self):
+        """Get latency statistics of the operations run so far.
+
+        Returns:
+            dict: ``operations`` maps each operation name to its ``count`` and
+            the mean/max ``queue_wait`` (submission to start) and ``run_time``
+            in seconds; ``batches`` and ``batched_operations`` count bus lock
+            acquisitions and the operations run under them.
+        """
+        with self._condition:
+            operations = {
+                name: {
+                    "count": count,
+                    "queue_wait_mean": wait_total / count,
+                    "queue_wait_max": wait_max,
+                    "run_time_mean": run_total / count,
+                    "run_time_max": run_max,
+                }
+                for name, (count, wait_total, wait_max, run_total, run_max)
+                in self._stats["operations"].items()
+            }
+            return {
+                "operations": operations,
+                "batches": self._stats["batches"],
+                "batched_operations": self._stats["batched_operations"],
+                "queued": len(self._queue),
+            }
+
+    def reset_stats(self):
+        """Return the latency statistics collected so far and start new ones."""
+        stats = self.stats()
+        with self._condition:
+            self._stats = self._new_stats()
+        return stats
+
+    @staticmethod
+    def _new_stats():
+        return {"operations": {}, "batches": 0, "batched_operations": 0}
+
+    def _start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(self._generation,),
+                                        name=f"i2c-{self.i2c_num}", daemon=True)
+        self._thread.start()
+
+    def _run(self, generation):
+        self._worker.generation = generation
+        while True:
+            with self._condition:
+                while self._running and not self._queue and generation == self._generation:
+                    self._condition.wait()
+                if not self._queue or generation != self._generation:
+                    return
+                self._batch = [heapq.heappop(self._queue)
+                               for _ in range(min(self.max_batch, len(self._queue)))]
+
+            while not self.i2c.try_lock():
+                pass
+            timings = []
+            try:
+                while True:
+                    with self._condition:
+                        if not self._batch or generation != self._generation:
+                            break
+                        operation = self._batch.pop(0)[2]
+                    timings.append(self._execute(operation))
+            finally:
+                with self._condition:
+                    if generation == self._generation:
+                        self.i2c.unlock()
+
+            with self._condition:
+                self._stats["batches"] += 1
+                self._stats["batched_operations"] += len(timings)
+                for name, wait, run in timings:
+                    count, wait_total, wait_max, run_total, run_max = \
+                        self._stats["operations"].get(name, (0, 0.0, 0.0, 0.0, 0.0))
+                    self._stats["operations"][name] = (
+                        count + 1, wait_total + wait, max(wait_max, wait),
+                        run_total + run, max(run_max, run)
+                    )
+
+    @staticmethod
+    def _execute(operation):
+        fn, args, kwargs, name, future, submitted = operation
+        started = time.perf_counter()
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        return name, started - submitted, time.perf_counter() - started
@@ -11,6 +11,10 @@ else:
     P0, P1, P2, P3 = 0, 1, 2, 3
     from adafruit_ads1x15.analog_in import _ADS1X15_DIFF_CHANNELS, _ADS1X15_PGA_RANGE
 
+# ADC input pairs: P0/P1 carries the cell voltage, P2/P3 the shunt voltage
+VOLTAGE_PIN_SETTING = _ADS1X15_DIFF_CHANNELS[(P0, P1)]
+CURRENT_PIN_SETTING = _ADS1X15_DIFF_CHANNELS[(P2, P3)]
+
 class Channel:
     """Represents a single control channel on a board, capable of performing MPP tracking.
 
@@ -39,7 +43,8 @@ class Channel:
         self.Voltage_limits = Voltage_limits
         self.dac.gain = CHANNEL_DAC_GAIN
 
-        self.__ch_to_mux = [5,7,6,4,2,1,0,3] # Mux signal that must be used for each channel to feed the ADC (e.g., cell 0 uses MUX channel 5)
+        self.__ch_to_mux = CHANNEL_MUX_MAP # Mux signal that must be used for each channel to feed the ADC (e.g., cell 0 uses MUX channel 5)
+        self.mux_channel = self.__ch_to_mux[ind]
         
         # Initialize MPPT tracking variables
         self.last_v = CHANNEL_INITIAL_VOLTAGE
@@ -48,50 +53,144 @@ class Channel:
         self.dv = CHANNEL_INITIAL_VOLTAGE_STEP
         self.max_dv = CHANNEL_MAX_VOLTAGE_STEP
 
-        # Initialize gain settings
+        # PGA gains of the voltage and current pairs; with auto-ranging
+        # (board.autorange) the last good setting of each pair
         self.gain_v = CHANNEL_VOLTAGE_GAIN
         self.gain_c = CHANNEL_CURRENT_GAIN
 
-    def set_voltage(self, voltage):
-        """Set the voltage of the DAC to a specific value."""
+    def voltage_to_dac_value(self, voltage):
+        """Convert a cell voltage to the (16-bit scaled) DAC value, applying the voltage limits."""
         voltage_ = min(max(self.Voltage_limits[0], voltage/2), self.Voltage_limits[1])
-        self.dac.value = int(voltage_ / CHANNEL_DAC_VOLTAGE_SCALE)
+        return int(voltage_ / CHANNEL_DAC_VOLTAGE_SCALE)
+
+    def set_voltage(self, voltage):
+        """Set the cell voltage, clamped to the voltage limits, through set_voltage_raw."""
+        self.set_voltage_raw(self.voltage_to_dac_value(voltage))
 
     def set_voltage_raw(self, voltage):
         """Set the voltage of the DAC to a specific value."""
-        self.dac.value = voltage
+        if self.board.transport is not None:
+            self.board.dac_write(self.ind, voltage)
+        else:
+            self.dac.value = voltage
+
+    def adc_lsb(self) -> float:
+        """Volts per ADC code at the board's current PGA gain."""
+        return _ADS1X15_PGA_RANGE[self.board.Adc.gain] / (1 << (self.board.Adc.bits - 1))
 
     def convert_to_voltage(self, value_int: int) -> float:
         """Calculates voltage from 16-bit ADC reading"""
 
-        lsb = _ADS1X15_PGA_RANGE[self.board.Adc.gain] / (1 << (self.board.Adc.bits - 1))
+        lsb = self.adc_lsb()
 
-        # Need to bit shift if value is only 12-bits
-        value_int >>= 16 - self.board.Adc.bits
-        volts = value_int * lsb
+        # Need to bit shift if value is only 12-bits (as a division, so that
+        # averaged fractional codes convert too)
+        volts = value_int / (1 << (16 - self.board.Adc.bits)) * lsb
 
         return volts
 
+    def convert_to_current(self, value_int: int) -> float:
+        """Calculates current from a 16-bit ADC reading of the shunt voltage"""
+        return self.convert_to_voltage(value_int) / self.R_shunt # I=V/R; R = 20 Ohm +/-1%
+
+    def _select_mux(self):
+        """Route this channel to the ADC, settling only if the mux actually switched."""
+        self.board.aMux_select_channel(self.mux_channel)
+
     def read_voltage(self):
         """Read the voltage from the ADC after selecting the appropriate channel."""
-        self.board.aMux_select_channel(self.__ch_to_mux[self.ind])
-        time.sleep(CHANNEL_ADC_SETTLE_TIME)
+        self._select_mux()
 
-        pin_setting = _ADS1X15_DIFF_CHANNELS[(P0, P1)]
-        ret =  self.board.Adc.read(pin_setting)
+        ret =  self._read_pair(VOLTAGE_PIN_SETTING)
         return self.convert_to_voltage(ret) # Note: Idirectly measuring the voltage
 
 
 
     def read_current(self):
         """Read the current from the ADC after selecting the appropriate channel."""
-        self.board.aMux_select_channel(self.__ch_to_mux[self.ind])
-        time.sleep(CHANNEL_ADC_SETTLE_TIME)
+        self._select_mux()
         # return self._shnt.voltage / self.R_shunt
 
-        pin_setting = _ADS1X15_DIFF_CHANNELS[(P2, P3)]
-        ret =  self.board.Adc.read(pin_setting)
-        return (self.convert_to_voltage(ret) / 20.0) # I=V/R; R = 20 Ohm +/-1%, Therefore, I = ret/20
+        ret =  self._read_pair(CURRENT_PIN_SETTING)
+        return self.convert_to_current(ret)
+
+    def read_vi(self):
+        """Read voltage and current with a single mux select.
+
+        Both ADC input pairs (P0/P1 and P2/P3) are converted back to back
+        while the mux stays on this channel.
+
+        Returns:
+            tuple: (voltage in V, current in A, ISO timestamp of the reading)
+        """
+        raw_voltage, raw_current = self.read_vi_raw()
+        return (self.convert_to_voltage(raw_voltage), self.convert_to_current(raw_current),
+                datetime.now().isoformat())
+
+    def read_vi_raw(self):
+        """Like read_vi, but return the raw (signed) ADC codes of both pairs.
+
+        With auto-ranging the codes are scaled to the board's ``Adc.gain``
+        (see OBoard.scale_code) and may be fractional.
+        """
+        self._select_mux()
+        return self._read_pair(VOLTAGE_PIN_SETTING), self._read_pair(CURRENT_PIN_SETTING)
+
+    def pga_gain(self, pin_setting):
+        """PGA gain to use for an input pair of this channel."""
+        if not self.board.autorange:
+            return self.board.Adc.gain
+        return self.gain_v if pin_setting == VOLTAGE_PIN_SETTING else self.gain_c
+
+    def set_pga_gain(self, pin_setting, gain):
+        """Remember the gain to use for the next reading of an input pair."""
+        if pin_setting == VOLTAGE_PIN_SETTING:
+            self.gain_v = gain
+        else:
+            self.gain_c = gain
+
+    def _read_pair(self, pin_setting):
+        """One conversion of an input pair, auto-ranged when enabled on the board."""
+        if not self.board.autorange:
+            return self.board.adc_read(pin_setting)
+        raw, gain = self.board.adc_read_autorange(pin_setting, self.pga_gain(pin_setting))
+        self.set_pga_gain(pin_setting, gain)
+        return raw
+
+    def read_vi_oversampled(self, oversampling):
+        """Average repeated raw readings of both pairs with a single mux select.
+
+        Voltage/current pairs are read until ``oversampling`` reports that the
+        standard error targets are met or its sample limit is reached.
+
+        Args:
+            oversampling (Oversampling): Sample limits and standard error targets.
+
+        Returns:
+            tuple: (mean raw voltage, mean raw current, (samples, stderr raw
+            voltage, stderr raw current)), see Oversampling.reduce.
+        """
+        self._select_mux()
+        raw_voltages, raw_currents = [], []
+        while True:
+            raw_voltages.append(self._read_pair(VOLTAGE_PIN_SETTING))
+            raw_currents.append(self._read_pair(CURRENT_PIN_SETTING))
+            raw_v, raw_c, stats, done = oversampling.reduce(self, raw_voltages, raw_currents)
+            if done:
+                return raw_v, raw_c, stats
+
+    def warm_start(self, voltage, step=CHANNEL_INITIAL_VOLTAGE_STEP):
+        """Restart MPP tracking from a known operating point instead of 0 V.
+
+        Args:
+            voltage (float): Set voltage to start from, e.g. the Vmpp of the
+                last IV sweep (V).
+            step (float, optional): First step size (V), see mppt.warm_start_step.
+        """
+        self.last_v = voltage
+        self.dv = min(max(step, CHANNEL_MIN_VOLTAGE_STEP), self.max_dv)
+        self.last_dir = CHANNEL_INITIAL_DIRECTION
+        self.last_p = CHANNEL_INITIAL_POWER
 
     def mpp_track(self, iterations=10, interval=0.01):
         """Track measurements and write them to a CSV file with a maximum dv step.
@@ -108,10 +207,8 @@ class Channel:
                 f.write(f'{CHANNEL_DEFAULT_HEADER}\n')  
 
         for _ in range(iterations):
-            timestamp = datetime.now().isoformat()
             try:
-                measured_voltage = self.read_voltage()
-                measured_current = self.read_current()
+                measured_voltage, measured_current, timestamp = self.read_vi()
             except Exception as e:
                 print(f"Error reading voltage or current: {e}")
                 continue
@@ -142,6 +239,37 @@ class Channel:
             
             time.sleep(interval)
 
+    def mppt_step(self, measured_voltage, measured_current):
+        """Take one perturb-and-observe step from a reading at the present set point.
+
+        The direction is kept while the power rises (or holds, which gets
+        tracking off the ground at 0 V) and reversed when it falls; the step
+        grows by CHANNEL_POWER_INCREASE_FACTOR on a rise and shrinks by
+        CHANNEL_POWER_DECREASE_FACTOR on a reversal, within
+        CHANNEL_MIN_VOLTAGE_STEP and ``max_dv``. Uses and updates ``last_v``,
+        ``last_dir``, ``last_p`` and ``dv``; the DAC is not written.
+
+        Args:
+            measured_voltage (float): Voltage measured at ``last_v`` (V).
+            measured_current (float): Current measured at ``last_v`` (A).
+
+        Returns:
+            float: Next set (cell) voltage (V), within the range the DAC
+            reaches under ``Voltage_limits`` (see voltage_to_dac_value).
+        """
+        power = measured_voltage * measured_current
+        if power >= self.last_p:
+            self.dv = min(self.dv * CHANNEL_POWER_INCREASE_FACTOR, self.max_dv)
+        else:
+            self.dv = self.dv * CHANNEL_POWER_DECREASE_FACTOR
+            self.last_dir = -self.last_dir
+        self.dv = max(CHANNEL_MIN_VOLTAGE_STEP, self.dv)
+        self.last_p = power
+
+        low, high = self.Voltage_limits
+        self.last_v = min(max(self.last_v + self.dv * self.last_dir, 2 * low), 2 * high)
+        return self.last_v
+
     def perform_iv_sweep(self, start_value=CHANNEL_IV_START_VALUE, 
                         end_value=CHANNEL_IV_END_VALUE,
                         step_size=CHANNEL_IV_STEP_SIZE):
@@ -155,10 +283,8 @@ class Channel:
         for dac_value in np.arange(start_value, end_value + step_size, step_size):
             self.set_voltage(dac_value)
             time.sleep(CHANNEL_ADC_SETTLE_TIME)
-            voltage = self.read_voltage()
-            current = self.read_current()
+            voltage, current, timestamp = self.read_vi()
             dac_value = self.dac.raw_value
-            timestamp = datetime.now().isoformat()
             
             ########################## DEBUG #########################
             print(F'Read DAC value = {dac_value} (Dec), V={voltage:.5f}, C={current:.5f}, p={voltage*current:.5f}')
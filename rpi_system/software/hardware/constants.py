@@ -8,6 +8,28 @@ import os
 # Set to False when running on actual hardware
 # This can be overridden via environment variable or command-line argument
 SIMULATION_MODE = os.environ.get('OCTOBOARD_SIMULATION', 'False').lower() in ('true', '1', 'yes')
+
+# Direct i2c-dev transport: talk to /dev/i2c-N with ioctl(I2C_RDWR) for ADC
+# register access and DAC writes instead of going through busio/Blinka and the
+# Adafruit drivers (which are still used to set the chips up)
+I2C_FAST_PATH = os.environ.get('OCTOBOARD_I2C_FAST_PATH', 'False').lower() in ('true', '1', 'yes')
+
+# Simulated bus timing: when enabled, every mock I2C transaction and ADC
+# conversion takes (roughly) as long as it would on real hardware so that
+# acquisition strategies can be benchmarked without a Raspberry Pi.
+SIMULATION_TIMING = os.environ.get('OCTOBOARD_SIMULATION_TIMING', 'False').lower() in ('true', '1', 'yes')
+SIMULATION_NUM_BOARDS = int(os.environ.get('OCTOBOARD_SIMULATION_BOARDS', '4'))  # Boards answering a mock scan
+SIMULATION_I2C_TRANSACTION_TIME = 2e-4    # Duration of one simulated I2C transaction (seconds)
+
+# Simulated solar cells (single-diode model, one per channel)
+SIMULATION_CELL_ISC = 0.01                # Short-circuit current (A)
+SIMULATION_CELL_VOC = 0.8                 # Open-circuit voltage (V)
+SIMULATION_CELL_IDEALITY = 1.5            # Diode ideality factor
+SIMULATION_CELL_SHUNT_RESISTANCE = 2000   # Shunt resistance (Ohms)
+SIMULATION_CELL_SPREAD = 0.05             # Relative cell-to-cell spread of Isc and Voc
+SIMULATION_VOLTAGE_NOISE = 5e-4           # RMS noise of a voltage reading at 128 SPS (V)
+SIMULATION_CURRENT_NOISE = 2e-5           # RMS noise of a current reading at 128 SPS (A)
+SIMULATION_SETTLE_TIME_CONSTANT = 0.005   # Cell response time constant to a DAC step (s), timing mode only
 # =========================================================
 
 # Board Manager Configuration
@@ -15,6 +37,8 @@ BOARD_DEFAULT_I2C_NUM = 1
 BOARD_DEFAULT_OFFSET_RANGE = range(0, 12)  # 12 Octoboards = 96 channels
 BOARD_DEFAULT_ITERATIONS = 10
 BOARD_DEFAULT_INTERVAL = 0.001  # seconds
+BOARD_SCAN_CACHE_DIRECTORY = os.environ.get(    # Last known-good board scan per bus (warm start)
+    'OCTOBOARD_SCAN_CACHE', os.path.join(os.path.expanduser('~'), '.octoboard'))
 
 # System Configuration
 TOTAL_BOARDS_PER_RPI = 12  # 12 Octoboards per Raspberry Pi
@@ -40,6 +64,28 @@ I2C_OFFSET_MULTIPLIER = {
 }
 
 
+# Mux signal that must be used for each channel to feed the ADC (e.g., cell 0 uses MUX channel 5)
+CHANNEL_MUX_MAP = [5, 7, 6, 4, 2, 1, 0, 3]
+
+# Linux i2c-dev interface (linux/i2c-dev.h, linux/i2c.h)
+I2C_DEV_RDWR = 0x0707                     # ioctl: combined read/write transfer
+I2C_DEV_M_RD = 0x0001                     # i2c_msg flag: read message
+I2C_DEV_BUFFER_SIZE = 32                  # Preallocated bytes per message direction
+I2C_DEV_TIMEOUT = 0x0702                  # ioctl: adapter timeout in units of 10 ms
+I2C_DEV_TRANSFER_TIMEOUT = 0.05           # seconds before a hung transfer fails
+
+# Per-bus I2C executor: operation priorities (lower runs first) and batching
+BUS_PRIORITY_HIGH = 0                     # Latency-critical work, e.g. MPPT steps
+BUS_PRIORITY_NORMAL = 10                  # API requests
+BUS_PRIORITY_LOW = 20                     # Long sweeps, yield the bus between points
+BUS_EXECUTOR_MAX_BATCH = 16               # Queued operations run under one bus lock
+
+# Bus fault recovery: a failed operation is retried after re-initializing the
+# boards that stopped answering, or after reopening the bus if none answers
+BUS_FAULT_RETRIES = 2                     # Retries of one failed operation
+BUS_RESET_THRESHOLD = 3                   # Consecutive faults before the bus is reopened
+BUS_OPERATION_TIMEOUT = 5.0               # seconds a caller waits for one operation
+
 # Softdac Configuration
 SOFTDAC_MUX_PINS = [8, 9, 10, 11]  # Multiplexer pins used for gain control
 SOFTDAC_DEFAULT_VREF = 5.0          # Default reference voltage (V)
@@ -87,19 +133,72 @@ CHANNEL_MIN_VOLTAGE_STEP = 2e-3           # Minimum voltage step size (V)
 
 # ADC Configuration for Channel
 CHANNEL_VOLTAGE_GAIN = 2                  # Default gain for voltage measurements
-CHANNEL_CURRENT_GAIN = 16                 # Default gain for current measurements; Note: this eems to be used as data rate for some reason. (oboard.py)
+CHANNEL_CURRENT_GAIN = 16                 # Default gain for current measurements
 # CHANNEL_CURRENT_GAIN = 2
 
+# ADC data rate (samples per second), kept separate from the PGA gain
+ADC_DATA_RATE_MODES = {
+    "fast": 860,                          # Shortest conversions, highest noise
+    "precision": 128,                     # Quieter conversions for low-noise sweeps
+}
+ADC_DEFAULT_MODE = "precision"
+ADC_DEFAULT_DATA_RATE = ADC_DATA_RATE_MODES[ADC_DEFAULT_MODE]
+ADC_MUX_SETTLE_CONVERSIONS = 1            # Mux settle after a switch, in conversion periods of the current data rate
+ADC_MUX_MIN_SETTLE = 0.01                 # Floor on the mux settle (seconds), the previous fixed settle time
+
 CHANNEL_ADC_SETTLE_TIME = 0.01           # ADC settling time (seconds)
 
+# PGA auto-ranging (per channel, per input pair)
+ADC_AUTORANGE = True                      # Range each channel's voltage/current pair independently
+ADC_GAINS = [2/3, 1, 2, 4, 8, 16]         # PGA gains, widest range first
+ADC_AUTORANGE_SATURATION = 0.98           # |code| above this fraction of full scale: widen and retry
+ADC_AUTORANGE_NARROW = 0.8                # Narrow while the reading stays below this fraction of the new full scale
+
+# Analog mux address (MCP23017 pins 4-6, i.e. bits 4-6 of GPIO port A)
+MUX_ADDRESS_SHIFT = 4
+MUX_ADDRESS_MASK = 0x07 << MUX_ADDRESS_SHIFT
+MUX_PIN_SELECT_TRANSACTIONS = 12         # Per-pin switch_to_output select: 3 pins x (IODIR + GPIO read-modify-write)
+
+# MCP23017 output latch shared by the mux address and the Softdac gain pins
+GPIO_PORT_A_MASK = 0x00FF
+GPIO_PORT_B_MASK = 0xFF00
+GPIO_OUTPUT_MASK = MUX_ADDRESS_MASK | sum(1 << pin for pin in SOFTDAC_MUX_PINS)
+
+# ADS1115 register map (mirrors adafruit_ads1x15, used for split trigger/collect reads)
+ADC_POINTER_CONVERSION = 0x00
+ADC_POINTER_CONFIG = 0x01
+ADC_CONFIG_OS_SINGLE = 0x8000            # Start a single-shot conversion / conversion ready
+ADC_CONFIG_MUX_OFFSET = 12
+ADC_CONFIG_GAIN = {2/3: 0x0000, 1: 0x0200, 2: 0x0400, 4: 0x0600, 8: 0x0800, 16: 0x0A00}
+ADC_CONFIG_GAIN_MASK = 0x0E00
+ADC_CONFIG_MODE_SINGLE = 0x0100
+ADC_CONFIG_COMP_QUE_DISABLE = 0x0003
+ADC_CONVERSION_POLL_TIMEOUT = 1.0        # Give up waiting for a conversion after this long (seconds)
+
 # MPP Tracking Parameters
 CHANNEL_POWER_INCREASE_FACTOR = 1.1       # Factor to increase step size when power increases
 CHANNEL_POWER_DECREASE_FACTOR = 0.3       # Factor to decrease step size when power decreases
 
+# Fleet MPPT engine: one perturb-and-observe step per channel per pass
+MPPT_DEFAULT_RATE = 10.0                  # Target P&O steps per channel per second
+MPPT_SETTLE_TIME = 0.002                  # Dwell between the DAC update and the readings of a pass (s)
+MPPT_RATE_WINDOW = 20                     # Passes over which the achieved rate is measured
+MPPT_WARM_POWER_TOLERANCE = 0.005         # Relative power drop the first step of a warm start is sized for
+MPPT_CURVATURE_POINTS = 2                 # Points on each side of the MPP fitted for the curvature
+MPPT_CONVERGENCE_REVERSALS = 2            # Direction reversals after which a channel counts as converged
+MPPT_DEFAULT_STRATEGY = "perturb_observe" # Tracker of channels without an explicit strategy (see mppt.MPPT_STRATEGIES)
+MPPT_INCCOND_TOLERANCE = 0.02             # Incremental conductance: |1 + V/I dI/dV| below this counts as at the MPP
+MPPT_GSS_TOLERANCE = 0.004                # Golden-section: bracket width at which the search has converged (V)
+MPPT_GSS_COLD_RANGE = (0.0, 1.2)          # Golden-section: bracket of a cold start (cell voltage, V)
+MPPT_GSS_SPAN_STEPS = 5                   # Golden-section: warm-start bracket half-width, in first steps
+MPPT_GSS_RETRACK_SPAN = 0.02              # Golden-section: bracket half-width around the MPP to follow drift (V)
+
 # DAC Configuration
 CHANNEL_DAC_GAIN = 1                      # Default DAC gain
 # CHANNEL_DAC_VOLTAGE_SCALE = 2**16 / 8    # DAC voltage scaling factor (16-bit, 0-4V range)
 CHANNEL_DAC_VOLTAGE_SCALE = 31.25e-6
+MCP4728_FAST_WRITE_POWER_DOWN = 0x00     # PD1:PD0 bits for Fast Write (normal operation)
+MCP4728_MULTI_WRITE = 0x40               # Multi-Write command (01000 DAC1 DAC0 UDAC), one channel per 3 bytes
 
 # I/O Configuration
 CHANNEL_DATA_DIRECTORY = "data"           # Directory for MPP tracking data
@@ -110,6 +209,40 @@ CHANNEL_DEFAULT_HEADER = 'timestamp,measured_voltage,measured_current,dac_value,
 CHANNEL_IV_START_VALUE = 0.0               # Default start value for IV sweep (V)
 CHANNEL_IV_END_VALUE = 1.2                 # Default end value for IV sweep (V)
 CHANNEL_IV_STEP_SIZE = 0.01                # Default step size for IV sweep (V)
+SWEEP_PLAN_CACHE_SIZE = 64                 # Compiled sweep plans kept in memory
+
+# Settle Detection Configuration
+SETTLE_MODES = ["fixed", "adaptive"]       # fixed: dwell settle_time; adaptive: read until stable
+SETTLE_TOLERANCE = 0.002                   # Max change between consecutive ADC readings (V)
+SETTLE_CONSECUTIVE_READINGS = 1            # Consecutive changes within tolerance to call a point settled
+SETTLE_MIN_TIME = 0.002                    # Minimum dwell before the first reading (s)
+
+# Oversampling Configuration
+OVERSAMPLE_MAX_SAMPLES = 1                 # Default samples per point (1 = no oversampling)
+OVERSAMPLE_MIN_SAMPLES = 3                 # Samples before the standard error is trusted
+OVERSAMPLE_STDERR_VOLTAGE = 2e-4           # Default target standard error of the voltage (V)
+OVERSAMPLE_STDERR_CURRENT = 5e-6           # Default target standard error of the current (A)
+
+# Sweep Termination Configuration
+TERMINATION_LIMIT_MARGIN = 0.9             # Stop when the predicted next current exceeds this fraction of the limit
+
+# Adaptive IV Sweep Configuration
+ADAPTIVE_COARSE_POINTS = 13                # Uniform points in the first pass without a prior
+ADAPTIVE_PRIOR_COARSE_POINTS = 7           # Uniform points in the first pass with a prior sweep
+ADAPTIVE_PRIOR_SPAN = 0.02                 # Extra points at +/- this around the prior Vmpp and Voc (V)
+ADAPTIVE_MIN_VOLTAGE_SPACING = 0.002       # Never refine below this spacing (V)
+ADAPTIVE_MAX_POINTS = 40                   # Default point budget per sweep
+ADAPTIVE_PMAX_TOLERANCE = 0.005            # Default relative Pmax change to stop refining
+ADAPTIVE_FF_TOLERANCE = 0.005              # Default relative FF change to stop refining
+
+# Spot Measurement Configuration (quick Isc/Voc/MPP between full sweeps)
+SPOT_MAX_POINTS = 30                       # Default point budget per spot measurement
+SPOT_VOC_TOLERANCE = 0.002                 # Bisect Voc down to this bracket width (V)
+SPOT_PRIOR_SPAN = 0.02                     # First Voc bracket at +/- this around the prior Voc (V)
+SPOT_MPP_STEP = 0.04                       # Initial step of the local MPP search (V)
+SPOT_MPP_TOLERANCE = 0.005                 # Stop the MPP search below this step (V)
+SPOT_VMPP_VOC_FRACTION = 0.8               # MPP search start without a prior, as a fraction of Voc
+SPOT_DEFAULT_INTERVAL = 60                 # Default interval between spot measurements (s)
 
 # IV Sweep Scheduling (DEPRECATED - now controlled per-sample from Main PC)
 IV_SWEEP_INTERVAL_HOURS = 1                # DEFAULT: 1 hour (60 minutes)
@@ -0,0 +1,83 @@
+from .constants import GPIO_OUTPUT_MASK, GPIO_PORT_A_MASK, GPIO_PORT_B_MASK
+
+
+class GpioLatch:
+    """Shadow copy of the MCP23017 output latch shared by everything on one board.
+
+    The analog mux address (port A) and the Softdac gain pins (port B) live
+    on the same expander. Instead of a read-modify-write per pin, users
+    update bits of this shadow and the change goes out as a single port
+    write: GPIOA or GPIOB alone if only one port changed, otherwise one
+    16-bit GPIO write covering both. Updates that change nothing do no I2C
+    traffic at all.
+
+    Attributes:
+        mcp: MCP23017 device instance
+        output_mask (int): Pins driven as outputs (configured on first use)
+        stats (dict): Optional I/O counters, ``gpio_writes`` and
+            ``gpio_writes_skipped`` are incremented when present
+    """
+
+    def __init__(self, mcp, output_mask=GPIO_OUTPUT_MASK, stats=None):
+        """Initialize the latch shadow.
+
+        Args:
+            mcp: MCP23017 device instance
+            output_mask (int, optional): Pins to configure as outputs. Defaults to
+                the mux address and Softdac gain pins.
+            stats (dict, optional): I/O counters to update.
+        """
+        self.mcp = mcp
+        self.output_mask = output_mask
+        self.stats = stats
+        self._value = None
+
+    @property
+    def value(self):
+        """Get the 16-bit latch state (port A in the low byte).
+
+        The first access configures the output pins and reads the current
+        pin state from the chip.
+
+        Returns:
+            int: Shadowed GPIO state
+        """
+        if self._value is None:
+            self.mcp.iodir = self.mcp.iodir & ~self.output_mask & 0xFFFF
+            self._value = self.mcp.gpio
+        return self._value
+
+    def update(self, value, mask):
+        """Set the bits in ``mask`` to those of ``value`` with at most one write.
+
+        Args:
+            value (int): New bit values (only bits in ``mask`` are used)
+            mask (int): Bits to change
+
+        Returns:
+            bool: True if the latch was written, False if nothing changed.
+        """
+        current = self.value
+        new = (current & ~mask) | (value & mask)
+        if new == current:
+            self._count("gpio_writes_skipped")
+            return False
+
+        changed = new ^ current
+        if not changed & GPIO_PORT_B_MASK:
+            self.mcp.gpioa = new & 0xFF
+        elif not changed & GPIO_PORT_A_MASK:
+            self.mcp.gpiob = new >> 8
+        else:
+            self.mcp.gpio = new
+        self._value = new
+        self._count("gpio_writes")
+        return True
+
+    def invalidate(self):
+        """Forget the shadow, e.g. after the MCP23017 may have been reset."""
+        self._value = None
+
+    def _count(self, key):
+        if self.stats is not None and key in self.stats:
+            self.stats[key] += 1
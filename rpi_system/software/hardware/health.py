@@ -0,0 +1,166 @@
+import errno
+import threading
+import time
+
+from .constants import BUS_FAULT_RETRIES, BUS_RESET_THRESHOLD
+
+
+class BusHealth:
+    """Fault counters and automatic recovery for the boards on one I2C bus.
+
+    Operations submitted to the bus executor with ``boards=`` run through
+    :meth:`run`. When one raises an ``OSError`` (a NACK, an adapter
+    timeout, an ADC that never finishes converting) the boards it talks to
+    are probed and those that no longer answer get their drivers
+    re-created. A bus timeout, i.e. SDA held low, or faults that keep
+    coming reopen the bus device itself first. The failed operation is
+    then retried, so a sweep repeats one point instead of losing the
+    channel until the next sweep.
+
+    Attributes:
+        bus (BusExecutor): Executor of the monitored bus
+        retries (int): Retries of one failed operation
+        reset_threshold (int): Consecutive faults after which the bus is reopened
+    """
+
+    def __init__(self, bus, retries=BUS_FAULT_RETRIES, reset_threshold=BUS_RESET_THRESHOLD):
+        """Initialize the monitor.
+
+        Args:
+            bus (BusExecutor): Executor of the monitored bus
+            retries (int, optional): Retries of one failed operation.
+            reset_threshold (int, optional): Consecutive faults after which
+                the bus is reopened.
+        """
+        self.bus = bus
+        self.retries = retries
+        self.reset_threshold = reset_threshold
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._counters = self._new_counters()
+        self._boards = {}
+
+    def run(self, fn, args, kwargs, boards):
+        """Run ``fn(*args, **kwargs)`` on the bus thread, recovering from bus faults.
+
+        Args:
+            fn (callable): Operation to run
+            args (tuple): Positional arguments of ``fn``
+            kwargs (dict): Keyword arguments of ``fn``
+            boards (list[OBoard]): Boards the operation talks to
+
+        Returns:
+            The return value of ``fn``.
+
+        Raises:
+            OSError: The last fault if ``fn`` still fails after ``retries`` recoveries.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                result = fn(*args, **kwargs)
+            except OSError as e:
+                with self._lock:
+                    self._consecutive += 1
+                    self._counters["faults"] += 1
+                    self._counters["last_error"] = str(e)
+                if attempt == self.retries:
+                    with self._lock:
+                        self._counters["failed_operations"] += 1
+                    raise
+                self.recover(boards, e)
+            else:
+                with self._lock:
+                    self._consecutive = 0
+                    if attempt:
+                        self._counters["retried_operations"] += 1
+                return result
+
+    def recover(self, boards, error):
+        """Bring the bus and the boards of a failed operation back.
+
+        Args:
+            boards (list[OBoard]): Boards the failed operation talks to
+            error (OSError): The fault
+        """
+        if error.errno == errno.ETIMEDOUT or self._consecutive >= self.reset_threshold:
+            try:
+                self.bus.reset_bus()
+            except OSError as e:
+                with self._lock:
+                    self._counters["last_error"] = f"Bus reset failed: {e}"
+            else:
+                with self._lock:
+                    self._counters["bus_resets"] += 1
+
+        faulty = [board for board in boards if not board.probe()]
+        for board in faulty or boards:  # Blame every board if none can be singled out
+            self._count(board, "errors", error)
+        for board in faulty:
+            try:
+                board.reinit()
+            except OSError:
+                continue  # Still not answering; the retry fails as well
+            self._count(board, "reinits")
+
+    def record_timeout(self, name, hung=False):
+        """Count an operation a caller gave up waiting for (see BusExecutor.call).
+
+        Args:
+            name (str): Operation name
+            hung (bool, optional): The operation had started and is still
+                running. Its bus thread is replaced and the bus reopened.
+        """
+        with self._lock:
+            self._counters["timeouts"] += 1
+            self._counters["last_error"] = f"{name} timed out"
+            if hung:
+                self._counters["worker_restarts"] += 1
+        if not hung:
+            return
+        try:
+            self.bus.replace_worker()
+        except OSError as e:
+            with self._lock:
+                self._counters["last_error"] = f"Bus reset failed: {e}"
+        else:
+            with self._lock:
+                self._counters["bus_resets"] += 1
+
+    def snapshot(self):
+        """Get the fault counters.
+
+        Returns:
+            dict: Bus-wide ``faults``, ``retried_operations`` (succeeded after a
+            recovery), ``failed_operations`` (given up), ``bus_resets``,
+            ``timeouts``, ``worker_restarts`` (bus threads replaced after an
+            operation hung) and ``last_error``, plus ``boards``: {board ID:
+            ``errors``, ``reinits``, ``last_error``, ``last_error_time``}.
+        """
+        with self._lock:
+            return dict(self._counters, boards={
+                board_id: dict(counters) for board_id, counters in self._boards.items()
+            })
+
+    def reset(self):
+        """Return the fault counters collected so far and start new ones."""
+        snapshot = self.snapshot()
+        with self._lock:
+            self._counters = self._new_counters()
+            self._boards = {}
+        return snapshot
+
+    def _count(self, board, key, error=None):
+        with self._lock:
+            counters = self._boards.setdefault(board.ID, {
+                "errors": 0, "reinits": 0, "last_error": None, "last_error_time": None
+            })
+            counters[key] += 1
+            if error is not None:
+                counters["last_error"] = str(error)
+                counters["last_error_time"] = time.time()
+
+    @staticmethod
+    def _new_counters():
+        return {"faults": 0, "retried_operations": 0, "failed_operations": 0,
+                "bus_resets": 0, "timeouts": 0, "worker_restarts": 0,
+                "last_error": None}
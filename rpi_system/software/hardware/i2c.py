@@ -1,9 +1,20 @@
+import ctypes
+import fcntl
+import os
+import struct
 import threading
 from os import path
-from .constants import SIMULATION_MODE
+from .constants import (
+    SIMULATION_MODE,
+    I2C_DEV_RDWR,
+    I2C_DEV_M_RD,
+    I2C_DEV_BUFFER_SIZE,
+    I2C_DEV_TIMEOUT,
+    I2C_DEV_TRANSFER_TIMEOUT,
+)
 
 if SIMULATION_MODE:
-    from .mock_hardware import MockI2C as I2C, MockBlinka_I2C as _I2C
+    from .mock_hardware import MockI2C as I2C, MockBlinka_I2C as _I2C, MockI2CDev
 else:
     from busio import I2C
     from adafruit_blinka.microcontroller.generic_linux.i2c import I2C as _I2C
@@ -35,4 +46,133 @@ class ExtendedI2C(I2C):
             self._i2c = _I2C(bus_id, mode=1, baudrate=frequency)
         
         self._lock = threading.RLock()
-        
\ No newline at end of file
+        self._bus_id = bus_id
+        self._frequency = frequency
+
+    def reopen(self):
+        """Close and reopen the bus device, e.g. to recover a stuck bus.
+
+        Unlike :meth:`init` this keeps the lock, so it can be called while
+        the bus is locked, and devices created on this object stay valid.
+        """
+        deinit = getattr(self._i2c, 'deinit', None)
+        if deinit is not None:
+            deinit()
+        if not SIMULATION_MODE:
+            self._i2c = _I2C(self._bus_id, mode=_I2C.MASTER, baudrate=self._frequency)
+        else:
+            self._i2c = _I2C(self._bus_id, mode=1, baudrate=self._frequency)
+
+    def replace_lock(self):
+        """Give the bus a new lock, abandoning one held by a thread that is stuck on the bus."""
+        self._lock = threading.RLock()
+
+
+class _I2CMsg(ctypes.Structure):
+    """struct i2c_msg from linux/i2c.h"""
+    _fields_ = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class _I2CRdwrData(ctypes.Structure):
+    """struct i2c_rdwr_ioctl_data from linux/i2c-dev.h"""
+    _fields_ = [
+        ("msgs", ctypes.POINTER(_I2CMsg)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+
+class LinuxI2CDev:
+    """Direct transport to ``/dev/i2c-N`` using ``ioctl(I2C_RDWR)``.
+
+    Bypasses busio, Blinka and the Adafruit drivers for the hot path: the
+    message descriptors and the write/read buffers are allocated once, and a
+    register read is a single ioctl carrying the pointer write and the data
+    read as two messages joined by a repeated start.
+
+    Callers serialize access (the bus executor does); the shared buffers
+    make an instance unsafe to use from several threads at once.
+    """
+
+    def __init__(self, bus_id):
+        """Open the bus device.
+
+        Args:
+            bus_id (int): Bus number, the N in ``/dev/i2c-N``.
+        """
+        self.bus_id = bus_id
+        self._fd = None
+        self._open()
+        self._write_buf = (ctypes.c_uint8 * I2C_DEV_BUFFER_SIZE)()
+        self._read_buf = (ctypes.c_uint8 * I2C_DEV_BUFFER_SIZE)()
+        self._write_view = memoryview(self._write_buf).cast("B")
+        self._msgs = (_I2CMsg * 2)()
+        self._msgs[0].buf = self._write_buf
+        self._msgs[1].flags = I2C_DEV_M_RD
+        self._msgs[1].buf = self._read_buf
+        self._rdwr = _I2CRdwrData(self._msgs, 0)
+
+    def write(self, address, data):
+        """Write ``data`` to the device at ``address`` in one transaction."""
+        size = len(data)
+        self._write_view[:size] = data
+        self._transfer(address, size)
+
+    def write_then_read(self, address, data, nbytes):
+        """Write ``data``, then read ``nbytes`` after a repeated start, in one ioctl.
+
+        Returns:
+            bytes: The bytes read.
+        """
+        size = len(data)
+        self._write_view[:size] = data
+        self._transfer(address, size, nbytes)
+        return bytes(self._read_buf[:nbytes])
+
+    def write_register16(self, address, pointer, value):
+        """Write a big-endian 16-bit register (pointer byte + 2 data bytes)."""
+        struct.pack_into(">BH", self._write_buf, 0, pointer, value)
+        self._transfer(address, 3)
+
+    def read_register16(self, address, pointer):
+        """Read a big-endian 16-bit register with a combined pointer write/read.
+
+        Returns:
+            int: Unsigned register value.
+        """
+        self._write_buf[0] = pointer
+        self._transfer(address, 1, 2)
+        return (self._read_buf[0] << 8) | self._read_buf[1]
+
+    def close(self):
+        """Close the bus device."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def reopen(self):
+        """Close and reopen the bus device, keeping the preallocated buffers."""
+        self.close()
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(f"/dev/i2c-{self.bus_id}", os.O_RDWR)
+        # Fail a hung transfer quickly instead of after the adapter default (~1 s)
+        fcntl.ioctl(self._fd, I2C_DEV_TIMEOUT, max(1, round(I2C_DEV_TRANSFER_TIMEOUT * 100)))
+
+    def _transfer(self, address, write_len, read_len=0):
+        msgs = self._msgs
+        msgs[0].addr = address
+        msgs[0].len = write_len
+        if read_len:
+            msgs[1].addr = address
+            msgs[1].len = read_len
+        self._rdwr.nmsgs = 2 if read_len else 1
+        fcntl.ioctl(self._fd, I2C_DEV_RDWR, self._rdwr)
+
+
+I2CDev = MockI2CDev if SIMULATION_MODE else LinuxI2CDev
@@ -1,7 +1,18 @@
 
 from .constants import *
 from .oboard import OBoard
-from .i2c import ExtendedI2C
+from .sweep import SweepPlan, SweepResult, AdaptiveGrid, Oversampling
+from .channel import VOLTAGE_PIN_SETTING, CURRENT_PIN_SETTING
+from .bus import BusExecutor
+import bisect
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+SINGLE_SAMPLE = Oversampling(1)
 
 class OBoardManager:
     """
@@ -15,6 +26,7 @@ class OBoardManager:
         oboards (list[OBoard]): List of initialized and configured OBoard instances.
         i2c_num (int): The I2C bus number being used.
         i2c (ExtendedI2C): The I2C interface instance for communication.
+        bus (BusExecutor): Executor owning the bus; every board shares it and its ``i2c``.
 
     Example:
         >>> manager = OBoardManager(i2c_num=1)
@@ -32,38 +44,175 @@ class OBoardManager:
         on the same I2C bus.
     """
     def __init__(self, i2c_num=BOARD_DEFAULT_I2C_NUM, 
-                 possible_offsets=BOARD_DEFAULT_OFFSET_RANGE):
-        """Initialize the OBoardManager by scanning I2C devices and setting up boards accordingly."""
+                 possible_offsets=BOARD_DEFAULT_OFFSET_RANGE, scan_cache=None, background=False):
+        """Initialize the OBoardManager by scanning I2C devices and setting up boards accordingly.
+
+        Args:
+            i2c_num (int): I2C bus number.
+            possible_offsets (iterable[int]): Board address offsets to look for.
+            scan_cache (str, optional): Directory holding the last known-good scan
+                of each bus. When set, boards found last time start initializing
+                right away and the bus scan only adds new ones.
+            background (bool): Set up the boards in a background thread and
+                return immediately; boards join ``oboards`` as they finish (see
+                ``state`` and ``ready``).
+        """
         self.oboards = []
         self.i2c_num = i2c_num
-        self.i2c = ExtendedI2C(i2c_num)
-        self.setup_boards(possible_offsets)
+        self.bus = BusExecutor.for_bus(i2c_num)
+        self.i2c = self.bus.i2c
+        self.possible_offsets = list(possible_offsets)
+        self.scan_cache = scan_cache
+        self.state = "starting"
+        self.errors = {}  # {offset: error message} of boards that failed to initialize
+        self.ready = threading.Event()
+        self._boards_lock = threading.Lock()
+        self._setup_lock = threading.Lock()
+        self._fixed_boards = 0  # Leading boards whose index is final (see rescan)
+        if background:
+            threading.Thread(target=self.setup_boards, args=(self.possible_offsets,),
+                             name=f"bus-{i2c_num}-setup", daemon=True).start()
+        else:
+            self.setup_boards(self.possible_offsets)
 
     def setup_boards(self, possible_offsets):
-        """Scan I2C addresses and initialize boards only if all required devices are detected."""
+        """Scan I2C addresses and initialize boards only if all required devices are detected.
+
+        Boards are initialized concurrently, one thread per board, and join
+        ``oboards`` (kept in address offset order) as soon as they are up, so
+        board indices are final only once ``state`` is ``ready``.
+        With a scan cache the boards of the last known-good scan are started
+        before the bus is scanned, and the offsets of the boards that came
+        up are written back afterwards.
+        """
+        with self._setup_lock:
+            try:
+                cached = self._load_scan_cache()
+                if cached:
+                    self.state = "initializing"
+                    self._init_boards([offset for offset in cached if offset in possible_offsets])
+                self.state = "scanning"
+                found = self.scan(possible_offsets)
+                self.state = "initializing"
+                self._init_boards([offset for offset in found if offset not in self.offsets()])
+                self._save_scan_cache()
+                self.state = "ready"
+            except Exception:
+                self.state = "error"
+                raise
+            finally:
+                self.ready.set()
+
+    def rescan(self):
+        """Scan the bus again and initialize boards that were plugged in since.
+
+        New boards are appended after the existing ones (in offset order among
+        themselves), so the indices of boards already in use never change,
+        even when a new board has a lower offset. ``status()["boards"]`` lists
+        the offsets in index order.
+
+        Returns:
+            list[int]: Offsets of the boards added.
+        """
+        with self._setup_lock:
+            with self._boards_lock:
+                self._fixed_boards = len(self.oboards)
+            before = set(self.offsets())
+            found = self.scan(self.possible_offsets)
+            self._init_boards([offset for offset in found if offset not in before])
+            self._save_scan_cache()
+            return sorted(set(self.offsets()) - before)
+
+    def scan(self, possible_offsets):
+        """Scan the bus for boards.
+
+        Returns:
+            list[int]: Offsets for which all devices of a board answered.
+        """
         while not self.i2c.try_lock():
             pass
-
-        found_devices = set(self.i2c.scan())
-        self.i2c.unlock()
+        try:
+            found_devices = set(self.i2c.scan())
+        finally:
+            self.i2c.unlock()
         print(f"Found I2C devices at addresses: {found_devices}")
 
+        found = []
         for offset in possible_offsets:
             expected_device_addresses = set([
                 base + (offset * I2C_OFFSET_MULTIPLIER[base])
                 for base in I2C_BASE_ADDRESSES
             ])
             if expected_device_addresses.issubset(found_devices):
-                try:
-                    ob = OBoard(i2c_num=self.i2c_num, i2c_address_offset=offset)
-                    self.oboards.append(ob)
-                    print(f"Successfully initialized OBoard with I2C offset {offset}")
-                except Exception as e:
-                    print(f"Failed to initialize board with offset {offset}: {e}")
-                    raise e
+                found.append(offset)
             else:
                 print(f"Not all devices found for board with offset {offset}. "
                       f"Expected {expected_device_addresses}, found {found_devices}")
+        return found
+
+    def offsets(self):
+        """Address offsets of the initialized boards, in board index order."""
+        with self._boards_lock:
+            return [oboard.offset for oboard in self.oboards]
+
+    def _init_boards(self, offsets):
+        """Initialize boards concurrently; failures are recorded in ``errors``."""
+        if not offsets:
+            return
+        with ThreadPoolExecutor(max_workers=len(offsets),
+                                thread_name_prefix=f"bus-{self.i2c_num}-init") as pool:
+            list(pool.map(self._init_board, offsets))
+
+    def _init_board(self, offset):
+        try:
+            ob = OBoard(i2c_num=self.i2c_num, i2c_address_offset=offset, bus=self.bus)
+        except Exception as e:
+            print(f"Failed to initialize board with offset {offset}: {e}")
+            self.errors[offset] = str(e)
+            return
+        with self._boards_lock:
+            fixed = self._fixed_boards
+            position = bisect.bisect([b.offset for b in self.oboards[fixed:]], offset)
+            self.oboards.insert(fixed + position, ob)
+            self.errors.pop(offset, None)
+        print(f"Successfully initialized OBoard with I2C offset {offset}")
+
+    def _scan_cache_path(self):
+        return os.path.join(self.scan_cache, f"scan_i2c-{self.i2c_num}.json")
+
+    def _load_scan_cache(self):
+        """Offsets of the last known-good scan of this bus, or [] without a usable cache."""
+        if self.scan_cache is None:
+            return []
+        try:
+            with open(self._scan_cache_path()) as f:
+                return [int(offset) for offset in json.load(f)["offsets"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    def _save_scan_cache(self):
+        """Write the offsets of the boards that came up as the known-good scan of this bus."""
+        if self.scan_cache is None:
+            return
+        os.makedirs(self.scan_cache, exist_ok=True)
+        path = self._scan_cache_path()
+        with open(path + ".tmp", "w") as f:
+            json.dump({"i2c_num": self.i2c_num, "offsets": self.offsets(),
+                       "timestamp": datetime.now().isoformat()}, f)
+        os.replace(path + ".tmp", path)
+
+    def status(self):
+        """Readiness of this bus.
+
+        Returns:
+            dict: ``state`` (starting, initializing, scanning, ready or error),
+            ``boards`` (offsets of the boards up, in index order) and ``errors``
+            ({offset: message} of boards that failed to initialize) and
+            ``health`` (bus fault counters, see BusHealth.snapshot).
+        """
+        return {"state": self.state, "boards": self.offsets(),
+                "errors": {str(offset): error for offset, error in self.errors.items()},
+                "health": self.bus.health.snapshot()}
 
     def cycle_all_channels(self, iterations_per_channel=BOARD_DEFAULT_ITERATIONS, 
                           interval=BOARD_DEFAULT_INTERVAL):
@@ -83,9 +232,746 @@ class OBoardManager:
             for channel in oboard.channel:
                 channel.mpp_track(iterations=iterations_per_channel, interval=interval)
 
+    def acquire(self, channels, mux_settle_time=None):
+        """
+        Read voltage and current of many channels, interleaving boards on the bus.
+
+        Converted wrapper around :meth:`acquire_raw`.
+
+        Args:
+            channels (iterable[tuple[int, int]]): (board_index, channel_index) pairs.
+            mux_settle_time (float, optional): Settle after switching the muxes (seconds).
+
+        Returns:
+            dict: {(board_index, channel_index): (voltage, current, timestamp)}
+        """
+        results = {}
+        for (board_idx, ch), (raw_v, raw_c, _) in self.acquire_raw(channels, mux_settle_time).items():
+            channel = self.oboards[board_idx].channel[ch]
+            results[(board_idx, ch)] = (
+                channel.convert_to_voltage(raw_v),
+                channel.convert_to_current(raw_c),
+                datetime.now().isoformat()
+            )
+        return results
+
+    def acquire_raw(self, channels, mux_settle_time=None):
+        """
+        Read raw voltage and current ADC codes of many channels across boards.
+
+        Requested channels are grouped into mux slots. In each slot every board
+        switches its mux to one of its channels, a single settle is waited for
+        all boards, and single-shot conversions are triggered on every board
+        before any result is collected. The conversion time of one board thereby
+        overlaps with the bus traffic to the others.
+
+        Args:
+            channels (iterable[tuple[int, int]]): (board_index, channel_index) pairs.
+            mux_settle_time (float, optional): Settle after switching the muxes (seconds).
+                Defaults to the longest data-rate derived settle of the boards involved.
+
+        Returns:
+            dict: {(board_index, channel_index): (raw_voltage, raw_current, monotonic_time)}
+        """
+        results = {}
+        for batch in self._mux_slots(channels, mux_settle_time):
+            raw_v = self._convert_all(batch, VOLTAGE_PIN_SETTING)
+            raw_c = self._convert_all(batch, CURRENT_PIN_SETTING)
+            timestamp = time.monotonic()
+
+            for board_idx, channel in batch.items():
+                results[(board_idx, channel.ind)] = (raw_v[board_idx], raw_c[board_idx], timestamp)
+        return results
+
+    def submit_snapshot(self, priority=BUS_PRIORITY_NORMAL):
+        """Queue a reading of voltage and current of every channel on the bus.
+
+        The pass is queued as one bus executor operation per mux slot, each
+        submitted when the previous one has finished, so other traffic at the
+        same or a higher priority runs between the slots, and the pass slots
+        in between the steps of a running sweep instead of waiting for the
+        sweep. Every board starts at the channel its mux is already routed
+        to, which spares the first mux switch and settle wherever the mux
+        cache is still valid. Voltage and current are read back to back for
+        each mux slot of all boards (see acquire_raw).
+
+        Args:
+            priority (int, optional): Bus executor priority of the slots.
+
+        Returns:
+            concurrent.futures.Future: Resolves to {(board_index, channel_index):
+            (voltage, current, time)} with ``time`` in seconds since the epoch.
+        """
+        per_board = []
+        for board_idx, oboard in enumerate(self.oboards):
+            order = [channel.ind for channel in oboard.channel]
+            first = next((channel.ind for channel in oboard.channel
+                          if channel.mux_channel == oboard._mux_address), 0)
+            per_board.append((board_idx, order[first:] + order[:first]))
+        slots = [
+            [(board_idx, order[slot]) for board_idx, order in per_board if slot < len(order)]
+            for slot in range(max((len(order) for _, order in per_board), default=0))
+        ]
+
+        snapshot = Future()
+        readings = {}
+
+        def submit_slot(index):
+            if index == len(slots):
+                snapshot.set_result(readings)
+                return
+            boards = [self.oboards[board_idx] for board_idx, _ in slots[index]]
+            future = self.bus.submit(self._read_channels, slots[index], priority=priority,
+                                     name="snapshot", boards=boards)
+            future.add_done_callback(lambda done: collect_slot(index, done))
+
+        def collect_slot(index, done):
+            if done.exception() is not None:
+                snapshot.set_exception(done.exception())
+                return
+            readings.update(done.result())
+            submit_slot(index + 1)
+
+        submit_slot(0)
+        return snapshot
+
+    def snapshot(self, priority=BUS_PRIORITY_NORMAL):
+        """Read voltage and current of every channel on the bus in one pass.
+
+        See :meth:`submit_snapshot`.
+
+        Returns:
+            dict: {(board_index, channel_index): (voltage, current, time)}
+        """
+        return self.submit_snapshot(priority).result()
+
+    def _read_channels(self, channels):
+        """acquire_raw converted to volts and amperes, timestamped in epoch seconds."""
+        epoch = time.time() - time.monotonic()
+        results = {}
+        for (board_idx, ch), (raw_v, raw_c, timestamp) in self.acquire_raw(channels).items():
+            channel = self.oboards[board_idx].channel[ch]
+            results[(board_idx, ch)] = (
+                channel.convert_to_voltage(raw_v),
+                channel.convert_to_current(raw_c),
+                timestamp + epoch
+            )
+        return results
+
+    def acquire_oversampled(self, channels, oversampling, mux_settle_time=None):
+        """
+        Like :meth:`acquire_raw`, but average repeated readings of every channel.
+
+        Within a mux slot the conversions keep being triggered on all boards
+        whose channel has not yet met the standard error targets of
+        ``oversampling``; boards that are done drop out of the slot.
+
+        Args:
+            channels (iterable[tuple[int, int]]): (board_index, channel_index) pairs.
+            oversampling (Oversampling or dict): Sample limits and standard error
+                targets, for all channels or per {(board_index, channel_index): Oversampling}.
+                Channels missing from the dict are read once.
+            mux_settle_time (float, optional): Settle after switching the muxes (seconds).
+
+        Returns:
+            dict: {(board_index, channel_index): (mean raw voltage, mean raw current,
+            monotonic_time, (samples, stderr raw voltage, stderr raw current))}
+        """
+        results = {}
+        for batch in self._mux_slots(channels, mux_settle_time):
+            samples = {board_idx: ([], []) for board_idx in batch}
+            pending = dict(batch)
+            while pending:
+                raw_v = self._convert_all(pending, VOLTAGE_PIN_SETTING)
+                raw_c = self._convert_all(pending, CURRENT_PIN_SETTING)
+                timestamp = time.monotonic()
+                for board_idx, channel in list(pending.items()):
+                    raw_voltages, raw_currents = samples[board_idx]
+                    raw_voltages.append(raw_v[board_idx])
+                    raw_currents.append(raw_c[board_idx])
+                    if isinstance(oversampling, dict):
+                        sampler = oversampling.get((board_idx, channel.ind), SINGLE_SAMPLE)
+                    else:
+                        sampler = oversampling
+                    mean_v, mean_c, stats, done = sampler.reduce(channel, raw_voltages, raw_currents)
+                    if done:
+                        results[(board_idx, channel.ind)] = (mean_v, mean_c, timestamp, stats)
+                        del pending[board_idx]
+        return results
+
+    def _mux_slots(self, channels, mux_settle_time=None):
+        """Group channels into mux slots (one channel per board), select and settle each slot.
+
+        Yields:
+            dict: {board_index: Channel} routed to the ADCs, ready to convert.
+        """
+        per_board = {}
+        for board_idx, ch in channels:
+            per_board.setdefault(board_idx, []).append(ch)
+
+        slots = max((len(chs) for chs in per_board.values()), default=0)
+        for slot in range(slots):
+            batch = {
+                board_idx: self.oboards[board_idx].channel[chs[slot]]
+                for board_idx, chs in per_board.items() if slot < len(chs)
+            }
+            switched = [
+                channel.board.aMux_select_channel(channel.mux_channel, settle=False)
+                for channel in batch.values()
+            ]
+            if any(switched):
+                if mux_settle_time is None:
+                    time.sleep(max(channel.board.adc_settle_time() for channel in batch.values()))
+                else:
+                    time.sleep(mux_settle_time)
+            yield batch
+
+    def _convert_all(self, batch, pin_setting):
+        """Trigger a conversion on every board of a batch and collect results as they finish.
+
+        Each channel converts at its own PGA gain for the pair (see
+        Channel.pga_gain); boards whose reading saturated are converted again
+        at a wider range. Codes are returned scaled to each board's Adc.gain.
+        """
+        raw = {}
+        gains = {board_idx: channel.pga_gain(pin_setting) for board_idx, channel in batch.items()}
+        pending = dict(batch)
+        while pending:
+            for board_idx, channel in pending.items():
+                channel.board.adc_start(pin_setting, gain=gains[board_idx])
+            # Nothing can be ready before the slowest nominal conversion time
+            time.sleep(max(channel.board.adc_conversion_time() for channel in pending.values()))
+
+            waiting = list(pending)
+            deadline = time.monotonic() + ADC_CONVERSION_POLL_TIMEOUT
+            while waiting:
+                for board_idx in list(waiting):
+                    channel = batch[board_idx]
+                    board = channel.board
+                    if not board.adc_ready():
+                        continue
+                    waiting.remove(board_idx)
+                    code, gain = board.adc_result(), gains[board_idx]
+                    if not board.autorange:
+                        raw[board_idx] = code
+                        del pending[board_idx]
+                        continue
+                    next_gain = board.autorange_gain(code, gain)
+                    if next_gain < gain:  # Saturated: convert again at a wider range
+                        board.io_stats["adc_range_retries"] += 1
+                        gains[board_idx] = next_gain
+                        continue
+                    channel.set_pga_gain(pin_setting, next_gain)
+                    raw[board_idx] = board.scale_code(code, gain)
+                    del pending[board_idx]
+                if waiting and time.monotonic() > deadline:
+                    raise TimeoutError(f"ADC conversion timed out on boards {waiting}")
+        return raw
+
+    def interleaved_iv_sweep(self, grids, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limits=None,
+                             data_rate=None):
+        """
+        Perform IV sweeps on many channels across all boards at once.
+
+        Convenience wrapper around :meth:`run_interleaved_sweep` returning plain points.
+
+        Args:
+            grids (dict): {(board_index, channel_index): voltages or SweepPlan}.
+            settle_time (float, optional): Dwell after setting the DACs (seconds).
+            current_limits (dict, optional): {(board_index, channel_index): limit_A}.
+            data_rate (int, optional): ADC data rate for all boards involved.
+
+        Returns:
+            dict: {(board_index, channel_index): list of points} with ``timestamp``,
+            ``voltage``, ``current`` and ``power`` keys.
+        """
+        results = self.run_interleaved_sweep(grids, settle_time, current_limits, data_rate)
+        return {key: result.points(key) for key, result in results.items()}
+
+    def run_interleaved_sweep(self, plans, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limits=None,
+                              data_rate=None, settle=None, oversampling=None, termination=None,
+                              priority=BUS_PRIORITY_LOW):
+        """
+        Execute sweep plans on many channels across all boards at once.
+
+        At every step the DACs of all participating channels are written first,
+        one shared settle is waited, and the readings are taken with
+        :meth:`acquire_raw`, so settling and conversions overlap across boards.
+        The DAC writes and each acquisition are separate bus executor
+        operations; other users get the bus while the sweep is settling.
+
+        Args:
+            plans (dict): {(board_index, channel_index): SweepPlan or voltages}.
+                Plans may differ in length; shorter ones simply finish earlier.
+            settle_time (float, optional): Dwell after setting the DACs (seconds).
+            current_limits (dict, optional): {(board_index, channel_index): limit_A}.
+                A channel exceeding its limit stops sweeping and is set to 0 V.
+            data_rate (int, optional): ADC data rate for all boards involved; the
+                previous rates are restored afterwards.
+            settle (SettleCriterion, optional): Read until the readings are stable
+                instead of dwelling ``settle_time``; settled channels are not read
+                again and the settle time of every point is recorded.
+            oversampling (Oversampling or dict, optional): Average each point with
+                :meth:`acquire_oversampled` (one setting or one per channel);
+                sample counts and standard errors are recorded.
+            termination (TerminationPolicy or dict, optional): Stop channels early
+                past Voc or before a predicted current-limit violation, one policy
+                for all or per {(board_index, channel_index): TerminationPolicy}.
+                Stop reasons are recorded in each result's ``stop_reasons``.
+            priority (int, optional): Bus executor priority of the sweep's operations.
+
+        Returns:
+            dict: {(board_index, channel_index): SweepResult}. Channels sharing a
+            plan share one SweepResult (one row per channel).
+        """
+        current_limits = current_limits or {}
+        plans = {key: SweepPlan.from_grid(plan) for key, plan in plans.items()}
+
+        # One result buffer per distinct plan
+        by_plan = {}
+        for key, plan in plans.items():
+            by_plan.setdefault(id(plan), (plan, []))[1].append(key)
+        results = {}
+        for plan, keys in by_plan.values():
+            result = SweepResult(plan, {
+                key: self.oboards[key[0]].channel[key[1]] for key in keys
+            })
+            results.update({key: result for key in keys})
+
+        active = set(plans)
+        history = {key: ([], []) for key in plans}
+        steps = max((len(plan) for plan in plans.values()), default=0)
+        boards = sorted({board_idx for board_idx, _ in plans})
+        swept_boards = [self.oboards[board_idx] for board_idx in boards]
+
+        def on_bus(fn, *args):
+            # Bus faults are recovered from and the step retried (see BusHealth)
+            return self.bus.call(fn, *args, priority=priority, boards=swept_boards,
+                                 timeout=BUS_OPERATION_TIMEOUT)
+
+        previous_adc = {
+            board_idx: on_bus(self.oboards[board_idx].configure_adc, None, data_rate)
+            for board_idx in boards
+        }
+
+        try:
+            for step in range(steps):
+                keys = [key for key in plans if key in active and step < len(plans[key])]
+                if not keys:
+                    break
+
+                on_bus(self.set_dac_values, {key: plans[key].dac_values[step] for key in keys})
+                settled_after = {}
+                if settle is None:
+                    time.sleep(settle_time)
+                else:
+                    readings = settle.wait(
+                        lambda channels: on_bus(self.acquire_raw, channels),
+                        {key: self.oboards[key[0]].channel[key[1]] for key in keys},
+                        time.monotonic()
+                    )
+                    settled_after = {key: reading[3] for key, reading in readings.items()}
+
+                stats = {}
+                if oversampling is not None:
+                    readings = on_bus(self.acquire_oversampled, keys, oversampling)
+                    stats = {key: reading[3] for key, reading in readings.items()}
+                elif settle is None:
+                    readings = on_bus(self.acquire_raw, keys)
+
+                for key in keys:
+                    raw_v, raw_c, timestamp = readings[key][:3]
+                    limit = current_limits.get(key)
+                    channel = self.oboards[key[0]].channel[key[1]]
+                    current = channel.convert_to_current(raw_c)
+                    if limit is not None and abs(current) > limit:
+                        on_bus(channel.set_voltage, 0)
+                        active.discard(key)
+                        results[key].stop(key, "current_limit", plans[key].voltages[step])
+                        continue
+                    results[key].record(key, step, raw_v, raw_c, timestamp, settled_after.get(key),
+                                        stats.get(key))
+
+                    policy = termination.get(key) if isinstance(termination, dict) else termination
+                    if policy is not None:
+                        voltages, currents = history[key]
+                        voltages.append(channel.convert_to_voltage(raw_v))
+                        currents.append(current)
+                        plan = plans[key]
+                        next_voltage = plan.voltages[step + 1] if step + 1 < len(plan) else None
+                        reason = policy.check(voltages, currents, next_voltage, limit)
+                        if reason is not None:
+                            on_bus(channel.set_voltage, 0)
+                            active.discard(key)
+                            results[key].stop(key, reason, plan.voltages[step])
+        finally:
+            on_bus(self.set_voltages, {key: 0 for key in plans})  # Safety
+            for board_idx, previous in previous_adc.items():
+                on_bus(self.oboards[board_idx].configure_adc, *previous)
+
+        for result in set(results.values()):
+            result.finish()
+        return results
+
+    def run_adaptive_sweep(self, grids, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limits=None,
+                           data_rate=None, settle=None, oversampling=None, termination=None,
+                           priority=BUS_PRIORITY_LOW):
+        """
+        Run adaptive IV sweeps on many channels, one interleaved sweep per pass.
+
+        Every pass collects the next voltages of all unfinished grids and runs
+        them together with :meth:`run_interleaved_sweep`; grids converge
+        independently and drop out of later passes.
+
+        Args:
+            grids (dict): {(board_index, channel_index): AdaptiveGrid}
+            settle_time (float, optional): Dwell after setting the DACs (seconds).
+            current_limits (dict, optional): {(board_index, channel_index): limit_A}.
+            data_rate (int, optional): ADC data rate for all boards involved.
+            settle (SettleCriterion, optional): Settle detection, see run_interleaved_sweep.
+            oversampling (Oversampling, optional): Per-point averaging, see run_interleaved_sweep.
+            termination (TerminationPolicy, optional): Early stop rules applied
+                within every pass; a pass stopped early caps the grid like the
+                current limit does.
+            priority (int, optional): Bus executor priority of the sweep's operations.
+
+        Returns:
+            dict: {(board_index, channel_index): AdaptiveGrid}, the same grids,
+            all finished.
+        """
+        while True:
+            plans = {}
+            for key, grid in grids.items():
+                voltages = grid.next_voltages()
+                if len(voltages):
+                    plans[key] = SweepPlan(voltages)
+            if not plans:
+                return grids
+
+            results = self.run_interleaved_sweep(
+                plans, settle_time=settle_time, current_limits=current_limits, data_rate=data_rate,
+                settle=settle, oversampling=oversampling, termination=termination,
+                priority=priority
+            )
+            for key, plan in plans.items():
+                grids[key].add(plan.voltages, results[key].columns(key),
+                               results[key].stop_reasons.get(key))
+
+    def set_voltages(self, voltages):
+        """
+        Set many channel voltages across boards, one OBoard.set_voltages call per board.
+
+        Args:
+            voltages (dict): {(board_index, channel_index): voltage in V}
+        """
+        for board_idx, board_voltages in self._per_board(voltages).items():
+            self.oboards[board_idx].set_voltages(board_voltages)
+
+    def set_dac_values(self, values):
+        """
+        Set many DAC values (16-bit scaled) across boards, one OBoard.set_dac_values call per board.
+
+        Args:
+            values (dict): {(board_index, channel_index): DAC value}
+        """
+        for board_idx, board_values in self._per_board(values).items():
+            self.oboards[board_idx].set_dac_values(board_values)
+
+    @staticmethod
+    def _per_board(values):
+        """Split {(board_index, channel_index): value} into {board_index: {channel_index: value}}."""
+        per_board = {}
+        for (board_idx, ch), value in values.items():
+            per_board.setdefault(board_idx, {})[ch] = value
+        return per_board
+
+    def reset_io_stats(self):
+        """Return the mux cache counters summed over all boards and reset them."""
+        totals = {}
+        for oboard in self.oboards:
+            for key, value in oboard.reset_io_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
     def print_all_boards_status(self):
         """Print the status of all boards for debugging purposes."""
         for oboard in self.oboards:
             print(f"Board ID: {oboard.ID}")
             for channel in oboard.channel:
-                print(f"Channel ID: {channel.id}, Last Voltage: {channel.last_v}")
\ No newline at end of file
+                print(f"Channel ID: {channel.id}, Last Voltage: {channel.last_v}")
+
+class MultiBusManager:
+    """
+    Runs several I2C buses in parallel, one OBoardManager and one worker thread per bus.
+
+    The boards of all buses form one list: global board indices count the
+    boards of the first bus, then those of the second, and so on, so
+    (board_index, channel_index) keys work as with a single OBoardManager.
+    The numbering is fixed once every bus is ready; boards added by a later
+    :meth:`rescan` get the next free global indices, whatever their bus, so
+    the boards in use keep theirs.
+    Bus-wide operations are split by bus and run on the per-bus workers at
+    the same time; results come back under the global keys.
+
+    Attributes:
+        managers (list[OBoardManager]): One manager per bus, in ``i2c_nums`` order.
+        oboards (list[OBoard]): All boards of all buses, in global index order.
+        i2c_nums (list[int]): The I2C bus numbers.
+
+    Example:
+        >>> manager = MultiBusManager([1, 3])
+        >>> results = manager.run_interleaved_sweep({(0, 0): voltages, (12, 0): voltages})
+    """
+    def __init__(self, i2c_nums, possible_offsets=BOARD_DEFAULT_OFFSET_RANGE, scan_cache=None,
+                 background=False):
+        """Initialize one OBoardManager per bus (concurrently) and the per-bus workers.
+
+        Args:
+            i2c_nums (iterable[int]): I2C bus numbers.
+            possible_offsets (iterable[int]): Board address offsets to look for.
+            scan_cache (str, optional): Scan cache directory, see OBoardManager.
+            background (bool): Return immediately and let boards join as they
+                come up, see OBoardManager. Global board indices follow the
+                boards present, so they settle once every bus is ready.
+        """
+        self.i2c_nums = list(i2c_nums)
+        with ThreadPoolExecutor(max_workers=len(self.i2c_nums)) as pool:
+            self.managers = list(pool.map(
+                lambda i2c_num: OBoardManager(i2c_num=i2c_num, possible_offsets=possible_offsets,
+                                              scan_cache=scan_cache, background=background),
+                self.i2c_nums
+            ))
+        self._fixed_locations = None  # Global numbering, fixed once every bus is ready
+        self._locations_lock = threading.Lock()
+        # Each worker knows its bus, so jobs already on it run nested calls inline
+        self._worker_bus = threading.local()
+        self._workers = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"bus-{i2c_num}-worker",
+                               initializer=setattr, initargs=(self._worker_bus, "index", bus_idx))
+            for bus_idx, i2c_num in enumerate(self.i2c_nums)
+        ]
+
+    @property
+    def oboards(self):
+        """All boards of all buses, in global index order."""
+        return [self.managers[bus_idx].oboards[local_idx] for bus_idx, local_idx in self._locations]
+
+    @property
+    def _locations(self):
+        """Global board index -> (bus index, local board index)."""
+        return self._update_locations()
+
+    def _update_locations(self):
+        """Number the boards up so far; the numbering is kept once every bus is ready."""
+        locations = [(bus_idx, local_idx)
+                     for bus_idx, manager in enumerate(self.managers)
+                     for local_idx in range(len(manager.oboards))]
+        with self._locations_lock:
+            if self._fixed_locations is None:
+                if self.state == "ready":
+                    self._fixed_locations = locations
+                return locations
+            # Boards rescanned in since are appended (local indices on a bus only grow)
+            known = set(self._fixed_locations)
+            self._fixed_locations += [location for location in locations if location not in known]
+            return list(self._fixed_locations)
+
+    @property
+    def state(self):
+        """Overall readiness: ``ready`` once every bus is, ``error`` if any bus failed."""
+        states = [manager.state for manager in self.managers]
+        if "error" in states:
+            return "error"
+        if all(state == "ready" for state in states):
+            return "ready"
+        return "initializing"
+
+    def status(self):
+        """Readiness of all buses.
+
+        Returns:
+            dict: ``state`` (see the property), ``boards`` (boards up so far)
+            and ``buses`` ({i2c_num: OBoardManager.status()}).
+        """
+        return {
+            "state": self.state,
+            "boards": len(self.oboards),
+            "buses": {manager.i2c_num: manager.status() for manager in self.managers},
+        }
+
+    def rescan(self):
+        """Rescan every bus (in parallel) and add boards plugged in since.
+
+        Returns:
+            dict: {i2c_num: offsets of the boards added}
+        """
+        self._update_locations()  # Fix the numbering of the boards present before adding any
+        futures = {manager.i2c_num: self.submit_bus(bus_idx, manager.rescan)
+                   for bus_idx, manager in enumerate(self.managers)}
+        return {i2c_num: future.result() for i2c_num, future in futures.items()}
+
+    def locate(self, board_idx):
+        """Get the bus of a global board index.
+
+        Returns:
+            tuple: (OBoardManager of the bus, board index within that manager)
+        """
+        bus_idx, local_idx = self._locations[board_idx]
+        return self.managers[bus_idx], local_idx
+
+    def submit(self, board_idx, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the worker of the bus a board is on.
+
+        Jobs for boards on the same bus run one after another; jobs for
+        different buses run in parallel.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the return value of ``fn``.
+        """
+        return self.submit_bus(self._locations[board_idx][0], fn, *args, **kwargs)
+
+    def submit_bus(self, bus_idx, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the worker of a bus (index into ``managers``).
+
+        Called from a job already running on that worker (e.g. a queued
+        sweep calling :meth:`run_adaptive_sweep`), ``fn`` runs right away in
+        the calling thread instead of queueing behind the caller for good.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the return value of ``fn``.
+        """
+        if getattr(self._worker_bus, "index", None) != bus_idx:
+            return self._workers[bus_idx].submit(fn, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def run_interleaved_sweep(self, plans, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limits=None,
+                              data_rate=None, settle=None, oversampling=None, termination=None,
+                              priority=BUS_PRIORITY_LOW):
+        """Run :meth:`OBoardManager.run_interleaved_sweep` on every bus in parallel.
+
+        Arguments as for OBoardManager.run_interleaved_sweep, keyed by global
+        board index.
+
+        Returns:
+            dict: {(board_index, channel_index): SweepResult}, keyed (and
+            with ``SweepResult.keys``) by global board index.
+        """
+        def run(manager, local, mapping):
+            results = manager.run_interleaved_sweep(
+                local["plans"], settle_time=settle_time, current_limits=local["current_limits"],
+                data_rate=data_rate, settle=settle, oversampling=local["oversampling"],
+                termination=local["termination"], priority=priority
+            )
+            for result in set(results.values()):
+                result.rekey(mapping)
+            return {mapping[key]: result for key, result in results.items()}
+
+        return self._run_per_bus(run, plans, current_limits, oversampling, termination)
+
+    def run_adaptive_sweep(self, grids, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limits=None,
+                           data_rate=None, settle=None, oversampling=None, termination=None,
+                           priority=BUS_PRIORITY_LOW):
+        """Run :meth:`OBoardManager.run_adaptive_sweep` on every bus in parallel.
+
+        Returns:
+            dict: {(board_index, channel_index): AdaptiveGrid}, the same grids, all finished.
+        """
+        def run(manager, local, mapping):
+            finished = manager.run_adaptive_sweep(
+                local["plans"], settle_time=settle_time, current_limits=local["current_limits"],
+                data_rate=data_rate, settle=settle, oversampling=local["oversampling"],
+                termination=local["termination"], priority=priority
+            )
+            return {mapping[key]: grid for key, grid in finished.items()}
+
+        return self._run_per_bus(run, grids, current_limits, oversampling, termination)
+
+    def _run_per_bus(self, run, plans, current_limits, oversampling, termination):
+        """Split keyed sweep arguments by bus, call ``run`` on each bus's worker and merge."""
+        per_bus = {}
+        locations = self._locations
+        for (board_idx, ch), plan in plans.items():
+            bus_idx, local_idx = locations[board_idx]
+            local = per_bus.setdefault(bus_idx, ({}, {}))
+            local[0][(local_idx, ch)] = plan
+            local[1][(local_idx, ch)] = (board_idx, ch)
+
+        futures = []
+        for bus_idx, (local_plans, mapping) in per_bus.items():
+            local = {
+                "plans": local_plans,
+                "current_limits": self._localize(current_limits, mapping),
+                "oversampling": self._localize(oversampling, mapping),
+                "termination": self._localize(termination, mapping),
+            }
+            futures.append(self.submit_bus(bus_idx, run, self.managers[bus_idx], local, mapping))
+
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    @staticmethod
+    def _localize(option, mapping):
+        """Re-key a per-channel dict option for one bus; other values apply to all buses."""
+        if not isinstance(option, dict):
+            return option
+        return {local: option[key] for local, key in mapping.items() if key in option}
+
+    def snapshot(self, priority=BUS_PRIORITY_NORMAL):
+        """Read voltage and current of every channel on all buses in one pass.
+
+        The buses are read in parallel on their executors, not on the
+        per-bus workers, so a snapshot does not wait for a sweep round in
+        progress (see OBoardManager.submit_snapshot).
+
+        Args:
+            priority (int, optional): Bus executor priority of the pass.
+
+        Returns:
+            dict: {(board_index, channel_index): (voltage, current, time)} keyed
+            by global board index, in board and channel order.
+        """
+        global_index = {location: board_idx for board_idx, location in enumerate(self._locations)}
+        futures = [manager.submit_snapshot(priority) for manager in self.managers]
+        results = {}
+        for bus_idx, future in enumerate(futures):
+            for (local_idx, ch), reading in future.result().items():
+                results[(global_index[(bus_idx, local_idx)], ch)] = reading
+        return dict(sorted(results.items()))
+
+    def set_voltages(self, voltages):
+        """
+        Set many channel voltages across all buses.
+
+        Args:
+            voltages (dict): {(board_index, channel_index): voltage in V}
+        """
+        for board_idx, board_voltages in OBoardManager._per_board(voltages).items():
+            self.oboards[board_idx].set_voltages(board_voltages)
+
+    def reset_io_stats(self):
+        """Return the mux cache counters summed over all boards of all buses and reset them."""
+        totals = {}
+        for manager in self.managers:
+            for key, value in manager.reset_io_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def bus_stats(self):
+        """Get the bus executor latency stats of every bus.
+
+        Returns:
+            dict: {i2c_num: BusExecutor.stats()}
+        """
+        return {manager.i2c_num: manager.bus.stats() for manager in self.managers}
+
+    def print_all_boards_status(self):
+        """Print the status of all boards for debugging purposes."""
+        for manager in self.managers:
+            manager.print_all_boards_status()
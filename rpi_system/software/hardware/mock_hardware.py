@@ -4,9 +4,145 @@ This allows development and testing on Windows or any platform without actual ha
 """
 
 import threading
+import time
 import numpy as np
 from datetime import datetime
 
+from .constants import (
+    SIMULATION_TIMING,
+    SIMULATION_NUM_BOARDS,
+    SIMULATION_I2C_TRANSACTION_TIME,
+    SIMULATION_CELL_ISC,
+    SIMULATION_CELL_VOC,
+    SIMULATION_CELL_IDEALITY,
+    SIMULATION_CELL_SHUNT_RESISTANCE,
+    SIMULATION_CELL_SPREAD,
+    SIMULATION_VOLTAGE_NOISE,
+    SIMULATION_CURRENT_NOISE,
+    SIMULATION_SETTLE_TIME_CONSTANT,
+    I2C_BASE_MUX,
+    I2C_BASE_ADC,
+    I2C_BASE_DAC_0,
+    I2C_BASE_DAC_1,
+    I2C_OFFSET_MULTIPLIER,
+    I2C_DAC_CHANNELS,
+    MAX_CHANNELS_PER_DAC,
+    CHANNEL_MUX_MAP,
+    CHANNEL_DAC_VOLTAGE_SCALE,
+    MUX_ADDRESS_SHIFT,
+    ADC_POINTER_CONVERSION,
+    ADC_POINTER_CONFIG,
+    ADC_CONFIG_OS_SINGLE,
+    ADC_CONFIG_MUX_OFFSET,
+    ADC_CONFIG_GAIN,
+    ADC_CONFIG_GAIN_MASK,
+)
+
+
+# ==================== Simulated bus state ====================
+class MockBusState:
+    """Traffic bookkeeping for one simulated I2C bus.
+
+    All mock devices created on the same bus ID share one instance. Every
+    simulated transaction is counted and, when ``SIMULATION_TIMING`` is
+    enabled, holds the bus for ``SIMULATION_I2C_TRANSACTION_TIME`` so that
+    concurrent users are serialized just like on a real bus.
+    """
+
+    def __init__(self, bus_id):
+        self.bus_id = bus_id
+        self.transactions = 0
+        self.devices = {}  # {address: mock device}
+        self.faults = {}  # {address: transactions left to NACK}
+        self.stuck = False  # SDA held low: every transaction times out
+        self._lock = threading.Lock()
+
+    def transaction(self, count=1, address=None):
+        """Account for ``count`` I2C transactions on this bus.
+
+        Raises:
+            OSError: The bus is stuck (ETIMEDOUT) or a fault is injected for
+                ``address`` (EREMOTEIO, like a NACK).
+        """
+        with self._lock:
+            self.transactions += count
+            if SIMULATION_TIMING:
+                time.sleep(SIMULATION_I2C_TRANSACTION_TIME * count)
+            if self.stuck:
+                raise OSError(110, f"I2C bus {self.bus_id} timed out (SDA stuck low)")
+            if self.faults.get(address):
+                self.faults[address] -= 1
+                raise OSError(121, f"No acknowledge from address {address:#04x}")
+
+    def fail(self, address, count=1):
+        """Make the next ``count`` transactions to ``address`` fail with a NACK."""
+        with self._lock:
+            self.faults[address] = count
+
+    def recover(self):
+        """Release a stuck bus, as clocking out the slave on reopen does."""
+        with self._lock:
+            self.stuck = False
+
+
+_BUS_STATES = {}
+_BUS_STATES_LOCK = threading.Lock()
+
+
+def get_bus_state(i2c):
+    """Return the shared MockBusState for the bus an I2C object is attached to."""
+    return get_bus_state_by_id(getattr(getattr(i2c, '_i2c', None), 'bus_id', None))
+
+
+def get_bus_state_by_id(bus_id):
+    """Return the shared MockBusState of a bus number."""
+    with _BUS_STATES_LOCK:
+        if bus_id not in _BUS_STATES:
+            _BUS_STATES[bus_id] = MockBusState(bus_id)
+        return _BUS_STATES[bus_id]
+
+# ==================== Simulated solar cells ====================
+class MockSolarCell:
+    """Single-diode solar cell model attached to one simulated channel.
+
+    I(V) = Iph - I0 * (exp(V / (n * Vt)) - 1) - V / Rsh, with current
+    positive while the cell generates power (0 < V < Voc).
+    """
+    
+    THERMAL_VOLTAGE = 0.02585  # kT/q at 300 K (V)
+    
+    def __init__(self, isc=SIMULATION_CELL_ISC, voc=SIMULATION_CELL_VOC,
+                 ideality=SIMULATION_CELL_IDEALITY, r_shunt=SIMULATION_CELL_SHUNT_RESISTANCE):
+        self.isc = isc
+        self.voc = voc
+        self.ideality = ideality
+        self.r_shunt = r_shunt
+        self.irradiance = 1.0  # Relative to the conditions isc was given for
+    
+    def current(self, voltage):
+        """Cell current (A) at a terminal voltage (V)."""
+        nvt = self.ideality * self.THERMAL_VOLTAGE
+        i0 = (self.isc - self.voc / self.r_shunt) / np.expm1(self.voc / nvt)
+        iph = self.isc * self.irradiance
+        return iph - i0 * np.expm1(voltage / nvt) - voltage / self.r_shunt
+
+
+_CELLS = {}
+_CELLS_LOCK = threading.Lock()
+
+
+def get_solar_cell(bus_id, offset, channel):
+    """Return the simulated cell on a channel, creating it with a reproducible spread."""
+    key = (bus_id, offset, channel)
+    with _CELLS_LOCK:
+        if key not in _CELLS:
+            rng = np.random.default_rng(abs(hash(key)) % (2**32))
+            spread = 1 + SIMULATION_CELL_SPREAD * rng.uniform(-1, 1, size=2)
+            _CELLS[key] = MockSolarCell(isc=SIMULATION_CELL_ISC * spread[0],
+                                        voc=SIMULATION_CELL_VOC * spread[1])
+        return _CELLS[key]
+
+
 # ==================== Mock busio ====================
 class MockI2C:
     """Mock I2C bus for development without hardware."""
@@ -26,9 +162,9 @@ class MockI2C:
     
     def scan(self):
         """Return list of simulated I2C device addresses."""
-        # Simulate 4 boards with proper address offsets
+        # Simulate SIMULATION_NUM_BOARDS boards with proper address offsets
         devices = []
-        for offset in range(4):
+        for offset in range(SIMULATION_NUM_BOARDS):
             devices.extend([
                 32 + offset * 1,   # MUX
                 72 + offset * 1,   # ADC
@@ -49,25 +185,69 @@ class MockI2C:
 
 # ==================== Mock Adafruit MCP4728 (DAC) ====================
 class MockMCP4728Channel:
-    """Mock single channel of MCP4728 DAC."""
+    """Mock single channel of MCP4728 DAC.
+
+    With simulated timing the output (as seen by the cell) follows a new
+    value with a first-order lag, so readings taken right after a write
+    have not settled yet.
+    """
     
-    def __init__(self):
-        self._value = 0
+    def __init__(self, dac=None):
+        self._dac = dac
         self._raw_value = 0
+        self._previous_value = 0.0
+        self._changed_at = 0.0
         self.gain = 1
     
     @property
     def value(self):
-        return self._value
+        return self._raw_value << 4
     
     @value.setter
     def value(self, val):
-        self._value = val
-        self._raw_value = val
+        # Scale from 16-bit to 12-bit like adafruit_mcp4728
+        self.raw_value = int(val) >> 4
     
     @property
     def raw_value(self):
         return self._raw_value
+    
+    @raw_value.setter
+    def raw_value(self, val):
+        if self._dac is not None:
+            self._dac._bus.transaction(address=self._dac.address)
+        self._set_raw(val)
+    
+    def _set_raw(self, val):
+        if val != self._raw_value:
+            self._previous_value = self.output_value()
+            self._changed_at = time.monotonic()
+        self._raw_value = val
+    
+    def output_value(self):
+        """16-bit scaled output value including the settling lag."""
+        target = self._raw_value << 4
+        if not SIMULATION_TIMING:
+            return target
+        decay = np.exp(-(time.monotonic() - self._changed_at) / SIMULATION_SETTLE_TIME_CONSTANT)
+        return target + (self._previous_value - target) * decay
+
+
+class MockI2CDevice:
+    """Mock adafruit_bus_device I2CDevice that hands raw writes to its device."""
+    
+    def __init__(self, device):
+        self._device = device
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def write(self, buf, start=0, end=None):
+        self._device._bus.transaction(address=self._device.address)
+        self._device._handle_write(bytes(buf[start:end]))
 
 
 class MockMCP4728:
@@ -75,48 +255,148 @@ class MockMCP4728:
     
     def __init__(self, i2c, address=0x60):
         self.address = address
-        self.channel_a = MockMCP4728Channel()
-        self.channel_b = MockMCP4728Channel()
-        self.channel_c = MockMCP4728Channel()
-        self.channel_d = MockMCP4728Channel()
+        self._bus = get_bus_state(i2c)
+        self._bus.devices[address] = self
+        self.i2c_device = MockI2CDevice(self)
+        self.channel_a = MockMCP4728Channel(self)
+        self.channel_b = MockMCP4728Channel(self)
+        self.channel_c = MockMCP4728Channel(self)
+        self.channel_d = MockMCP4728Channel(self)
         print(f"[MOCK] MCP4728 DAC initialized at address {address}")
+    
+    def _handle_write(self, buf):
+        """Decode a Fast Write (C2:C1 = 00, 2 bytes per channel, A to D) or a
+        Multi-Write (01000, 3 bytes per channel naming the channel) command."""
+        channels = [self.channel_a, self.channel_b, self.channel_c, self.channel_d]
+        if buf and buf[0] & 0xC0 == 0x00:
+            for channel, i in zip(channels, range(0, len(buf) - 1, 2)):
+                channel._set_raw(((buf[i] & 0x0F) << 8) | buf[i + 1])
+        elif buf and buf[0] & 0xF8 == 0x40:
+            for i in range(0, len(buf) - 2, 3):
+                channels[(buf[i] >> 1) & 0x03]._set_raw(((buf[i + 1] & 0x0F) << 8) | buf[i + 2])
+    
+    def _i2c_write(self, buf):
+        self.i2c_device.write(buf)
 
 
 # ==================== Mock Adafruit ADS1115 (ADC) ====================
 class MockADS1115:
-    """Mock ADS1115 16-bit ADC."""
+    """Mock ADS1115 16-bit ADC.
+
+    Emulates the register interface used by ``adafruit_ads1x15`` (config
+    write starts a single-shot conversion, the OS bit signals completion)
+    so that split trigger/collect reads behave like on hardware.
+    """
+    
+    rates = [8, 16, 32, 64, 128, 250, 475, 860]
+    rate_config = {
+        8: 0x0000,
+        16: 0x0020,
+        32: 0x0040,
+        64: 0x0060,
+        128: 0x0080,
+        250: 0x00A0,
+        475: 0x00C0,
+        860: 0x00E0,
+    }
+    mode = 0x0100  # Single-shot
     
     def __init__(self, i2c, gain=1, data_rate=128, address=0x48):
         self.address = address
         self.gain = gain
         self.data_rate = data_rate
         self.bits = 16
+        self._bus = get_bus_state(i2c)
+        self._bus.devices[address] = self
+        self._config = 0
+        self._conversion_end = 0.0
+        self._last_result = 0
         self._simulated_voltage = 0.0
         self._simulated_current = 0.0
         print(f"[MOCK] ADS1115 ADC initialized at address {address}")
     
-    def read(self, pin_setting):
+    def read(self, pin, is_differential=False):
+        """Blocking single-shot read, mirroring ``ADS1x15.read``."""
+        pin = pin if is_differential else pin + 0x04
+        self._write_register(ADC_POINTER_CONFIG, ADC_CONFIG_OS_SINGLE | (pin & 0x07) << ADC_CONFIG_MUX_OFFSET)
+        while not self._conversion_complete():
+            pass
+        return self._conversion_value(self.get_last_result())
+    
+    def _write_register(self, reg, value):
+        self._bus.transaction(address=self.address)
+        if reg == ADC_POINTER_CONFIG and value & ADC_CONFIG_OS_SINGLE:
+            self._config = value & ~ADC_CONFIG_OS_SINGLE
+            mux = (value >> ADC_CONFIG_MUX_OFFSET) & 0x07
+            gain = _GAIN_FROM_CONFIG.get(value & ADC_CONFIG_GAIN_MASK, self.gain)
+            self._last_result = self._simulate_conversion(mux, gain)
+            duration = 1.0 / self.data_rate if SIMULATION_TIMING else 0.0
+            self._conversion_end = time.monotonic() + duration
+    
+    def _read_register(self, reg, fast=False):
+        self._bus.transaction(address=self.address)
+        if reg == ADC_POINTER_CONFIG:
+            ready = time.monotonic() >= self._conversion_end
+            return self._config | (ADC_CONFIG_OS_SINGLE if ready else 0)
+        return self._last_result & 0xFFFF
+    
+    def _i2c_write(self, buf):
+        if len(buf) == 3:
+            self._write_register(buf[0], (buf[1] << 8) | buf[2])
+    
+    def _i2c_write_then_read(self, buf, nbytes):
+        return self._read_register(buf[0]).to_bytes(2, "big")[:nbytes]
+    
+    def _conversion_complete(self):
+        return self._read_register(ADC_POINTER_CONFIG) & ADC_CONFIG_OS_SINGLE
+    
+    def get_last_result(self, fast=False):
+        return self._read_register(ADC_POINTER_CONVERSION, fast)
+    
+    def _conversion_value(self, raw_adc):
+        raw_adc &= 0xFFFF
+        return raw_adc - 0x10000 if raw_adc & 0x8000 else raw_adc
+    
+    def _simulate_conversion(self, mux, gain=None):
         """Simulate ADC reading with realistic solar cell behavior."""
-        # Simulate a solar cell with some variation
-        # Return 16-bit integer value
+        lsb = _ADS1X15_PGA_RANGE[self.gain if gain is None else gain] / (1 << 15)
+        cell_voltage, cell_current = self._routed_cell()
+        noise_scale = np.sqrt(self.data_rate / 128)  # Faster data rates are noisier
         
-        # Differential pairs: P0-P1 is voltage, P2-P3 is current
-        if pin_setting == 0x0000:  # P0-P1 (voltage)
-            # Simulate voltage reading (0-1.2V typical for solar cell)
-            voltage = 0.8 + np.random.normal(0, 0.01)  # ~0.8V ± noise
-            # Convert to 16-bit ADC value
-            lsb = 4.096 / (1 << 15)  # For gain=1
-            return int(voltage / lsb)
+        # Voltage on input pair 0 (P0-P1), current via shunt on input pair 3 (P2-P3)
+        if mux & 0x03 == 0x00:
+            voltage = cell_voltage + np.random.normal(0, SIMULATION_VOLTAGE_NOISE * noise_scale)
+        elif mux & 0x03 == 0x03:
+            current_amps = cell_current + np.random.normal(0, SIMULATION_CURRENT_NOISE * noise_scale)
+            voltage = current_amps * 20  # V = I * R
+        else:
+            return 0
         
-        elif pin_setting == 0x0003:  # P2-P3 (current via shunt)
-            # Simulate current reading (voltage across 20Ω shunt)
-            current_amps = 0.01 + np.random.normal(0, 0.0001)  # ~10mA ± noise
-            voltage_across_shunt = current_amps * 20  # V = I * R
-            lsb = 4.096 / (1 << 15)
-            return int(voltage_across_shunt / lsb)
+        # Convert to 16-bit ADC value, clipped like a real ADC
+        return int(max(-32768, min(32767, voltage / lsb)))
+    
+    def _routed_cell(self):
+        """Voltage and current of the cell the board's mux currently routes to this ADC."""
+        offset = (self.address - I2C_BASE_ADC) // I2C_OFFSET_MULTIPLIER[I2C_BASE_ADC]
+        mux = self._bus.devices.get(I2C_BASE_MUX + offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_MUX])
+        if mux is None:
+            return 0.0, 0.0
+        
+        mux_address = sum(mux._pins[MUX_ADDRESS_SHIFT + bit].value << bit for bit in range(3))
+        channel = CHANNEL_MUX_MAP.index(mux_address)
+        base = I2C_BASE_DAC_0 if channel < MAX_CHANNELS_PER_DAC else I2C_BASE_DAC_1
+        dac = self._bus.devices.get(base + offset * I2C_OFFSET_MULTIPLIER[base])
+        if dac is None:
+            return 0.0, 0.0
         
-        return 0
+        # Cell voltage as set by Channel.set_voltage (DAC output is half the cell voltage)
+        dac_channel = getattr(dac, I2C_DAC_CHANNELS[channel % MAX_CHANNELS_PER_DAC])
+        voltage = dac_channel.output_value() * CHANNEL_DAC_VOLTAGE_SCALE * 2
+        cell = get_solar_cell(self._bus.bus_id, offset, channel)
+        return voltage, cell.current(voltage)
+
 
+_GAIN_FROM_CONFIG = {bits: gain for gain, bits in ADC_CONFIG_GAIN.items()}
 
 # Mock pin settings for ADS1115
 class MockPin:
@@ -149,12 +429,16 @@ _ADS1X15_PGA_RANGE = {
 class MockMCP23017Pin:
     """Mock single pin of MCP23017."""
     
-    def __init__(self, pin_num):
+    def __init__(self, pin_num, bus=None):
         self.pin_num = pin_num
+        self._bus = bus
         self._value = 0
     
     def switch_to_output(self, value=False):
         """Set pin as output with initial value."""
+        # adafruit_mcp230xx does a read-modify-write of IODIR and of GPIO
+        if self._bus is not None:
+            self._bus.transaction(4)
         self._value = int(value)
     
     def switch_to_input(self):
@@ -175,7 +459,10 @@ class MockMCP23017:
     
     def __init__(self, i2c, address=0x20):
         self.address = address
-        self._pins = {i: MockMCP23017Pin(i) for i in range(16)}
+        self._bus = get_bus_state(i2c)
+        self._bus.devices[address] = self
+        self._pins = {i: MockMCP23017Pin(i, self._bus) for i in range(16)}
+        self._iodir = 0xFFFF  # All pins are inputs after power-on
         print(f"[MOCK] MCP23017 I/O Expander initialized at address {address}")
     
     def get_pin(self, pin_num):
@@ -186,6 +473,93 @@ class MockMCP23017:
         """Set a pin value."""
         pin = self.get_pin(pin_num)
         pin.value = value
+    
+    def _read_port(self, first_pin):
+        self._bus.transaction(address=self.address)
+        return sum(self._pins[first_pin + i].value << i for i in range(8))
+    
+    def _write_port(self, first_pin, val):
+        self._bus.transaction(address=self.address)
+        for i in range(8):
+            self._pins[first_pin + i].value = (val >> i) & 1
+    
+    @property
+    def gpioa(self):
+        """GPIO port A (pins 0-7) as an 8-bit value."""
+        return self._read_port(0)
+    
+    @gpioa.setter
+    def gpioa(self, val):
+        self._write_port(0, val)
+    
+    @property
+    def gpiob(self):
+        """GPIO port B (pins 8-15) as an 8-bit value."""
+        return self._read_port(8)
+    
+    @gpiob.setter
+    def gpiob(self, val):
+        self._write_port(8, val)
+
+    @property
+    def gpio(self):
+        """Both GPIO ports (pins 0-15) as a 16-bit value, read in one transaction."""
+        self._bus.transaction(address=self.address)
+        return sum(self._pins[i].value << i for i in range(16))
+    
+    @gpio.setter
+    def gpio(self, val):
+        self._bus.transaction(address=self.address)
+        for i in range(16):
+            self._pins[i].value = (val >> i) & 1
+    
+    @property
+    def iodir(self):
+        """Pin directions (1 = input) as a 16-bit value."""
+        self._bus.transaction(address=self.address)
+        return self._iodir
+    
+    @iodir.setter
+    def iodir(self, val):
+        self._bus.transaction(address=self.address)
+        self._iodir = val & 0xFFFF
+
+
+# ==================== Mock i2c-dev transport ====================
+class MockI2CDev:
+    """Mock of the direct /dev/i2c-N transport (see i2c.LinuxI2CDev).
+
+    Raw messages are handed to the mock device at the target address;
+    each call is one simulated transaction, like one ioctl on hardware.
+    """
+    
+    def __init__(self, bus_id):
+        self.bus_id = bus_id
+        self._bus = get_bus_state_by_id(bus_id)
+    
+    def _device(self, address):
+        device = self._bus.devices.get(address)
+        if device is None:
+            raise OSError(121, f"No device at address {address:#04x}")  # EREMOTEIO, like a NACK
+        return device
+    
+    def write(self, address, data):
+        self._device(address)._i2c_write(bytes(data))
+    
+    def write_then_read(self, address, data, nbytes):
+        return self._device(address)._i2c_write_then_read(bytes(data), nbytes)
+    
+    def write_register16(self, address, pointer, value):
+        self.write(address, bytes([pointer, value >> 8, value & 0xFF]))
+    
+    def read_register16(self, address, pointer):
+        return int.from_bytes(self.write_then_read(address, bytes([pointer]), 2), "big")
+    
+    def close(self):
+        pass
+    
+    def reopen(self):
+        self._bus.recover()
 
 
 # ==================== Module Exports ====================
@@ -228,4 +602,5 @@ class MockBlinka_I2C:
         self.bus_id = bus_id
         self.mode = mode
         self.baudrate = baudrate
+        get_bus_state_by_id(bus_id).recover()
         print(f"[MOCK] Blinka I2C initialized on bus {bus_id}")
@@ -0,0 +1,842 @@
+import abc
+import collections
+import threading
+import time
+import numpy as np
+
+from .constants import (
+    BUS_OPERATION_TIMEOUT,
+    BUS_PRIORITY_HIGH,
+    CHANNEL_DAC_VOLTAGE_SCALE,
+    CHANNEL_INITIAL_DIRECTION,
+    CHANNEL_INITIAL_POWER,
+    CHANNEL_INITIAL_VOLTAGE_STEP,
+    CHANNEL_MIN_VOLTAGE_STEP,
+    CHANNEL_POWER_DECREASE_FACTOR,
+    CHANNEL_POWER_INCREASE_FACTOR,
+    MPPT_CONVERGENCE_REVERSALS,
+    MPPT_DEFAULT_RATE,
+    MPPT_DEFAULT_STRATEGY,
+    MPPT_GSS_COLD_RANGE,
+    MPPT_GSS_RETRACK_SPAN,
+    MPPT_GSS_SPAN_STEPS,
+    MPPT_GSS_TOLERANCE,
+    MPPT_INCCOND_TOLERANCE,
+    MPPT_RATE_WINDOW,
+    MPPT_SETTLE_TIME,
+    MPPT_WARM_POWER_TOLERANCE,
+)
+
+
+def warm_start_step(pmax, curvature, tolerance=MPPT_WARM_POWER_TOLERANCE):
+    """First P&O step for a start at the MPP of a known IV curve.
+
+    Near the MPP the power falls off as ``P = Pmax + curvature * dV**2 / 2``.
+    The step is sized so that stepping off the MPP loses ``tolerance`` of
+    Pmax: large enough to be seen above the noise, small enough not to
+    leave the MPP. Flat curves get wide steps, peaked curves narrow ones.
+
+    Args:
+        pmax (float): Maximum power of the curve (W).
+        curvature (float): d2P/dV2 at the MPP (W/V^2), see sweep.mpp_curvature.
+        tolerance (float, optional): Relative power drop of the first step.
+
+    Returns:
+        float: Step size (V); CHANNEL_INITIAL_VOLTAGE_STEP if the curve gives
+        no usable curvature.
+    """
+    if not (pmax > 0 and curvature < 0):  # Also catches NaN
+        return CHANNEL_INITIAL_VOLTAGE_STEP
+    return float(np.sqrt(2 * tolerance * pmax / -curvature))
+
+
+class MPPTStrategy(abc.ABC):
+    """Base class of the tracking algorithms run by :class:`MPPTState`.
+
+    A strategy works on a subset of the rows of a state at once. It reads
+    the measurement taken at ``state.voltage`` and writes the next set
+    voltage, and may keep extra per-row arrays of its own (one strategy
+    instance per state).
+
+    Attributes:
+        name (str): Name used to select the strategy, see MPPT_STRATEGIES
+        convergence_events (int): Events (see :meth:`update`) after which a
+            channel counts as converged
+    """
+
+    name = None
+    convergence_events = MPPT_CONVERGENCE_REVERSALS
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows (int): Rows of the state the strategy belongs to.
+        """
+
+    def start(self, state, rows):
+        """(Re)start tracking of ``rows`` from ``state.voltage`` and ``state.step``."""
+
+    @abc.abstractmethod
+    def update(self, state, rows, voltage, current, power):
+        """Take one step on ``rows``.
+
+        Args:
+            state (MPPTState): State to update in place
+            rows (np.ndarray): Rows to step
+            voltage, current, power (np.ndarray): Measured at ``state.voltage[rows]``
+
+        Returns:
+            np.ndarray: Per row, whether a convergence event (e.g. a
+            direction reversal around the MPP) happened.
+        """
+
+
+class PerturbObserve(MPPTStrategy):
+    """Hill climbing on the power, as Channel.mppt_step."""
+
+    name = "perturb_observe"
+
+    def update(self, state, rows, voltage, current, power):
+        rose = power >= state.power[rows]
+        step = np.where(rose, np.minimum(state.step[rows] * CHANNEL_POWER_INCREASE_FACTOR,
+                                         state.max_step[rows]),
+                        state.step[rows] * CHANNEL_POWER_DECREASE_FACTOR)
+        step = np.maximum(step, CHANNEL_MIN_VOLTAGE_STEP)
+        direction = np.where(rose, state.direction[rows], -state.direction[rows])
+        state.step[rows] = step
+        state.direction[rows] = direction
+        state.voltage[rows] = state.clip(rows, state.voltage[rows] + step * direction)
+        return ~rose
+
+
+class IncrementalConductance(MPPTStrategy):
+    """Climb along dP/dV = I (1 + V/I dI/dV) and hold where it vanishes.
+
+    The sign of ``1 + V/I dI/dV``, from the change since the previous
+    reading, gives the direction to the MPP. Within
+    MPPT_INCCOND_TOLERANCE of zero the set point is held; the next reading
+    then shows no voltage change and the channel steps on, which dithers
+    it around the MPP. Past Voc (no positive current) it steps down.
+    Step sizes adapt as for perturb-and-observe.
+    """
+
+    name = "incremental_conductance"
+
+    def update(self, state, rows, voltage, current, power):
+        dv = voltage - state.measured_voltage[rows]
+        di = current - state.measured_current[rows]
+        moved = np.abs(dv) >= CHANNEL_MIN_VOLTAGE_STEP / 2  # False on the first reading (NaN)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = 1 + np.where(moved, di / dv, 0.0) * voltage / current
+        at_mpp = moved & (np.abs(slope) < MPPT_INCCOND_TOLERANCE)
+
+        previous = state.direction[rows]
+        direction = np.where(moved & ~at_mpp, np.where(slope > 0, 1, -1), previous)
+        direction = np.where(current > 0, direction, -1)
+        reversed_ = direction != previous
+        climbing = moved & ~at_mpp & ~reversed_
+        step = np.where(reversed_, state.step[rows] * CHANNEL_POWER_DECREASE_FACTOR,
+                        np.where(climbing, np.minimum(state.step[rows] * CHANNEL_POWER_INCREASE_FACTOR,
+                                                      state.max_step[rows]),
+                                 state.step[rows]))
+        step = np.maximum(step, CHANNEL_MIN_VOLTAGE_STEP)
+        state.step[rows] = step
+        state.direction[rows] = direction
+        state.voltage[rows] = np.where(at_mpp, state.voltage[rows],
+                                       state.clip(rows, state.voltage[rows] + step * direction))
+        return reversed_ | at_mpp
+
+
+class GoldenSection(MPPTStrategy):
+    """Bounded golden-section search for the MPP, one probe per pass.
+
+    A cold start brackets MPPT_GSS_COLD_RANGE, a warm start
+    MPPT_GSS_SPAN_STEPS first steps on either side of the start voltage.
+    Each pass measures one interior point and drops the part of the
+    bracket that cannot hold the maximum. Once the bracket is narrower than
+    MPPT_GSS_TOLERANCE (a convergence event) the search restarts
+    MPPT_GSS_RETRACK_SPAN around the best point, so drift is followed.
+    Assumes a single power maximum inside the bracket.
+    """
+
+    name = "golden_section"
+    convergence_events = 1
+    _RATIO = (np.sqrt(5) - 1) / 2
+
+    # Probe being measured: first/second point of a new bracket, or the
+    # replacement of the lower/upper interior point after a shrink
+    _FIRST, _SECOND, _LOWER, _UPPER = range(4)
+
+    def __init__(self, rows):
+        self.low = np.zeros(rows)
+        self.high = np.zeros(rows)
+        self.x1 = np.zeros(rows)
+        self.x2 = np.zeros(rows)
+        self.p1 = np.zeros(rows)
+        self.p2 = np.zeros(rows)
+        self.probe = np.zeros(rows, dtype=np.int64)
+
+    def start(self, state, rows):
+        low, high = state.voltage_range(rows)
+        warm = state.warm[rows]
+        half = MPPT_GSS_SPAN_STEPS * state.step[rows]
+        low = np.maximum(np.where(warm, state.voltage[rows] - half, MPPT_GSS_COLD_RANGE[0]), low)
+        high = np.minimum(np.where(warm, state.voltage[rows] + half, MPPT_GSS_COLD_RANGE[1]), high)
+        self._bracket(state, rows, low, high)
+
+    def _bracket(self, state, rows, low, high):
+        self.low[rows], self.high[rows] = low, high
+        self.x1[rows] = high - self._RATIO * (high - low)
+        self.x2[rows] = low + self._RATIO * (high - low)
+        self.probe[rows] = self._FIRST
+        state.voltage[rows] = self.x1[rows]
+
+    def update(self, state, rows, voltage, current, power):
+        probe = self.probe[rows]
+        at_x1 = (probe == self._FIRST) | (probe == self._LOWER)
+        self.p1[rows] = np.where(at_x1, power, self.p1[rows])
+        self.p2[rows] = np.where(at_x1, self.p2[rows], power)
+
+        # Second point of a new bracket still to measure
+        first = probe == self._FIRST
+        self.probe[rows[first]] = self._SECOND
+        state.voltage[rows[first]] = self.x2[rows[first]]
+
+        shrink = rows[~first]
+        low, high = self.low[shrink], self.high[shrink]
+        x1, x2, p1, p2 = self.x1[shrink], self.x2[shrink], self.p1[shrink], self.p2[shrink]
+        left = p1 > p2  # Maximum in [low, x2]
+        low, high = np.where(left, low, x1), np.where(left, x2, high)
+        new_x1 = np.where(left, high - self._RATIO * (high - low), x2)
+        new_x2 = np.where(left, x1, low + self._RATIO * (high - low))
+        kept = np.where(left, p1, p2)  # Power at the interior point that stays
+        self.p1[shrink], self.p2[shrink] = kept, kept  # The other one is measured next
+        self.low[shrink], self.high[shrink] = low, high
+        self.x1[shrink], self.x2[shrink] = new_x1, new_x2
+        self.probe[shrink] = np.where(left, self._LOWER, self._UPPER)
+        state.voltage[shrink] = np.where(left, new_x1, new_x2)
+
+        converged = np.zeros(len(rows), dtype=bool)
+        converged[~first] = high - low < MPPT_GSS_TOLERANCE
+        if converged.any():
+            done = rows[converged]
+            best = np.where(self.p1[done] > self.p2[done], self.x1[done], self.x2[done])
+            range_low, range_high = state.voltage_range(done)
+            self._bracket(state, done, np.maximum(best - MPPT_GSS_RETRACK_SPAN, range_low),
+                          np.minimum(best + MPPT_GSS_RETRACK_SPAN, range_high))
+        return converged
+
+
+MPPT_STRATEGIES = {strategy.name: strategy
+                   for strategy in (PerturbObserve, IncrementalConductance, GoldenSection)}
+
+
+def _check_strategy(name):
+    """Raise ValueError unless ``name`` is one of MPPT_STRATEGIES."""
+    if name not in MPPT_STRATEGIES:
+        raise ValueError(f"Unknown MPPT strategy {name!r}, expected one of {list(MPPT_STRATEGIES)}")
+
+
+class MPPTState:
+    """Tracking state of many channels as arrays, one row per channel.
+
+    Holds what Channel keeps in ``last_v``, ``last_p``, ``dv`` and
+    ``last_dir`` for each tracked channel, so that one :meth:`update`
+    computes the next set point of every channel at once. Each channel
+    follows one of the MPPT_STRATEGIES (perturb-and-observe, as
+    Channel.mppt_step, by default); every strategy steps all of its rows
+    in one vectorized call. ADC scaling and DAC limits are captured per
+    channel when the state is created, as in SweepResult.
+
+    A channel counts as converged after the strategy's
+    ``convergence_events`` since it was (re)started, e.g.
+    MPPT_CONVERGENCE_REVERSALS direction reversals for perturb-and-observe,
+    i.e. once the tracker oscillates around the MPP.
+
+    Only active rows are stepped (see :meth:`set_active`); inactive rows
+    keep their state, e.g. while their channel is swept.
+
+    Attributes:
+        keys (list): Channel keys, in row order
+        voltage (np.ndarray): Set voltage of each channel (V)
+        power (np.ndarray): Power measured at the previous set voltage (W)
+        measured_voltage, measured_current (np.ndarray): Previous reading (V, A)
+        step (np.ndarray): Present step size (V)
+        max_step (np.ndarray): Largest step size of each channel (V)
+        direction (np.ndarray): Present step direction (+1 or -1)
+        strategy (list[str]): Strategy name of each channel
+        active (np.ndarray): Whether each channel is stepped by :meth:`update`
+        updates (np.ndarray): Steps taken by each channel
+        warm (np.ndarray): Whether each channel was last started by :meth:`seed`
+        convergence_time (np.ndarray): Seconds from the (re)start of each
+            channel to convergence, NaN while converging
+        convergence_passes (np.ndarray): Updates from the (re)start to
+            convergence, -1 while converging
+    """
+
+    def __init__(self, channels, strategy=MPPT_DEFAULT_STRATEGY):
+        """Capture the state and scaling of the channels.
+
+        Args:
+            channels (dict): {key: Channel}
+            strategy (str | dict, optional): Strategy name for all channels,
+                or {key: name} with the default for keys left out.
+        """
+        self.keys = list(channels)
+        self._channels = list(channels.values())
+        self.max_step = np.array([channel.max_dv for channel in self._channels], dtype=np.float64)
+        self._dac_limits = np.array([channel.Voltage_limits for channel in self._channels],
+                                    dtype=np.float64).reshape(-1, 2)
+        self._volts_per_code = np.array([
+            channel.adc_lsb() / (1 << (16 - channel.board.Adc.bits)) for channel in self._channels
+        ])
+        self._r_shunt = np.array([channel.R_shunt for channel in self._channels], dtype=np.float64)
+        rows = len(self.keys)
+        self._events = np.zeros(rows, dtype=np.int64)
+        self._events_needed = np.zeros(rows, dtype=np.int64)
+        self._passes = np.zeros(rows, dtype=np.int64)
+        self._started = np.zeros(rows, dtype=np.float64)
+        self.convergence_time = np.full(rows, np.nan)
+        self.convergence_passes = np.full(rows, -1, dtype=np.int64)
+        self.active = np.ones(rows, dtype=bool)
+        self.updates = np.zeros(rows, dtype=np.int64)
+        self._active_rows = np.arange(rows)
+        self._strategies = {}
+        if isinstance(strategy, str):
+            self.strategy = [strategy] * rows
+        else:
+            self.strategy = [strategy.get(key, MPPT_DEFAULT_STRATEGY) for key in self.keys]
+        for name in set(self.strategy):
+            _check_strategy(name)
+        self._all_rows = self._by_strategy(self._active_rows)
+        self.load()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self):
+        """Take over the tracking state kept in the Channel attributes."""
+        self.voltage = np.array([channel.last_v for channel in self._channels], dtype=np.float64)
+        self.power = np.array([channel.last_p for channel in self._channels], dtype=np.float64)
+        self.step = np.array([channel.dv for channel in self._channels], dtype=np.float64)
+        self.direction = np.array([channel.last_dir for channel in self._channels], dtype=np.int64)
+        self.measured_voltage = np.full(len(self.keys), np.nan)
+        self.measured_current = np.full(len(self.keys), np.nan)
+        self.warm = np.zeros(len(self.keys), dtype=bool)
+        self._restart(np.arange(len(self.keys)))
+
+    def seed(self, rows, voltage, step):
+        """Warm-start channels from known operating points (see Channel.warm_start).
+
+        Args:
+            rows (array-like[int]): Rows (indices into ``keys``) to restart.
+            voltage (array-like[float]): Set voltage to start from (V), per row.
+            step (array-like[float]): First step size (V), per row.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self.voltage[rows] = voltage
+        self.step[rows] = np.clip(step, CHANNEL_MIN_VOLTAGE_STEP, self.max_step[rows])
+        self.direction[rows] = CHANNEL_INITIAL_DIRECTION
+        self.power[rows] = CHANNEL_INITIAL_POWER
+        self.measured_voltage[rows] = np.nan
+        self.measured_current[rows] = np.nan
+        self.warm[rows] = True
+        self._restart(rows)
+
+    def set_strategy(self, rows, name):
+        """Switch channels to another strategy, restarting them where they are.
+
+        Args:
+            rows (array-like[int]): Rows to switch.
+            name (str): One of MPPT_STRATEGIES.
+        """
+        _check_strategy(name)
+        rows = np.asarray(rows, dtype=np.int64)
+        for row in rows:
+            self.strategy[row] = name
+        self._all_rows = self._by_strategy(self._active_rows)
+        self._restart(rows)
+
+    def set_active(self, rows, active):
+        """Start or stop stepping channels; their state is kept either way.
+
+        Args:
+            rows (array-like[int]): Rows to switch.
+            active (bool): Whether :meth:`update` steps them.
+        """
+        self.active[np.asarray(rows, dtype=np.int64)] = active
+        self._active_rows = np.flatnonzero(self.active)
+        self._all_rows = self._by_strategy(self._active_rows)
+
+    def _by_strategy(self, rows):
+        """Split rows by strategy: {strategy instance: rows}."""
+        groups = {}
+        for row in rows:
+            groups.setdefault(self.strategy[row], []).append(row)
+        result = {}
+        for name, strategy_rows in groups.items():
+            if name not in self._strategies:
+                self._strategies[name] = MPPT_STRATEGIES[name](len(self.keys))
+            result[self._strategies[name]] = np.array(strategy_rows, dtype=np.int64)
+        return result
+
+    def _restart(self, rows):
+        """Start tracking and convergence timing of ``rows`` over."""
+        self._events[rows] = 0
+        self._passes[rows] = 0
+        self._started[rows] = time.monotonic()
+        self.convergence_time[rows] = np.nan
+        self.convergence_passes[rows] = -1
+        for strategy, strategy_rows in self._by_strategy(rows).items():
+            self._events_needed[strategy_rows] = strategy.convergence_events
+            strategy.start(self, strategy_rows)
+
+    def store(self):
+        """Write the tracking state back to the Channel attributes (e.g. for mpp_track)."""
+        for row, channel in enumerate(self._channels):
+            channel.last_v = float(self.voltage[row])
+            channel.last_p = float(self.power[row])
+            channel.dv = float(self.step[row])
+            channel.last_dir = int(self.direction[row])
+
+    def voltage_range(self, rows):
+        """Lowest and highest set voltage of ``rows`` the DACs reach (V), see Channel.voltage_to_dac_value."""
+        return 2 * self._dac_limits[rows, 0], 2 * self._dac_limits[rows, 1]
+
+    def clip(self, rows, voltage):
+        """Limit set voltages of ``rows`` to :meth:`voltage_range`."""
+        return np.clip(voltage, *self.voltage_range(rows))
+
+    def dac_values(self):
+        """DAC values (16-bit scaled) of the present set voltages, see SweepPlan."""
+        dac_voltages = np.clip(self.voltage / 2, self._dac_limits[:, 0], self._dac_limits[:, 1])
+        return (dac_voltages / CHANNEL_DAC_VOLTAGE_SCALE).astype(np.int64)
+
+    @property
+    def active_rows(self):
+        """Rows stepped by :meth:`update`, in row order."""
+        return self._active_rows
+
+    def update(self, raw_voltage, raw_current, timestamp=None):
+        """Take one tracking step on every active channel.
+
+        Args:
+            raw_voltage (np.ndarray): Voltage ADC codes read at ``voltage``,
+                one per active row (see :attr:`active_rows`).
+            raw_current (np.ndarray): Current ADC codes, one per active row.
+            timestamp (float | np.ndarray, optional): Monotonic time of the
+                readings, for the convergence time. Defaults to now.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Measured voltage (V) and current
+            (A) of the active rows.
+        """
+        active = self._active_rows
+        rows = len(self.keys)
+        voltage = np.full(rows, np.nan)
+        current = np.full(rows, np.nan)
+        voltage[active] = np.asarray(raw_voltage, dtype=np.float64) * self._volts_per_code[active]
+        current[active] = np.asarray(raw_current, dtype=np.float64) * self._volts_per_code[active] \
+            / self._r_shunt[active]
+        power = voltage * current
+
+        events = np.zeros(rows, dtype=bool)
+        for strategy, strategy_rows in self._all_rows.items():
+            events[strategy_rows] = strategy.update(self, strategy_rows, voltage[strategy_rows],
+                                                    current[strategy_rows], power[strategy_rows])
+        self.power[active] = power[active]
+        self.measured_voltage[active] = voltage[active]
+        self.measured_current[active] = current[active]
+
+        self._passes[active] += 1
+        self.updates[active] += 1
+        self._events += events
+        converged = (self._events >= self._events_needed) & (self.convergence_passes < 0) & self.active
+        if converged.any():
+            now = np.full(rows, time.monotonic() if timestamp is None else np.nan)
+            if timestamp is not None:
+                now[active] = timestamp
+            self.convergence_time[converged] = (now - self._started)[converged]
+            self.convergence_passes[converged] = self._passes[converged]
+        return voltage[active], current[active]
+
+
+class MPPTEngine:
+    """Round-robin maximum power point tracking of many channels at once.
+
+    Every pass takes one perturb-and-observe step on every tracked channel
+    of a bus: the set points of all channels are written in one bus
+    operation, a single settle is waited for all of them, all channels are
+    read back in one interleaved acquisition (OBoardManager.acquire_raw)
+    and one vectorized :class:`MPPTState` update computes every channel's
+    next set point. A pass therefore costs about the same
+    whether one or a hundred channels are tracked, instead of one settle
+    per channel as with Channel.mpp_track.
+
+    Each bus runs its own pass loop in its own thread, so buses of a
+    MultiBusManager are tracked in parallel. Passes are paced to ``rate``
+    steps per channel per second; if a pass takes longer than the period
+    the loop runs back to back and :meth:`stats` reports the rate actually
+    achieved. Pass operations go to the bus executor at ``priority``, so
+    they slot in between the points of a running sweep.
+
+    Channels can be taken out of tracking with :meth:`pause`, e.g. for an
+    IV sweep of the same channels, and put back with :meth:`resume`;
+    paused channels cost no bus time. A bus with no active channel idles.
+
+    Attributes:
+        rate (float): Target P&O steps per channel per second
+        settle_time (float): Dwell between the DAC update and the readings (s)
+        priority (int): Bus executor priority of the pass operations
+        channels (list[tuple[int, int]]): Tracked (board_index, channel_index) pairs
+
+    Example:
+        >>> engine = MPPTEngine(manager, rate=20)
+        >>> engine.start()
+        >>> engine.stats()["rate"]
+        >>> engine.pause([(0, 3)])  # e.g. sweep channel 3 of board 0 now
+        >>> engine.resume([(0, 3)], summaries={(0, 3): summary})
+        >>> engine.stop()
+    """
+
+    def __init__(self, manager, channels=None, rate=MPPT_DEFAULT_RATE, settle_time=MPPT_SETTLE_TIME,
+                 priority=BUS_PRIORITY_HIGH, strategy=MPPT_DEFAULT_STRATEGY):
+        """Initialize the engine; tracking starts with :meth:`start`.
+
+        Args:
+            manager (OBoardManager | MultiBusManager): Boards to track
+            channels (iterable[tuple[int, int]], optional): (board_index,
+                channel_index) pairs, global board indices for a
+                MultiBusManager. Defaults to every channel of every board.
+            rate (float, optional): Target P&O steps per channel per second.
+            settle_time (float, optional): Dwell between the DAC update and
+                the readings of a pass (s).
+            priority (int, optional): Bus executor priority of the passes.
+            strategy (str | dict, optional): Tracking algorithm (one of
+                MPPT_STRATEGIES) for all channels, or {(board_index,
+                channel_index): name} with the default for the others.
+        """
+        self.manager = manager
+        self.rate = rate
+        self.settle_time = settle_time
+        self.priority = priority
+        if channels is None:
+            channels = [(board_idx, channel.ind)
+                        for board_idx, oboard in enumerate(manager.oboards)
+                        for channel in oboard.channel]
+        self.channels = sorted(channels)
+        self._groups = self._split(manager, self.channels, strategy)
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(manager, channels, strategy):
+        """Group channels by bus: [{manager, keys (local), mapping local -> global, boards, state}]."""
+        managers = getattr(manager, "managers", None)
+        groups = {}
+        for board_idx, ch in channels:
+            bus_manager, local_idx = (manager, board_idx) if managers is None \
+                else manager.locate(board_idx)
+            group = groups.setdefault(id(bus_manager), {"manager": bus_manager, "keys": [],
+                                                        "mapping": {}})
+            group["keys"].append((local_idx, ch))
+            group["mapping"][(local_idx, ch)] = (board_idx, ch)
+
+        for group in groups.values():
+            oboards = group["manager"].oboards
+            group["pending"] = {}
+            group["pass_lock"] = threading.Lock()
+            local_strategy = strategy if isinstance(strategy, str) else {
+                local: strategy[key] for local, key in group["mapping"].items() if key in strategy
+            }
+            group["state"] = MPPTState({key: oboards[key[0]].channel[key[1]] for key in group["keys"]},
+                                       local_strategy)
+            group["written"] = np.full(len(group["keys"]), -1, dtype=np.int64)
+            group["boards"] = [oboards[board_idx] for board_idx in sorted({b for b, _ in group["keys"]})]
+            group["global_keys"] = [group["mapping"][key] for key in group["keys"]]
+            group["rows"] = {key: row for row, key in enumerate(group["global_keys"])}
+        return list(groups.values())
+
+    def _rows(self, channels):
+        """Yield (group, rows) of the tracked ``channels`` (all if None) on each bus."""
+        for group in self._groups:
+            if channels is None:
+                rows = list(range(len(group["keys"])))
+            else:
+                rows = [group["rows"][key] for key in channels if key in group["rows"]]
+            if rows:
+                yield group, rows
+
+    @property
+    def running(self):
+        """Whether the pass loops are running."""
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        """Start one pass loop per bus in the background, from the Channel tracking state."""
+        if self.running:
+            return
+        self._stop.clear()
+        for group in self._groups:
+            group["state"].load()
+            group["state"].updates[:] = 0
+            group["written"][:] = -1
+            self._reset_stats(group)
+            thread = threading.Thread(target=self._loop, args=(group,), daemon=True,
+                                      name=f"mppt-{group['manager'].i2c_num}")
+            self._threads.append(thread)
+            thread.start()
+
+    def warm_start(self, summaries):
+        """Restart channels at the MPP of their latest IV sweep instead of where they are.
+
+        Each channel starts at the sweep's Vmpp with a first step sized by
+        :func:`warm_start_step` from the curvature of the power there. The
+        restart is applied at the next pass, also while tracking runs, and
+        restarts the channel's convergence timing (see :meth:`stats`).
+        Call it after start-up and after every sweep of a tracked channel.
+
+        Args:
+            summaries (dict): {(board_index, channel_index): dict with
+                ``vmpp`` and ``pmax`` (see sweep.iv_summary) and optionally
+                ``curvature`` (see sweep.mpp_curvature)}. Channels that are
+                not tracked or have no Vmpp are left alone.
+        """
+        with self._lock:
+            for group in self._groups:
+                for row, key in enumerate(group["global_keys"]):
+                    summary = summaries.get(key)
+                    if summary is None or not np.isfinite(summary.get("vmpp", np.nan)):
+                        continue
+                    step = warm_start_step(summary.get("pmax", np.nan),
+                                           summary.get("curvature", np.nan))
+                    group["pending"][row] = (summary["vmpp"], step)
+
+    def pause(self, channels=None):
+        """Stop stepping channels until :meth:`resume`, keeping their tracking state.
+
+        Returns once no running pass writes the channels any more, so the
+        caller can take them over (e.g. sweep them) right away. Their DACs
+        stay at the last set point.
+
+        Args:
+            channels (iterable[tuple[int, int]], optional): (board_index,
+                channel_index) pairs; untracked ones are ignored. Defaults
+                to all tracked channels.
+        """
+        for group, rows in self._rows(channels):
+            with group["pass_lock"]:
+                group["state"].set_active(rows, False)
+
+    def resume(self, channels=None, summaries=None):
+        """Step paused channels again from the next pass.
+
+        Their set points are written again, as they may have been changed
+        while paused.
+
+        Args:
+            channels (iterable[tuple[int, int]], optional): (board_index,
+                channel_index) pairs; untracked ones are ignored. Defaults
+                to all tracked channels.
+            summaries (dict, optional): Sweep summaries to warm-start the
+                channels from, see :meth:`warm_start`.
+        """
+        channels = None if channels is None else list(channels)
+        if summaries:
+            self.warm_start({key: summaries[key] for key in (channels or summaries) if key in summaries})
+        for group, rows in self._rows(channels):
+            with group["pass_lock"]:
+                group["written"][rows] = -1
+                group["state"].set_active(rows, True)
+
+    def set_strategy(self, channels, name):
+        """Switch channels to another tracking algorithm, restarting them where they are.
+
+        Args:
+            channels (iterable[tuple[int, int]]): (board_index, channel_index) pairs.
+            name (str): One of MPPT_STRATEGIES.
+
+        Raises:
+            ValueError: If ``name`` is not a known strategy.
+        """
+        for group, rows in self._rows(list(channels)):
+            with group["pass_lock"]:
+                group["state"].set_strategy(rows, name)
+
+    def stop(self):
+        """Stop tracking after the running passes; channels stay at their last set point.
+
+        The tracking state is written back to the Channel attributes.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for group in self._groups:
+            group["state"].store()
+
+    def step(self):
+        """Run one pass on every bus in the calling thread (for tests and scripts)."""
+        for group in self._groups:
+            self._reset_stats(group, keep=True)
+            self._pass(group)
+            group["state"].store()
+
+    def stats(self):
+        """Get the tracking rate and the latest reading of every channel.
+
+        Returns:
+            dict: ``target_rate``; ``rate``, the slowest achieved rate of all
+            buses with active channels (steps per channel per second over
+            the last ``MPPT_RATE_WINDOW`` passes, None until two passes ran);
+            ``buses``: {i2c_num: ``channels``, ``active``, ``passes``, ``rate``,
+            ``pass_time_mean``, ``pass_time_max``, ``errors``,
+            ``last_error``}; ``channels``: {(board_index, channel_index):
+            ``voltage``, ``current``, ``power``, ``set_voltage``, ``updates``,
+            ``time``, ``strategy``, ``active``, ``warm``,
+            ``convergence_time`` and ``convergence_passes`` (None while
+            converging)}; and ``convergence``: ``converged`` and
+            ``converging`` counts of the active channels and the
+            ``time_mean``, ``time_max`` and ``passes_mean`` of the converged
+            ones since their last (re)start.
+        """
+        buses, channels = {}, {}
+        with self._lock:
+            for group in self._groups:
+                stats = group.get("stats")
+                if stats is None:
+                    continue
+                ends = stats["pass_ends"]
+                rate = None
+                if len(ends) > 1 and ends[-1] > ends[0]:
+                    rate = (len(ends) - 1) / (ends[-1] - ends[0])
+                buses[group["manager"].i2c_num] = {
+                    "channels": len(group["keys"]),
+                    "active": int(group["state"].active.sum()),
+                    "passes": stats["passes"],
+                    "rate": rate,
+                    "pass_time_mean": stats["pass_time"] / stats["passes"] if stats["passes"] else None,
+                    "pass_time_max": stats["pass_time_max"],
+                    "errors": stats["errors"],
+                    "last_error": stats["last_error"],
+                }
+                if stats["last"] is None:
+                    continue
+                voltage, current, set_voltage, reading_times, warm, times, passes, updates = stats["last"]
+                for row, key in enumerate(group["global_keys"]):
+                    if not updates[row]:
+                        continue
+                    converged = passes[row] >= 0
+                    channels[key] = {
+                        "voltage": float(voltage[row]),
+                        "current": float(current[row]),
+                        "power": float(voltage[row] * current[row]),
+                        "set_voltage": float(set_voltage[row]),
+                        "updates": int(updates[row]),
+                        "time": float(reading_times[row]),
+                        "strategy": group["state"].strategy[row],
+                        "active": bool(group["state"].active[row]),
+                        "warm": bool(warm[row]),
+                        "convergence_time": float(times[row]) if converged else None,
+                        "convergence_passes": int(passes[row]) if converged else None,
+                    }
+
+        active = [c for c in channels.values() if c["active"]]
+        times = [c["convergence_time"] for c in active if c["convergence_time"] is not None]
+        passes = [c["convergence_passes"] for c in active if c["convergence_passes"] is not None]
+        rates = [bus["rate"] for bus in buses.values() if bus["active"]]
+        return {
+            "target_rate": self.rate,
+            "rate": min(rates) if rates and None not in rates else None,
+            "buses": buses,
+            "channels": dict(sorted(channels.items())),
+            "convergence": {
+                "converged": len(times),
+                "converging": len(active) - len(times),
+                "time_mean": float(np.mean(times)) if times else None,
+                "time_max": max(times) if times else None,
+                "passes_mean": float(np.mean(passes)) if passes else None,
+            },
+        }
+
+    def _reset_stats(self, group, keep=False):
+        if keep and "stats" in group:
+            return
+        with self._lock:
+            group["stats"] = {
+                "passes": 0, "pass_time": 0.0, "pass_time_max": 0.0, "errors": 0,
+                "last_error": None, "pass_ends": collections.deque(maxlen=MPPT_RATE_WINDOW),
+                "last": None,
+            }
+
+    def _loop(self, group):
+        period = 1 / self.rate
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._pass(group)
+            except (OSError, TimeoutError) as e:
+                # Bus faults were already retried (see BusHealth); keep tracking
+                print(f"MPPT pass on I2C bus {group['manager'].i2c_num} failed: {e}")
+                with self._lock:
+                    group["stats"]["errors"] += 1
+                    group["stats"]["last_error"] = str(e)
+
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                deadline = time.monotonic()  # Running behind: no catch-up bursts
+            else:
+                self._stop.wait(delay)
+
+    def _pass(self, group):
+        """Write all set points, settle, read all active channels and step the state once."""
+        with group["pass_lock"]:
+            self._pass_active(group)
+
+    def _pass_active(self, group):
+        manager, keys, state = group["manager"], group["keys"], group["state"]
+        if not len(state.active_rows):
+            return
+        with self._lock:
+            pending, group["pending"] = group["pending"], {}
+        if pending:
+            rows = list(pending)
+            state.seed(rows, [pending[row][0] for row in rows], [pending[row][1] for row in rows])
+            group["written"][rows] = -1
+        started = time.monotonic()
+
+        set_voltage = state.voltage.copy()
+        # Only DACs whose code changed are written (a held set point costs no write)
+        codes = state.dac_values()
+        changed = np.flatnonzero((codes != group["written"]) & state.active)
+        if len(changed):
+            manager.bus.call(manager.set_dac_values,
+                             {keys[row]: int(codes[row]) for row in changed},
+                             priority=self.priority, name="mppt_set", boards=group["boards"],
+                             timeout=BUS_OPERATION_TIMEOUT)
+            group["written"][changed] = codes[changed]
+            time.sleep(self.settle_time)
+        active_keys = [keys[row] for row in state.active_rows]
+        readings = manager.bus.call(manager.acquire_raw, active_keys, priority=self.priority,
+                                    name="mppt_read", boards=group["boards"],
+                                    timeout=BUS_OPERATION_TIMEOUT)
+
+        raw = np.array([readings[key] for key in active_keys], dtype=np.float64).reshape(-1, 3)
+        state.update(raw[:, 0], raw[:, 1], raw[:, 2])
+        readings_time = time.time()
+
+        ended = time.monotonic()
+        with self._lock:
+            stats = group["stats"]
+            stats["passes"] += 1
+            stats["pass_time"] += ended - started
+            stats["pass_time_max"] = max(stats["pass_time_max"], ended - started)
+            stats["pass_ends"].append(ended)
+            last = stats["last"]
+            reading_times = np.full(len(keys), np.nan) if last is None else last[3].copy()
+            reading_times[state.active_rows] = readings_time
+            stats["last"] = (state.measured_voltage.copy(), state.measured_current.copy(), set_voltage,
+                             reading_times, state.warm.copy(), state.convergence_time.copy(),
+                             state.convergence_passes.copy(), state.updates.copy())
@@ -1,6 +1,8 @@
-from . import ExtendedI2C
-from .channel import Channel
+from .channel import Channel, _ADS1X15_PGA_RANGE
 from .sdac import Softdac
+from .gpio import GpioLatch
+from .bus import BusExecutor
+from .sweep import SweepPlan, SweepResult
 from .constants import SIMULATION_MODE
 
 if SIMULATION_MODE:
@@ -13,11 +15,7 @@ else:
     from adafruit_mcp230xx.mcp23017 import MCP23017
     ADS1115 = ADS.ADS1115
 
-import numpy as np
 import time
-from datetime import datetime
-from os import path
-import threading
 
 from .constants import (
     BOARD_DEFAULT_I2C_NUM,
@@ -30,8 +28,30 @@ from .constants import (
     MAX_CHANNELS_PER_DAC,
     I2C_OFFSET_MULTIPLIER,
     CHANNEL_VOLTAGE_GAIN,
-    CHANNEL_CURRENT_GAIN,
     CHANNEL_ADC_SETTLE_TIME,
+    CHANNEL_DAC_GAIN,
+    MCP4728_FAST_WRITE_POWER_DOWN,
+    MCP4728_MULTI_WRITE,
+    ADC_DEFAULT_DATA_RATE,
+    ADC_MUX_SETTLE_CONVERSIONS,
+    ADC_MUX_MIN_SETTLE,
+    ADC_CONVERSION_POLL_TIMEOUT,
+    MUX_ADDRESS_SHIFT,
+    MUX_ADDRESS_MASK,
+    MUX_PIN_SELECT_TRANSACTIONS,
+    ADC_POINTER_CONFIG,
+    ADC_POINTER_CONVERSION,
+    ADC_CONFIG_OS_SINGLE,
+    ADC_CONFIG_MUX_OFFSET,
+    ADC_CONFIG_GAIN,
+    ADC_CONFIG_MODE_SINGLE,
+    ADC_CONFIG_COMP_QUE_DISABLE,
+    ADC_AUTORANGE,
+    ADC_GAINS,
+    ADC_AUTORANGE_SATURATION,
+    ADC_AUTORANGE_NARROW,
+    BUS_PRIORITY_LOW,
+    BUS_OPERATION_TIMEOUT,
 )
 
 class OBoard:
@@ -39,6 +59,7 @@ class OBoard:
 
     Attributes:
         ID (str): Identifier for the board based on configuration.
+        offset (int): I2C address offset of the board.
         i2c_base_address (list): Base addresses for devices connected via I2C.
         ic2_base_devices (list): List of devices on the I2C bus.
         Dac_0 (device): First DAC device on the board.
@@ -46,14 +67,30 @@ class OBoard:
         Mux (device): Multiplexer on the board.
         Adc (device): ADC device on the board.
         softdac (Softdac): Software-based DAC for fine control.
+        bus (BusExecutor): Executor owning the I2C bus shared by all boards on it.
+        transport (I2CDev): Direct i2c-dev transport used instead of the Adafruit
+            drivers for conversions and DAC writes, or None.
         channel (list): List of channels controlled by this board.
+        io_stats (dict): Counters of mux selects and of the I2C transactions and
+            sleep time saved by the mux state cache (see reset_io_stats).
     """
     
-    def __init__(self, i2c_num=BOARD_DEFAULT_I2C_NUM, i2c_address_offset=2, debug=False):
-        """Initialize an OBoard with specified I2C pins and address offset."""
-        i2c = ExtendedI2C(i2c_num)
+    def __init__(self, i2c_num=BOARD_DEFAULT_I2C_NUM, i2c_address_offset=2, debug=False, bus=None):
+        """Initialize an OBoard with specified I2C pins and address offset.
+
+        Args:
+            i2c_num (int): I2C bus number.
+            i2c_address_offset (int): Address offset set by the board's jumpers.
+            debug (bool): Print debugging messages.
+            bus (BusExecutor, optional): Executor of the bus. Defaults to the
+                shared executor of ``i2c_num``.
+        """
+        self.bus = bus if bus is not None else BusExecutor.for_bus(i2c_num)
+        # Direct i2c-dev transport for ADC register access and DAC writes (None: Adafruit drivers)
+        self.transport = self.bus.transport
         self.i2c_num = i2c_num
         self.debug = debug
+        self.offset = i2c_address_offset
         self.ID = f"Bus_{i2c_num}_offset{i2c_address_offset}_"
         
         # Calculate device addresses with offset
@@ -67,45 +104,19 @@ class OBoard:
         self.i2c_base_devices = ["mux", "ADC", "DAC_0", "DAC_1"]
         
         # Initialize devices with calculated addresses
-        if SIMULATION_MODE:
-            self.Dac_0 = MCP4728_Module(
-                i2c, 
-                address=I2C_BASE_DAC_0 + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_DAC_0]
-            )
-            self.Dac_1 = MCP4728_Module(
-                i2c, 
-                address=I2C_BASE_DAC_1 + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_DAC_1]
-            )
-            self.Mux = MCP23017(
-                i2c, 
-                address=I2C_BASE_MUX + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_MUX]
-            )
-            self.Adc = ADS1115(
-                i2c, 
-                gain=CHANNEL_VOLTAGE_GAIN,
-                data_rate=CHANNEL_CURRENT_GAIN,
-                address=I2C_BASE_ADC + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_ADC]
-            )
-        else:
-            self.Dac_0 = MCP4728_Module.MCP4728(
-                i2c, 
-                address=I2C_BASE_DAC_0 + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_DAC_0]
-            )
-            self.Dac_1 = MCP4728_Module.MCP4728(
-                i2c, 
-                address=I2C_BASE_DAC_1 + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_DAC_1]
-            )
-            self.Mux = MCP23017(
-                i2c, 
-                address=I2C_BASE_MUX + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_MUX]
-            )
-            self.Adc = ADS1115(
-                i2c, 
-                gain=CHANNEL_VOLTAGE_GAIN,
-                data_rate=CHANNEL_CURRENT_GAIN,
-                address=I2C_BASE_ADC + i2c_address_offset * I2C_OFFSET_MULTIPLIER[I2C_BASE_ADC]
-            )
-        self.softdac = Softdac(self.Mux)
+        self._create_devices()
+        self.io_stats = self._new_io_stats()
+
+        # Shadow of the MCP23017 output latch, shared by the mux address bits
+        # and the Softdac gain pins, plus the current mux address
+        self.gpio = GpioLatch(self.Mux, stats=self.io_stats)
+        self.softdac = Softdac(self.Mux, latch=self.gpio)
+        self._mux_address = None
+
+        # PGA auto-ranging of the channels' voltage/current pairs and the
+        # last ADC config word (without the start bit) sent to the chip
+        self.autorange = ADC_AUTORANGE
+        self._adc_config = None
         
         # Initialize channels
         self.channel = []
@@ -119,11 +130,133 @@ class OBoard:
                 )
             )
 
+    def _create_devices(self):
+        """Create the drivers of the board's DACs, mux and ADC."""
+        i2c = self.bus.i2c
+        mcp4728 = MCP4728_Module if SIMULATION_MODE else MCP4728_Module.MCP4728
+        self.Dac_0 = mcp4728(i2c, address=self.i2c_base_address[2])
+        self.Dac_1 = mcp4728(i2c, address=self.i2c_base_address[3])
+        self.Mux = MCP23017(i2c, address=self.i2c_base_address[0])
+        self.Adc = ADS1115(
+            i2c, 
+            gain=CHANNEL_VOLTAGE_GAIN,
+            data_rate=ADC_DEFAULT_DATA_RATE,
+            address=self.i2c_base_address[1]
+        )
+
+    def probe(self):
+        """Check that the board's mux and ADC still answer on the bus.
+
+        Returns:
+            bool: True if both acknowledged a register read.
+        """
+        try:
+            self.Mux.iodir
+            if self.transport is not None:
+                self.transport.read_register16(self.i2c_base_address[1], ADC_POINTER_CONFIG)
+            else:
+                self.Adc._read_register(ADC_POINTER_CONFIG)
+        except OSError:
+            return False
+        return True
+
+    def reinit(self):
+        """Re-create the board's drivers after a bus fault, keeping the DAC outputs.
+
+        The mux, Softdac latch and ADC config shadows are dropped since the
+        chips may have been reset, and the last DAC codes are written back
+        so that an interrupted measurement can simply be repeated.
+        """
+        raw_values = [channel.dac.raw_value for channel in self.channel]
+        self._create_devices()
+        self.gpio.mcp = self.softdac.mux = self.Mux
+        self.invalidate_mux_cache()
+        self._adc_config = None
+        for ch, channel in enumerate(self.channel):
+            dac = self.Dac_0 if ch < MAX_CHANNELS_PER_DAC else self.Dac_1
+            channel.dac = getattr(dac, I2C_DAC_CHANNELS[ch % MAX_CHANNELS_PER_DAC])
+            channel.dac.gain = CHANNEL_DAC_GAIN
+        self._dac_fast_write(self.Dac_0, raw_values[:MAX_CHANNELS_PER_DAC])
+        self._dac_fast_write(self.Dac_1, raw_values[MAX_CHANNELS_PER_DAC:])
+        time.sleep(CHANNEL_ADC_SETTLE_TIME)
+
     def print(self, message):
         """Prints a message if debugging is enabled."""
         if self.debug:
             print(message)
 
+    def set_voltages(self, voltages):
+        """Set the output voltage of several channels at once.
+
+        Channels are grouped per MCP4728: a DAC with more than one channel to
+        update is written with a single Fast Write transaction covering all
+        four of its outputs (unchanged outputs keep their current code).
+
+        Args:
+            voltages (dict[int, float]): {channel_index: voltage in V}
+        """
+        self.set_dac_values({
+            ch: self.channel[ch].voltage_to_dac_value(v) for ch, v in voltages.items()
+        })
+
+    def set_dac_values(self, values):
+        """Set several DAC outputs from 16-bit scaled values (see Channel.set_voltage_raw).
+
+        Args:
+            values (dict[int, int]): {channel_index: DAC value}
+        """
+        for first, dac in ((0, self.Dac_0), (MAX_CHANNELS_PER_DAC, self.Dac_1)):
+            indices = range(first, first + MAX_CHANNELS_PER_DAC)
+            changed = [ch for ch in indices if ch in values]
+            if len(changed) == 1:
+                self.channel[changed[0]].set_voltage_raw(values[changed[0]])
+            elif changed:
+                raw = [
+                    values[ch] >> 4 if ch in values else self.channel[ch].dac.raw_value
+                    for ch in indices
+                ]
+                self._dac_fast_write(dac, raw)
+
+    def _dac_fast_write(self, dac, raw_values):
+        """Write all four 12-bit codes of one MCP4728 with the Fast Write command."""
+        buf = bytearray(2 * MAX_CHANNELS_PER_DAC)
+        for i, raw in enumerate(raw_values):
+            raw = min(max(int(raw), 0), 0x0FFF)
+            buf[2 * i] = (MCP4728_FAST_WRITE_POWER_DOWN << 4) | (raw >> 8)
+            buf[2 * i + 1] = raw & 0xFF
+        if self.transport is not None:
+            self.transport.write(self._dac_address(dac), buf)
+        else:
+            with dac.i2c_device as i2c:
+                i2c.write(buf)
+        # Keep the driver's cached codes (read back by Channel.dac.raw_value) in sync
+        for name, raw in zip(I2C_DAC_CHANNELS, raw_values):
+            getattr(dac, name)._raw_value = raw
+
+    def dac_write(self, ch, value):
+        """Set one DAC output over the direct transport with a single Multi-Write command.
+
+        Used by Channel.set_voltage_raw when ``transport`` is set. The
+        channel's VREF and gain selection are kept.
+
+        Args:
+            ch (int): Local channel index (0-7).
+            value (int): 16-bit scaled DAC value (see Channel.set_voltage_raw).
+        """
+        dac = self.Dac_0 if ch < MAX_CHANNELS_PER_DAC else self.Dac_1
+        dac_channel = getattr(dac, I2C_DAC_CHANNELS[ch % MAX_CHANNELS_PER_DAC])
+        raw = min(max(int(value) >> 4, 0), 0x0FFF)
+        buf = bytes([
+            MCP4728_MULTI_WRITE | (ch % MAX_CHANNELS_PER_DAC) << 1,
+            int(getattr(dac_channel, "vref", 0)) << 7 | (getattr(dac_channel, "gain", 1) - 1) << 4 | raw >> 8,
+            raw & 0xFF,
+        ])
+        self.transport.write(self._dac_address(dac), buf)
+        dac_channel._raw_value = raw
+
+    def _dac_address(self, dac):
+        return self.i2c_base_address[2] if dac is self.Dac_0 else self.i2c_base_address[3]
+
     def aMux_enable(self):
         """Enable the analog multiplexer by setting the control pin low."""
         pin = self.Mux.get_pin(MUX_CONTROL_PIN)
@@ -134,16 +267,436 @@ class OBoard:
         pin = self.Mux.get_pin(MUX_CONTROL_PIN)
         pin.switch_to_output(value=1)
 
-    def aMux_select_channel(self, channel: int):
-        """Select a specific channel on the multiplexer."""
+    def aMux_select_channel(self, channel: int, settle=True, softdac_gain=None):
+        """Select a specific channel on the multiplexer.
+
+        The current mux address is cached: selecting the channel that is
+        already routed does no I2C traffic and no settling. A change writes
+        all three address bits (pins 4-6) through the shared GPIO latch
+        shadow, i.e. a single port write, followed by one settle.
+
+        Args:
+            channel (int): Mux channel (0-7).
+            settle (bool): Sleep adc_settle_time() after switching. Callers
+                that switch several boards at once pass False and settle once.
+            softdac_gain (int, optional): Softdac gain to set in the same
+                latch write as the mux address.
+
+        Returns:
+            bool: True if the mux was switched, False if it was already on ``channel``.
+        """
         if channel < 0 or channel >= CHANNELS_PER_BOARD:
             raise ValueError("Invalid channel number")
         
-        time.sleep(CHANNEL_ADC_SETTLE_TIME)  # Allow settling time for channel switch
+        self.io_stats["mux_selects"] += 1
+        if channel == self._mux_address:
+            self.io_stats["mux_selects_skipped"] += 1
+            self.io_stats["i2c_transactions_saved"] += MUX_PIN_SELECT_TRANSACTIONS
+            self.io_stats["sleep_time_saved"] += self.adc_settle_time()
+            if softdac_gain is not None:
+                self.softdac.gain = softdac_gain
+            return False
+        
+        address = channel << MUX_ADDRESS_SHIFT
+        self.print(f"Setting mux address to {channel}")
+        if softdac_gain is None:
+            self.gpio.update(address, MUX_ADDRESS_MASK)
+        else:
+            self.softdac.set_gain(softdac_gain, address, MUX_ADDRESS_MASK)
+        self.io_stats["i2c_transactions_saved"] += MUX_PIN_SELECT_TRANSACTIONS - 1
         
-        # Set address bits
-        for bit in range(3):  # 3 bits for 8 channels
-            val = bool(channel >> bit & 1)
-            pin = self.Mux.get_pin(4 + bit)  # Pins 4, 5, 6 used for channel selection
-            self.print(f"Setting pin {4 + bit} to {'HIGH' if val else 'LOW'}")
-            pin.switch_to_output(value=val)
+        self._mux_address = channel
+        if settle:
+            time.sleep(self.adc_settle_time())  # Let the ADC input settle on the new channel
+        return True
+
+    def invalidate_mux_cache(self):
+        """Forget the cached mux state, e.g. after the MCP23017 may have been reset."""
+        self._mux_address = None
+        self.gpio.invalidate()
+
+    @staticmethod
+    def _new_io_stats():
+        return {
+            "mux_selects": 0,
+            "mux_selects_skipped": 0,
+            "i2c_transactions_saved": 0,
+            "sleep_time_saved": 0.0,
+            "adc_config_changes": 0,
+            "adc_range_retries": 0,
+            "gpio_writes": 0,
+            "gpio_writes_skipped": 0,
+        }
+
+    def reset_io_stats(self):
+        """Return the I/O counters collected so far and start new ones.
+
+        Returns:
+            dict: ``mux_selects``, ``mux_selects_skipped``, ``i2c_transactions_saved``,
+            ``sleep_time_saved`` (seconds), ``adc_config_changes`` (conversions
+            needing a different gain/pair than the previous one),
+            ``adc_range_retries`` (conversions repeated after saturation),
+            ``gpio_writes`` and ``gpio_writes_skipped`` (MCP23017 latch
+            updates written / found unchanged) since the last reset.
+        """
+        stats, self.io_stats = self.io_stats, self._new_io_stats()
+        self.gpio.stats = self.io_stats
+        return stats
+
+    def configure_adc(self, gain=None, data_rate=None):
+        """Set the ADS1115 PGA gain and/or data rate independently.
+
+        Registers are only touched for values that actually change.
+
+        Args:
+            gain (float, optional): PGA gain (2/3, 1, 2, 4, 8 or 16).
+            data_rate (int, optional): Samples per second (8 ... 860).
+
+        Returns:
+            tuple: The previous (gain, data_rate), for restoring afterwards.
+        """
+        previous = (self.Adc.gain, self.Adc.data_rate)
+        if data_rate is not None and data_rate not in self.Adc.rates:
+            raise ValueError(f"Invalid ADC data rate {data_rate}. Must be one of {self.Adc.rates}")
+        if gain is not None and gain != self.Adc.gain:
+            self.Adc.gain = gain
+        if data_rate is not None and data_rate != self.Adc.data_rate:
+            self.Adc.data_rate = data_rate
+        return previous
+
+    def adc_conversion_time(self):
+        """Nominal duration of one conversion at the current data rate (seconds)."""
+        return 1.0 / self.Adc.data_rate
+
+    def adc_settle_time(self):
+        """Settle time after a mux switch (seconds).
+
+        A number of conversion periods at the current data rate, but never
+        less than ``ADC_MUX_MIN_SETTLE``.
+        """
+        return max(ADC_MUX_MIN_SETTLE, ADC_MUX_SETTLE_CONVERSIONS * self.adc_conversion_time())
+
+    def adc_read(self, pin_setting, is_differential=False, gain=None):
+        """Perform a single-shot conversion and return the signed result.
+
+        Unlike ``Adc.read``, which polls the bus continuously, this sleeps for
+        the nominal conversion time of the current data rate and only then
+        polls the conversion-ready bit.
+
+        Args:
+            pin_setting (int): ADC input pair.
+            is_differential (bool): See adc_start.
+            gain (float, optional): PGA gain for this conversion, default ``Adc.gain``.
+        """
+        self.adc_start(pin_setting, is_differential, gain)
+        time.sleep(self.adc_conversion_time())
+        deadline = time.monotonic() + ADC_CONVERSION_POLL_TIMEOUT
+        while not self.adc_ready():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"ADC conversion timed out on board {self.ID}")
+        return self.adc_result()
+
+    def adc_start(self, pin_setting, is_differential=False, gain=None):
+        """Trigger a single-shot ADC conversion without waiting for the result.
+
+        Builds the same config word as ``Adc.read`` (including its
+        single-ended/differential pin handling) so a conversion can be started
+        on several boards before any of them is collected.
+
+        In single-shot mode the start bit lives in the config register, so
+        every conversion is one config write; gain and input pair travel in
+        that same write and never cost a separate one.
+        """
+        pin = pin_setting if is_differential else pin_setting + 0x04
+        config = (pin & 0x07) << ADC_CONFIG_MUX_OFFSET
+        config |= ADC_CONFIG_GAIN[self.Adc.gain if gain is None else gain]
+        config |= ADC_CONFIG_MODE_SINGLE
+        config |= self.Adc.rate_config[self.Adc.data_rate]
+        config |= ADC_CONFIG_COMP_QUE_DISABLE
+        if config != self._adc_config:
+            self.io_stats["adc_config_changes"] += 1
+            self._adc_config = config
+        if self.transport is not None:
+            self.transport.write_register16(self.i2c_base_address[1], ADC_POINTER_CONFIG,
+                                            config | ADC_CONFIG_OS_SINGLE)
+        else:
+            self.Adc._write_register(ADC_POINTER_CONFIG, config | ADC_CONFIG_OS_SINGLE)
+
+    def adc_ready(self):
+        """Return True once the conversion started by adc_start has finished."""
+        if self.transport is not None:
+            config = self.transport.read_register16(self.i2c_base_address[1], ADC_POINTER_CONFIG)
+            return bool(config & ADC_CONFIG_OS_SINGLE)
+        return bool(self.Adc._conversion_complete())
+
+    def adc_result(self):
+        """Return the signed result of the last finished conversion."""
+        if self.transport is not None:
+            raw = self.transport.read_register16(self.i2c_base_address[1], ADC_POINTER_CONVERSION)
+            return raw - 0x10000 if raw & 0x8000 else raw
+        return self.Adc._conversion_value(self.Adc.get_last_result(False))
+
+    def adc_read_autorange(self, pin_setting, gain):
+        """Single-shot read at ``gain``, repeated at wider ranges while saturated.
+
+        Args:
+            pin_setting (int): ADC input pair.
+            gain (float): Last good PGA gain of this channel and pair.
+
+        Returns:
+            tuple: (code scaled to ``Adc.gain``, see scale_code; gain to use next time)
+        """
+        while True:
+            raw = self.adc_read(pin_setting, gain=gain)
+            next_gain = self.autorange_gain(raw, gain)
+            if next_gain >= gain or gain == ADC_GAINS[0]:
+                return self.scale_code(raw, gain), next_gain
+            self.io_stats["adc_range_retries"] += 1
+            gain = next_gain
+
+    @staticmethod
+    def autorange_gain(raw, gain):
+        """PGA gain for the next reading of a pair given a reading ``raw`` taken at ``gain``.
+
+        A saturated reading returns the next wider range (the reading must be
+        repeated); a small one the narrowest range that keeps it below
+        ADC_AUTORANGE_NARROW of full scale; otherwise ``gain`` itself.
+        """
+        index = ADC_GAINS.index(gain)
+        if abs(raw) >= ADC_AUTORANGE_SATURATION * 0x8000:
+            return ADC_GAINS[max(index - 1, 0)]
+        for narrower in reversed(ADC_GAINS[index + 1:]):
+            if abs(raw) * narrower / gain < ADC_AUTORANGE_NARROW * 0x8000:
+                return narrower
+        return gain
+
+    def scale_code(self, raw, gain):
+        """Express a code read at ``gain`` as a code at ``Adc.gain``.
+
+        Conversions (Channel.convert_to_voltage, SweepResult) use the board's
+        ``Adc.gain``; codes read at another gain become fractional codes on
+        that scale.
+        """
+        if gain == self.Adc.gain:
+            return raw
+        return raw * _ADS1X15_PGA_RANGE[gain] / _ADS1X15_PGA_RANGE[self.Adc.gain]
+
+    def read_vi(self, channels):
+        """Read voltage and current of several channels of this board.
+
+        Each channel costs one mux select and two back-to-back conversions
+        (see Channel.read_vi).
+
+        Args:
+            channels (iterable[int]): Local channel indices (0-7).
+
+        Returns:
+            dict[int, tuple]: {channel_index: (voltage, current, timestamp)}
+        """
+        return {ch: self.channel[ch].read_vi() for ch in channels}
+
+    def read_vi_raw(self, channels):
+        """Read raw voltage and current ADC codes of several channels of this board.
+
+        Returns:
+            dict[int, tuple]: {channel_index: (raw_voltage, raw_current, monotonic_time)}
+        """
+        return {ch: (*self.channel[ch].read_vi_raw(), time.monotonic()) for ch in channels}
+
+    def read_vi_oversampled(self, channels, oversampling):
+        """Read averaged raw voltage and current ADC codes of several channels of this board.
+
+        Args:
+            channels (iterable[int]): Local channel indices (0-7).
+            oversampling (Oversampling): Sample limits and standard error targets.
+
+        Returns:
+            dict[int, tuple]: {channel_index: (mean raw voltage, mean raw current,
+            monotonic_time, (samples, stderr raw voltage, stderr raw current))}
+        """
+        results = {}
+        for ch in channels:
+            raw_v, raw_c, stats = self.channel[ch].read_vi_oversampled(oversampling)
+            results[ch] = (raw_v, raw_c, time.monotonic(), stats)
+        return results
+
+    def lockstep_iv_sweep(self, channel_indices, voltages, settle_time=CHANNEL_ADC_SETTLE_TIME,
+                          current_limit=None, data_rate=None):
+        """Sweep several channels of this board through one voltage grid in lockstep.
+
+        Convenience wrapper around :meth:`run_sweep` returning plain points.
+
+        Args:
+            channel_indices (list[int]): Local channel indices (0-7) to sweep.
+            voltages (iterable[float] or SweepPlan): Voltage grid (V) applied to every channel.
+            settle_time (float): Dwell after setting the DACs (seconds).
+            current_limit (float, optional): Absolute current limit (A).
+            data_rate (int, optional): ADC data rate for this sweep.
+
+        Returns:
+            dict[int, list[dict]]: Points per channel index with ``timestamp``,
+            ``voltage``, ``current`` and ``power`` keys, in grid order.
+        """
+        result = self.run_sweep(channel_indices, SweepPlan.from_grid(voltages), settle_time,
+                                current_limit, data_rate)
+        return {ch: result.points(ch) for ch in channel_indices}
+
+    def run_sweep(self, channel_indices, plan, settle_time=CHANNEL_ADC_SETTLE_TIME,
+                  current_limit=None, data_rate=None, settle=None, oversampling=None,
+                  termination=None, priority=BUS_PRIORITY_LOW):
+        """Execute a sweep plan on several channels of this board in lockstep.
+
+        For every grid point the DACs of all still-active channels are set first
+        (from the plan's precomputed DAC values), a single shared ``settle_time``
+        is waited and each channel is then read through the mux. The settle cost
+        is therefore paid once per point per board instead of once per point per
+        channel. Only raw ADC codes and monotonic timestamps are stored while
+        sweeping. Bus access goes through the board's BusExecutor one step at a
+        time (DAC write, readings), so other users get the bus while settling.
+
+        Args:
+            channel_indices (list[int]): Local channel indices (0-7) to sweep.
+            plan (SweepPlan): Compiled voltage grid.
+            settle_time (float): Dwell after setting the DACs (seconds).
+            current_limit (float, optional): Absolute current limit (A). A channel
+                exceeding it stops sweeping and is set back to 0 V.
+            data_rate (int, optional): ADC data rate for this sweep; the previous
+                rate is restored afterwards.
+            settle (SettleCriterion, optional): Read until the readings are stable
+                instead of dwelling ``settle_time``; the settle time of every
+                point is recorded in the result.
+            oversampling (Oversampling, optional): Average each point until its
+                standard error targets are met; sample counts and standard
+                errors are recorded in the result.
+            termination (TerminationPolicy, optional): Stop channels early past
+                Voc or before a predicted current-limit violation. Stop reasons
+                are recorded in ``result.stop_reasons``.
+            priority (int, optional): Bus executor priority of the sweep's operations.
+
+        Returns:
+            SweepResult: Converted results, one row per channel index.
+        """
+        for ch in channel_indices:
+            if ch < 0 or ch >= CHANNELS_PER_BOARD:
+                raise ValueError(f"Invalid channel number {ch}")
+
+        active = list(channel_indices)
+        def on_bus(fn, *args, **kwargs):
+            # Bus faults are recovered from and the step retried (see BusHealth)
+            return self.bus.call(fn, *args, priority=priority, boards=[self],
+                                 timeout=BUS_OPERATION_TIMEOUT, **kwargs)
+
+        previous_adc = on_bus(self.configure_adc, data_rate=data_rate)
+        result = SweepResult(plan, {ch: self.channel[ch] for ch in channel_indices})
+        history = {ch: ([], []) for ch in channel_indices}
+
+        try:
+            for step, dac_value in enumerate(plan.dac_values):
+                if not active:
+                    break
+
+                on_bus(self.set_dac_values, {ch: dac_value for ch in active})
+                settled_after = {}
+                if settle is None:
+                    time.sleep(settle_time)
+                else:
+                    readings = settle.wait(lambda channels: on_bus(self.read_vi_raw, channels),
+                                           {ch: self.channel[ch] for ch in active},
+                                           time.monotonic())
+                    settled_after = {ch: reading[3] for ch, reading in readings.items()}
+
+                stats = {}
+                if oversampling is not None:
+                    readings = on_bus(self.read_vi_oversampled, active, oversampling)
+                    stats = {ch: reading[3] for ch, reading in readings.items()}
+                elif settle is None:
+                    readings = on_bus(self.read_vi_raw, active)
+
+                for ch in list(active):
+                    channel = self.channel[ch]
+                    raw_v, raw_c, timestamp = readings[ch][:3]
+                    current = channel.convert_to_current(raw_c)
+                    if current_limit is not None and abs(current) > current_limit:
+                        self.print(f"Current limit exceeded on channel {ch}")
+                        on_bus(channel.set_voltage, 0)
+                        active.remove(ch)
+                        result.stop(ch, "current_limit", plan.voltages[step])
+                        continue
+                    result.record(ch, step, raw_v, raw_c, timestamp, settled_after.get(ch),
+                                  stats.get(ch))
+
+                    if termination is not None:
+                        voltages, currents = history[ch]
+                        voltages.append(channel.convert_to_voltage(raw_v))
+                        currents.append(current)
+                        next_voltage = plan.voltages[step + 1] if step + 1 < len(plan) else None
+                        reason = termination.check(voltages, currents, next_voltage, current_limit)
+                        if reason is not None:
+                            on_bus(channel.set_voltage, 0)
+                            active.remove(ch)
+                            result.stop(ch, reason, plan.voltages[step])
+        finally:
+            on_bus(self.set_voltages, {ch: 0 for ch in channel_indices})  # Safety
+            on_bus(self.configure_adc, *previous_adc)
+
+        return result.finish()
+
+    def run_spot(self, searches, settle_time=CHANNEL_ADC_SETTLE_TIME, current_limit=None,
+                 data_rate=None, priority=BUS_PRIORITY_LOW):
+        """Run quick Isc/Voc/MPP measurements on several channels of this board in lockstep.
+
+        Every round sets the next voltage of each unfinished search in one
+        DAC update, waits one shared ``settle_time`` and reads all of those
+        channels. Searches that need fewer points drop out early. Bus access
+        goes through the board's BusExecutor one step at a time, as in run_sweep.
+
+        Args:
+            searches (dict[int, SpotSearch]): {local channel index: search}
+            settle_time (float): Dwell after setting the DACs (seconds).
+            current_limit (float, optional): Absolute current limit (A). A channel
+                exceeding it is stopped and set back to 0 V.
+            data_rate (int, optional): ADC data rate for this measurement; the
+                previous rate is restored afterwards.
+            priority (int, optional): Bus executor priority of the operations.
+
+        Returns:
+            dict[int, dict]: {local channel index: SpotSearch.summary()}
+        """
+        for ch in searches:
+            if ch < 0 or ch >= CHANNELS_PER_BOARD:
+                raise ValueError(f"Invalid channel number {ch}")
+
+        def on_bus(fn, *args, **kwargs):
+            return self.bus.call(fn, *args, priority=priority, boards=[self],
+                                 timeout=BUS_OPERATION_TIMEOUT, **kwargs)
+
+        previous_adc = on_bus(self.configure_adc, data_rate=data_rate)
+        try:
+            while True:
+                voltages = {}
+                for ch, search in searches.items():
+                    voltage = search.next_voltage()
+                    if voltage is not None:
+                        voltages[ch] = voltage
+                if not voltages:
+                    break
+
+                on_bus(self.set_voltages, voltages)
+                time.sleep(settle_time)
+                readings = on_bus(self.read_vi_raw, list(voltages))
+
+                for ch, voltage in voltages.items():
+                    channel = self.channel[ch]
+                    raw_v, raw_c = readings[ch][:2]
+                    current = channel.convert_to_current(raw_c)
+                    if current_limit is not None and abs(current) > current_limit:
+                        self.print(f"Current limit exceeded on channel {ch}")
+                        on_bus(channel.set_voltage, 0)
+                        searches[ch].stop("current_limit")
+                        continue
+                    searches[ch].add(voltage, channel.convert_to_voltage(raw_v), current)
+        finally:
+            on_bus(self.set_voltages, {ch: 0 for ch in searches})  # Safety
+            on_bus(self.configure_adc, *previous_adc)
+
+        return {ch: search.summary() for ch, search in searches.items()}
@@ -4,6 +4,7 @@ from .constants import (
     SOFTDAC_GAIN_VOLTAGES,
     SOFTDAC_GAIN_REGISTERS
 )
+from .gpio import GpioLatch
 
 class Softdac:
     """Software-driven DAC implementation using multiplexer for gain control.
@@ -12,8 +13,14 @@ class Softdac:
     a multiplexer for gain control. It provides multiple gain levels with 
     corresponding voltage outputs.
     
+    The gain pins are written through a GpioLatch, a shadow of the MCP23017
+    output latch that can be shared with the board's mux address bits. A gain
+    change is a single port write and re-assigning the current gain does no
+    I2C traffic.
+    
     Attributes:
         mux: Multiplexer device instance for pin control
+        latch (GpioLatch): Shadow of the multiplexer output latch
         vref (float): Reference voltage in volts
         _gain (int): Current gain setting
         
@@ -23,14 +30,17 @@ class Softdac:
         GAIN_REGISTERS: Array of pin configurations for each gain level
     """
     
-    def __init__(self, mux_device, vref=SOFTDAC_DEFAULT_VREF):
+    def __init__(self, mux_device, vref=SOFTDAC_DEFAULT_VREF, latch=None):
         """Initialize the Softdac.
         
         Args:
             mux_device: Multiplexer device instance for pin control
             vref (float, optional): Reference voltage in volts. Defaults to DEFAULT_VREF.
+            latch (GpioLatch, optional): Shared output latch shadow of ``mux_device``.
+                Defaults to a private one.
         """
         self.mux = mux_device
+        self.latch = latch if latch is not None else GpioLatch(mux_device)
         self.vref = vref
         self._gain = 0
 
@@ -50,6 +60,25 @@ class Softdac:
         Args:
             gain (int): Desired gain level
             
+        Raises:
+            ValueError: If gain value is outside the valid range
+        """
+        self.set_gain(gain)
+
+    def set_gain(self, gain, value=0, mask=0):
+        """Set the gain level, optionally together with other latch bits.
+        
+        The gain pins and the extra bits go out in one port write, e.g. to
+        switch the board's mux address in the same transaction.
+        
+        Args:
+            gain (int): Desired gain level
+            value (int, optional): Other latch bits to set in the same write
+            mask (int, optional): Which other latch bits ``value`` covers
+            
+        Returns:
+            bool: True if the latch was written, False if nothing changed.
+            
         Raises:
             ValueError: If gain value is outside the valid range
         """
@@ -57,18 +86,26 @@ class Softdac:
             raise ValueError(
                 f"Invalid gain value. Must be between 0 and {len(SOFTDAC_GAIN_VOLTAGES)-1}"
             )
-        self._set_gain_pins(gain)
+        gain_value, gain_mask = self.gain_bits(gain)
+        written = self.latch.update(gain_value | (value & ~gain_mask), gain_mask | mask)
         self._gain = gain
+        return written
 
-    def _set_gain_pins(self, gain):
-        """Set multiplexer pins for the specified gain level.
+    @staticmethod
+    def gain_bits(gain):
+        """Get the latch bits for the specified gain level.
         
         Args:
-            gain (int): Desired gain level
+            gain (int): Gain level
+            
+        Returns:
+            tuple: (value, mask) of the gain pins in the 16-bit latch
         """
-        pin_values = SOFTDAC_GAIN_REGISTERS[gain]
-        for pin, value in zip(SOFTDAC_MUX_PINS, pin_values):
-            self.mux.set_pin(pin, bool(value))
+        value = mask = 0
+        for pin, bit in zip(SOFTDAC_MUX_PINS, SOFTDAC_GAIN_REGISTERS[gain]):
+            mask |= 1 << pin
+            value |= int(bit) << pin
+        return value, mask
 
     @property
     def voltage(self):
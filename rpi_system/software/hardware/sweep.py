@@ -0,0 +1,878 @@
+import time
+from datetime import datetime
+import numpy as np
+
+from .constants import (
+    CHANNEL_VOLTAGE_LIMITS,
+    CHANNEL_DAC_VOLTAGE_SCALE,
+    MPPT_CURVATURE_POINTS,
+    SWEEP_PLAN_CACHE_SIZE,
+    ADAPTIVE_COARSE_POINTS,
+    ADAPTIVE_PRIOR_COARSE_POINTS,
+    ADAPTIVE_PRIOR_SPAN,
+    ADAPTIVE_MIN_VOLTAGE_SPACING,
+    ADAPTIVE_MAX_POINTS,
+    ADAPTIVE_PMAX_TOLERANCE,
+    ADAPTIVE_FF_TOLERANCE,
+    SETTLE_TOLERANCE,
+    SETTLE_CONSECUTIVE_READINGS,
+    SETTLE_MIN_TIME,
+    OVERSAMPLE_MIN_SAMPLES,
+    OVERSAMPLE_STDERR_VOLTAGE,
+    OVERSAMPLE_STDERR_CURRENT,
+    TERMINATION_LIMIT_MARGIN,
+    SPOT_MAX_POINTS,
+    SPOT_VOC_TOLERANCE,
+    SPOT_PRIOR_SPAN,
+    SPOT_MPP_STEP,
+    SPOT_MPP_TOLERANCE,
+    SPOT_VMPP_VOC_FRACTION,
+)
+
+
+class SweepPlan:
+    """Precompiled IV sweep: voltage grid and the DAC values that produce it.
+
+    Plans only depend on the sweep parameters, so plans built through
+    :meth:`for_config` are cached by their parameters and shared between
+    sweeps, samples and boards.
+
+    Attributes:
+        voltages (np.ndarray): Requested cell voltages (V), in sweep order.
+        dac_values (np.ndarray): 16-bit scaled DAC values for ``voltages``
+            (as passed to Channel.set_voltage_raw / OBoard.set_dac_values).
+    """
+
+    _cache = {}
+
+    def __init__(self, voltages, voltage_limits=CHANNEL_VOLTAGE_LIMITS):
+        """Compile a plan for an explicit voltage grid.
+
+        Args:
+            voltages (iterable[float]): Cell voltages (V) in sweep order.
+            voltage_limits (tuple): DAC output limits (V), see Channel.set_voltage.
+        """
+        self.voltages = np.asarray(voltages, dtype=np.float64)
+        self.voltages.setflags(write=False)
+        dac_voltages = np.clip(self.voltages / 2, voltage_limits[0], voltage_limits[1])
+        self.dac_values = (dac_voltages / CHANNEL_DAC_VOLTAGE_SCALE).astype(np.int64)
+        self.dac_values.setflags(write=False)
+
+    def __len__(self):
+        return len(self.voltages)
+
+    @classmethod
+    def for_config(cls, start_voltage, stop_voltage, voltage_step,
+                   voltage_limits=CHANNEL_VOLTAGE_LIMITS):
+        """Return the (cached) plan for a linear start/stop/step sweep.
+
+        The grid matches ``np.arange(start, stop + step, step)`` used by the
+        original sweep loops.
+        """
+        key = (float(start_voltage), float(stop_voltage), float(voltage_step),
+               tuple(voltage_limits))
+        plan = cls._cache.get(key)
+        if plan is None:
+            if len(cls._cache) >= SWEEP_PLAN_CACHE_SIZE:
+                cls._cache.pop(next(iter(cls._cache)))
+            plan = cls(np.arange(start_voltage, stop_voltage + voltage_step, voltage_step),
+                       voltage_limits)
+            cls._cache[key] = plan
+        return plan
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Return ``grid`` if it already is a plan, otherwise compile it."""
+        return grid if isinstance(grid, cls) else cls(grid)
+
+
+
+class SettleCriterion:
+    """Reading-based settle detection for sweep points.
+
+    Instead of a fixed dwell after setting the DACs, channels are read
+    repeatedly; a channel is settled once ``consecutive`` successive changes
+    of both its voltage and current readings (ADC input volts) stay within
+    ``tolerance``. The reading that completes the criterion is the
+    measurement, so detection costs no extra conversions at the end.
+
+    Attributes:
+        tolerance (float): Max change between consecutive readings (V at the ADC).
+        min_time (float): Dwell before the first reading (seconds).
+        max_time (float): Upper bound; the latest reading is taken after this (seconds).
+        consecutive (int): Successive in-tolerance changes required.
+    """
+
+    def __init__(self, max_time, tolerance=SETTLE_TOLERANCE, min_time=SETTLE_MIN_TIME,
+                 consecutive=SETTLE_CONSECUTIVE_READINGS):
+        self.max_time = max_time
+        self.tolerance = tolerance
+        self.min_time = min(min_time, max_time)
+        self.consecutive = consecutive
+
+    def wait(self, read, channels, start):
+        """Read channels until each one is settled or max_time has passed.
+
+        Args:
+            read (callable): ``read(keys)`` -> {key: (raw_voltage, raw_current, monotonic_time)}.
+            channels (dict): {key: Channel} to settle, used to convert raw codes.
+            start (float): time.monotonic() at which the DACs were set.
+
+        Returns:
+            dict: {key: (raw_voltage, raw_current, monotonic_time, settle_time)}
+        """
+        remaining = self.min_time - (time.monotonic() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+
+        pending = list(channels)
+        previous, stable, settled = {}, dict.fromkeys(pending, 0), {}
+        while pending:
+            readings = read(pending)
+            for key in list(pending):
+                raw_v, raw_c, timestamp = readings[key]
+                convert = channels[key].convert_to_voltage
+                if key in previous:
+                    prev_v, prev_c = previous[key]
+                    within = (abs(convert(raw_v) - convert(prev_v)) <= self.tolerance
+                              and abs(convert(raw_c) - convert(prev_c)) <= self.tolerance)
+                    stable[key] = stable[key] + 1 if within else 0
+                previous[key] = (raw_v, raw_c)
+                if stable[key] >= self.consecutive or timestamp - start >= self.max_time:
+                    settled[key] = (raw_v, raw_c, timestamp, timestamp - start)
+                    pending.remove(key)
+        return settled
+
+
+
+class Oversampling:
+    """Per-point averaging of repeated readings with early exit.
+
+    Readings of a point are repeated until the standard error of the mean
+    voltage and current both reach their targets (after ``min_samples``), or
+    ``max_samples`` readings were taken. Quiet points finish after a few
+    samples, noisy points get up to the maximum.
+
+    Attributes:
+        max_samples (int): Upper bound of readings per point.
+        stderr_voltage (float): Target standard error of the voltage (V).
+        stderr_current (float): Target standard error of the current (A).
+        min_samples (int): Readings before the standard error is trusted.
+    """
+
+    def __init__(self, max_samples, stderr_voltage=OVERSAMPLE_STDERR_VOLTAGE,
+                 stderr_current=OVERSAMPLE_STDERR_CURRENT, min_samples=OVERSAMPLE_MIN_SAMPLES):
+        self.max_samples = max(1, int(max_samples))
+        self.stderr_voltage = stderr_voltage
+        self.stderr_current = stderr_current
+        self.min_samples = min(max(2, int(min_samples)), self.max_samples)
+
+    def reduce(self, channel, raw_voltages, raw_currents):
+        """Average the raw readings of one point.
+
+        Args:
+            channel (Channel): Channel the readings belong to (for scaling).
+            raw_voltages (list[int]): Raw ADC codes of the voltage pair.
+            raw_currents (list[int]): Raw ADC codes of the current pair.
+
+        Returns:
+            tuple: (mean raw voltage, mean raw current, (samples, stderr raw
+            voltage, stderr raw current), done). Means and standard errors are
+            in (fractional) ADC codes; ``done`` tells whether to stop sampling.
+        """
+        n = len(raw_voltages)
+        v = np.asarray(raw_voltages, dtype=np.float64)
+        c = np.asarray(raw_currents, dtype=np.float64)
+        if n > 1:
+            se_v, se_c = v.std(ddof=1) / np.sqrt(n), c.std(ddof=1) / np.sqrt(n)
+        else:
+            se_v = se_c = float("nan")
+
+        done = n >= self.max_samples
+        if not done and n >= self.min_samples:
+            volts_per_code = channel.adc_lsb() / (1 << (16 - channel.board.Adc.bits))
+            done = (se_v * volts_per_code <= self.stderr_voltage
+                    and se_c * volts_per_code / channel.R_shunt <= self.stderr_current)
+        return v.mean(), c.mean(), (n, se_v, se_c), done
+
+
+
+class TerminationPolicy:
+    """Rules for ending a channel's sweep before the end of its plan.
+
+    Stop reasons recorded in SweepResult:
+
+    - ``"completed"``: the plan was swept to its last point.
+    - ``"voc"``: ``points_past_voc`` points (at least one) were taken after
+      the current changed sign (open circuit crossed).
+    - ``"current_limit_predicted"``: extrapolating the current trend to the
+      next voltage exceeds ``limit_margin`` times the current limit, so the
+      over-limit point is never applied.
+    - ``"current_limit"``: a reading exceeded the current limit (not recorded).
+
+    Attributes:
+        points_past_voc (int or None): Points to take beyond Voc; None sweeps on.
+        predict_current_limit (bool): Stop before points predicted to exceed the limit.
+        limit_margin (float): Fraction of the limit the prediction must stay below.
+    """
+
+    def __init__(self, points_past_voc=None, predict_current_limit=True,
+                 limit_margin=TERMINATION_LIMIT_MARGIN):
+        self.points_past_voc = points_past_voc
+        self.predict_current_limit = predict_current_limit
+        self.limit_margin = limit_margin
+
+    def check(self, voltages, currents, next_voltage=None, current_limit=None):
+        """Decide whether to stop after the latest point.
+
+        Args:
+            voltages (list[float]): Measured voltages of the channel so far (V).
+            currents (list[float]): Measured currents of the channel so far (A).
+            next_voltage (float, optional): Next planned voltage (V), None at the end.
+            current_limit (float, optional): Absolute current limit (A).
+
+        Returns:
+            str or None: Stop reason, or None to continue.
+        """
+        if self.points_past_voc is not None:
+            signs = np.sign(currents)
+            nonzero = np.flatnonzero(signs)
+            if len(nonzero):
+                flipped = np.flatnonzero(signs[nonzero[0]:] == -signs[nonzero[0]])
+                if len(flipped) and len(currents) - (nonzero[0] + flipped[0]) >= max(self.points_past_voc, 1):
+                    return "voc"
+
+        if (self.predict_current_limit and current_limit is not None
+                and next_voltage is not None and len(voltages) >= 2):
+            if abs(self._extrapolate(voltages, currents, next_voltage)) > self.limit_margin * current_limit:
+                return "current_limit_predicted"
+        return None
+
+    @staticmethod
+    def _extrapolate(voltages, currents, next_voltage):
+        """Predict the current at next_voltage from the last points.
+
+        Past the knee the slope of a diode curve grows exponentially with
+        voltage, so when the last two slopes have the same sign and grow, the
+        slope is extrapolated geometrically; otherwise linearly.
+        """
+        v = np.asarray(voltages[-3:], dtype=np.float64)
+        i = np.asarray(currents[-3:], dtype=np.float64)
+        if np.any(np.diff(v) <= 0):
+            return i[-1]
+        slopes = np.diff(i) / np.diff(v)
+        step = next_voltage - v[-1]
+        if len(slopes) == 2 and slopes[0] * slopes[1] > 0 and abs(slopes[1]) > abs(slopes[0]):
+            growth = np.log(slopes[1] / slopes[0]) / ((v[2] - v[0]) / 2)  # per volt
+            slope = slopes[1] * np.exp(growth * (v[2] - v[1]) / 2)  # at the last point
+            return i[-1] + slope * np.expm1(growth * step) / growth
+        return i[-1] + slopes[-1] * step
+
+
+class SweepResult:
+    """Raw ADC codes and timestamps of one plan executed on a set of channels.
+
+    Buffers are allocated once for the whole sweep; the sweep loop only stores
+    raw codes and ``time.monotonic()`` stamps. Conversion to voltage, current
+    and power happens in one vectorized step in :meth:`finish`.
+
+    Attributes:
+        plan (SweepPlan): The executed plan.
+        keys (list): Channel keys (local index or (board, channel) tuple), one row each.
+        raw_voltage (np.ndarray): ADC codes of the voltage pair, shape (channels, points).
+            Fractional when points are averaged (oversampling).
+        raw_current (np.ndarray): ADC codes of the current pair, shape (channels, points).
+        timestamps (np.ndarray): Monotonic time of each reading (seconds).
+        lengths (np.ndarray): Number of points recorded per channel.
+        settle_times (np.ndarray): Measured settle time of each point (seconds),
+            NaN unless recorded (settle detection).
+        stop_reasons (dict): {key: (reason, voltage)} why and at which planned
+            voltage (V) each channel stopped, see TerminationPolicy.
+        samples (np.ndarray): Readings averaged into each point.
+        stderr_voltage, stderr_current (np.ndarray): Standard error of the mean
+            of each point (V, A), set by finish() when oversampling was used.
+        voltage, current, power (np.ndarray): Converted values, set by finish().
+    """
+
+    def __init__(self, plan, channels):
+        """Allocate buffers for a plan.
+
+        Args:
+            plan (SweepPlan): Plan to execute.
+            channels (dict): {key: Channel} channels taking part in the sweep.
+        """
+        rows, points = len(channels), len(plan)
+        self.plan = plan
+        self.keys = list(channels)
+        self._row = {key: row for row, key in enumerate(self.keys)}
+        self.raw_voltage = np.zeros((rows, points), dtype=np.float64)
+        self.raw_current = np.zeros((rows, points), dtype=np.float64)
+        self.timestamps = np.zeros((rows, points), dtype=np.float64)
+        self.lengths = np.zeros(rows, dtype=np.int64)
+        self.settle_times = np.full((rows, points), np.nan)
+        self._has_settle_times = False
+        self.stop_reasons = {}
+        self.samples = np.ones((rows, points), dtype=np.int32)
+        self._stderr_raw_voltage = np.full((rows, points), np.nan)
+        self._stderr_raw_current = np.full((rows, points), np.nan)
+        self._has_oversampling = False
+
+        # Scaling in effect for the sweep, captured once per channel
+        self._lsb = np.array([channel.adc_lsb() for channel in channels.values()])
+        self._shift = np.array([16 - channel.board.Adc.bits for channel in channels.values()])
+        self._r_shunt = np.array([channel.R_shunt for channel in channels.values()], dtype=np.float64)
+        self._wall_offset = time.time() - time.monotonic()
+
+        self.voltage = None
+        self.current = None
+        self.power = None
+        self.stderr_voltage = None
+        self.stderr_current = None
+
+    def record(self, key, step, raw_voltage, raw_current, timestamp, settle_time=None,
+               oversample=None):
+        """Store the raw readings of one point.
+
+        ``oversample`` is the (samples, stderr raw voltage, stderr raw current)
+        tuple of Oversampling.reduce when the point was averaged.
+        """
+        row = self._row[key]
+        self.raw_voltage[row, step] = raw_voltage
+        self.raw_current[row, step] = raw_current
+        self.timestamps[row, step] = timestamp
+        self.lengths[row] = step + 1
+        if settle_time is not None:
+            self.settle_times[row, step] = settle_time
+            self._has_settle_times = True
+        if oversample is not None:
+            self.samples[row, step], self._stderr_raw_voltage[row, step], \
+                self._stderr_raw_current[row, step] = oversample
+            self._has_oversampling = True
+
+    def stop(self, key, reason, voltage):
+        """Record why a channel stopped sweeping and at which planned voltage (V)."""
+        self.stop_reasons[key] = (reason, float(voltage))
+
+    def rekey(self, mapping):
+        """Rename the channel keys, e.g. from per-bus to global board indices.
+
+        Args:
+            mapping (dict): {old key: new key}; keys missing from it are kept.
+
+        Returns:
+            SweepResult: self
+        """
+        self.keys = [mapping.get(key, key) for key in self.keys]
+        self._row = {key: row for row, key in enumerate(self.keys)}
+        self.stop_reasons = {mapping.get(key, key): value for key, value in self.stop_reasons.items()}
+        return self
+
+    def finish(self):
+        """Convert all raw codes to voltage (V), current (A) and power (W) at once.
+
+        Channels without a stop reason are marked ``"completed"``.
+        """
+        for key, row in self._row.items():
+            if key not in self.stop_reasons and self.lengths[row]:
+                self.stop(key, "completed", self.plan.voltages[self.lengths[row] - 1])
+        # Codes are left-aligned 16-bit values; dividing equals the >> of Channel
+        volts_per_code = (self._lsb / (1 << self._shift))[:, None]
+        r_shunt = self._r_shunt[:, None]
+        self.voltage = self.raw_voltage * volts_per_code
+        self.current = self.raw_current * volts_per_code / r_shunt
+        self.power = self.voltage * self.current
+        self.stderr_voltage = self._stderr_raw_voltage * volts_per_code
+        self.stderr_current = self._stderr_raw_current * volts_per_code / r_shunt
+        return self
+
+    def columns(self, key):
+        """Return the recorded points of one channel as contiguous columns.
+
+        Returns:
+            dict: ``timestamp`` (ISO strings), ``voltage``, ``current`` and
+            ``power`` arrays, matching the IV CSV header, plus ``settle_time``
+            when settle times were recorded and ``samples``, ``stderr_voltage``
+            and ``stderr_current`` when points were oversampled.
+        """
+        if self.voltage is None:
+            self.finish()
+        row, n = self._row[key], self.lengths[self._row[key]]
+        columns = {
+            "timestamp": [
+                datetime.fromtimestamp(t).isoformat()
+                for t in self.timestamps[row, :n] + self._wall_offset
+            ],
+            "voltage": self.voltage[row, :n],
+            "current": self.current[row, :n],
+            "power": self.power[row, :n],
+        }
+        if self._has_settle_times:
+            columns["settle_time"] = self.settle_times[row, :n]
+        if self._has_oversampling:
+            columns["samples"] = self.samples[row, :n]
+            columns["stderr_voltage"] = self.stderr_voltage[row, :n]
+            columns["stderr_current"] = self.stderr_current[row, :n]
+        return columns
+
+    def points(self, key):
+        """Return the recorded points of one channel as a list of dicts."""
+        columns = self.columns(key)
+        return [
+            {name: (values[i] if name == "timestamp" else float(values[i]))
+             for name, values in columns.items()}
+            for i in range(len(columns["timestamp"]))
+        ]
+
+
+def iv_summary(voltage, current):
+    """Extract the figures of merit of an IV curve.
+
+    Isc is interpolated at 0 V (extrapolated from the first two points if the
+    sweep starts above 0 V), Voc is the first positive-to-negative zero
+    crossing of the current, linearly interpolated.
+
+    Args:
+        voltage (array-like): Measured voltages (V), any order.
+        current (array-like): Measured currents (A), matching ``voltage``.
+
+    Returns:
+        dict: ``isc``, ``voc``, ``vmpp``, ``impp``, ``pmax`` and ``ff``. Values
+        that cannot be determined from the points are NaN.
+    """
+    v = np.asarray(voltage, dtype=np.float64)
+    i = np.asarray(current, dtype=np.float64)
+    summary = dict.fromkeys(("isc", "voc", "vmpp", "impp", "pmax", "ff"), float("nan"))
+    if len(v) < 2:
+        return summary
+    order = np.argsort(v, kind="stable")
+    v, i = v[order], i[order]
+
+    if v[0] <= 0 <= v[-1]:
+        summary["isc"] = float(np.interp(0.0, v, i))
+    elif v[1] != v[0]:
+        summary["isc"] = float(i[0] - v[0] * (i[1] - i[0]) / (v[1] - v[0]))
+
+    crossings = np.flatnonzero((i[:-1] > 0) & (i[1:] <= 0))
+    if len(crossings):
+        j = crossings[0]
+        summary["voc"] = float(v[j] + i[j] * (v[j + 1] - v[j]) / (i[j] - i[j + 1]))
+
+    p = v * i
+    m = int(np.argmax(p))
+    summary.update(vmpp=float(v[m]), impp=float(i[m]), pmax=float(p[m]))
+    if summary["voc"] > 0 and summary["isc"] > 0:
+        summary["ff"] = summary["pmax"] / (summary["voc"] * summary["isc"])
+    return summary
+
+
+def mpp_curvature(voltage, current, points=MPPT_CURVATURE_POINTS):
+    """Estimate d2P/dV2 of an IV curve at its maximum power point.
+
+    A parabola is fitted to the power of the MPP point and ``points``
+    neighbours on each side (fewer at the ends of the curve).
+
+    Args:
+        voltage (array-like): Measured voltages (V), any order.
+        current (array-like): Measured currents (A), matching ``voltage``.
+        points (int, optional): Neighbours on each side of the MPP.
+
+    Returns:
+        float: Second derivative of the power (W/V^2), negative at a
+        maximum; NaN with fewer than three points around the MPP.
+    """
+    v = np.asarray(voltage, dtype=np.float64)
+    i = np.asarray(current, dtype=np.float64)
+    order = np.argsort(v, kind="stable")
+    v, p = v[order], v[order] * i[order]
+    if len(v) < 3:
+        return float("nan")
+    m = int(np.argmax(p))
+    window = slice(max(m - points, 0), m + points + 1)
+    if len(np.unique(v[window])) < 3:
+        return float("nan")
+    return float(2 * np.polyfit(v[window], p[window], 2)[0])
+
+
+class AdaptiveGrid:
+    """Non-uniform IV grid refined pass by pass around the MPP, knee and Voc.
+
+    The first pass is a coarse uniform grid (denser around the previous
+    Vmpp and Voc when a prior summary is given). Every following pass adds
+    midpoints next to the maximum power point, across the Voc crossing and
+    across the steepest interval below Voc, until Pmax and FF change less
+    than the tolerances between passes or the point budget is used up.
+
+    Usage::
+
+        grid = AdaptiveGrid(0.0, 1.2)
+        while not grid.done:
+            voltages = grid.next_voltages()
+            grid.add(voltages, run_sweep(voltages))
+        data = grid.columns()
+    """
+
+    def __init__(self, start_voltage, stop_voltage, max_points=ADAPTIVE_MAX_POINTS,
+                 pmax_tolerance=ADAPTIVE_PMAX_TOLERANCE, ff_tolerance=ADAPTIVE_FF_TOLERANCE,
+                 prior=None):
+        """
+        Args:
+            start_voltage (float): Lowest sweep voltage (V).
+            stop_voltage (float): Highest sweep voltage (V).
+            max_points (int): Point budget for the whole sweep.
+            pmax_tolerance (float): Relative Pmax change between passes to stop.
+            ff_tolerance (float): Relative FF change between passes to stop.
+            prior (dict, optional): iv_summary() of a previous sweep of the same pixel.
+        """
+        self.start_voltage = float(start_voltage)
+        self.stop_voltage = float(stop_voltage)
+        self.max_points = int(max_points)
+        self.pmax_tolerance = pmax_tolerance
+        self.ff_tolerance = ff_tolerance
+        self.prior = prior
+        self.passes = 0
+        self.done = False
+        self._requested = []
+        self._columns = {}
+        self._summary = None
+        self._limit_voltage = None  # Lowest voltage at which the current limit tripped
+        self._stop = None  # Earliest early stop (reason, voltage) of any pass
+
+    def __len__(self):
+        return len(self._requested)
+
+    def next_voltages(self):
+        """Return the (ascending) voltages to measure in the next pass."""
+        if self.done:
+            return np.empty(0)
+        if self.passes == 0:
+            candidates = self._coarse_voltages()
+        else:
+            candidates = self._refinement_voltages()
+
+        selected = []
+        budget = self.max_points - len(self._requested)
+        for voltage in candidates:
+            if len(selected) >= budget:
+                break
+            if not self.start_voltage <= voltage <= self.stop_voltage:
+                continue
+            existing = self._requested + selected
+            if existing and np.min(np.abs(np.subtract(existing, voltage))) < ADAPTIVE_MIN_VOLTAGE_SPACING:
+                continue
+            selected.append(float(voltage))
+
+        if not selected:
+            self.done = True
+        return np.sort(np.array(selected))
+
+    def add(self, voltages, columns, stop=None):
+        """Merge the result of one pass.
+
+        Args:
+            voltages (np.ndarray): Voltages returned by next_voltages().
+            columns (dict): Measured columns (e.g. SweepResult.columns). Fewer
+                rows than ``voltages`` means the sweep stopped early (current
+                limit, Voc); the grid is then not extended beyond that voltage.
+            stop (tuple, optional): (reason, voltage) of the pass, see
+                SweepResult.stop_reasons.
+        """
+        if stop is not None and stop[0] != "completed":
+            if self._stop is None or stop[1] < self._stop[1]:
+                self._stop = stop
+        measured = len(columns["voltage"])
+        if measured < len(voltages):
+            limit_voltage = float(voltages[measured])
+            if self._limit_voltage is None or limit_voltage < self._limit_voltage:
+                self._limit_voltage = limit_voltage
+            self.stop_voltage = min(self.stop_voltage, limit_voltage - ADAPTIVE_MIN_VOLTAGE_SPACING)
+        self._requested.extend(float(v) for v in voltages[:measured])
+        for name, values in columns.items():
+            self._columns.setdefault(name, []).extend(values[:measured])
+        self.passes += 1
+
+        previous, self._summary = self._summary, self.summary()
+        if len(self._requested) >= self.max_points:
+            self.done = True
+        elif previous is not None and self._converged(previous, self._summary):
+            self.done = True
+
+    def columns(self):
+        """Return all measured points as columns sorted by voltage."""
+        order = np.argsort(self._requested, kind="stable")
+        return {
+            name: (np.asarray(values)[order] if name != "timestamp" else [values[k] for k in order])
+            for name, values in self._columns.items()
+        }
+
+    @property
+    def stop_reason(self):
+        """(reason, voltage) of the earliest early stop, or ("completed", highest voltage)."""
+        if self._stop is not None:
+            return self._stop
+        return "completed", max(self._requested, default=float("nan"))
+
+    def summary(self):
+        """iv_summary() of the points measured so far."""
+        return iv_summary(self._columns.get("voltage", []), self._columns.get("current", []))
+
+    def _coarse_voltages(self):
+        if self.prior is None:
+            return np.linspace(self.start_voltage, self.stop_voltage, ADAPTIVE_COARSE_POINTS)
+        voltages = list(np.linspace(self.start_voltage, self.stop_voltage, ADAPTIVE_PRIOR_COARSE_POINTS))
+        # Points around the previous MPP and Voc go first so they survive the budget
+        focus = []
+        for name in ("vmpp", "voc"):
+            centre = self.prior.get(name)
+            if centre is not None and np.isfinite(centre):
+                focus += [centre - ADAPTIVE_PRIOR_SPAN, centre, centre + ADAPTIVE_PRIOR_SPAN]
+        return focus + voltages
+
+    def _refinement_voltages(self):
+        v = np.asarray(self._columns["voltage"], dtype=np.float64)
+        i = np.asarray(self._columns["current"], dtype=np.float64)
+        order = np.argsort(self._requested, kind="stable")
+        requested = np.asarray(self._requested)[order]
+        v, i = v[order], i[order]
+        if len(v) < 2:
+            return []
+
+        candidates = []
+        crossings = np.flatnonzero((i[:-1] > 0) & (i[1:] <= 0))
+        if not len(crossings) and self._limit_voltage is not None:
+            # Voc lies between the last point and where the current limit tripped
+            candidates.append((requested[-1] + self._limit_voltage) / 2)
+
+        # Around the maximum power point
+        m = int(np.argmax(v * i))
+        if m > 0:
+            candidates.append((requested[m - 1] + requested[m]) / 2)
+        if m < len(v) - 1:
+            candidates.append((requested[m] + requested[m + 1]) / 2)
+
+        # Across the Voc crossing
+        end = len(v) - 1
+        if len(crossings):
+            j = crossings[0]
+            candidates.append((requested[j] + requested[j + 1]) / 2)
+            end = j
+
+        # Across the steepest interval below Voc (the knee)
+        if end > 0:
+            k = int(np.argmax(np.abs(np.diff(i[:end + 1]))))
+            candidates.append((requested[k] + requested[k + 1]) / 2)
+        return candidates
+
+    def _converged(self, previous, current):
+        for name, tolerance in (("pmax", self.pmax_tolerance), ("ff", self.ff_tolerance)):
+            before, after = previous[name], current[name]
+            if np.isnan(before) and np.isnan(after) and self._limit_voltage is None:
+                continue  # Not determinable from this range (sweep stops below Voc)
+            if not (np.isfinite(before) and np.isfinite(after)) or after == 0:
+                return False
+            if abs(after - before) / abs(after) > tolerance:
+                return False
+        return True
+
+
+class SpotSearch:
+    """Quick Isc, Voc and MPP of one pixel from a few dozen points.
+
+    Isc is read at ``start_voltage``. Voc is bracketed between that point
+    and ``stop_voltage`` (narrowed around the prior Voc when one is given)
+    and bisected until the bracket is ``voc_tolerance`` wide, then linearly
+    interpolated. The MPP is found by a local pattern search on power,
+    starting at the prior Vmpp or a fraction of Voc: keep stepping while the
+    power rises, try the other direction once, then halve the step.
+
+    Voltages are requested as set points, always within ``start_voltage``
+    and ``stop_voltage``; a set point measured before (e.g. during the Voc
+    search) is not requested again. Voc and the MPP are reported from the
+    measured voltages.
+
+    Usage::
+
+        search = SpotSearch(0.0, 1.2)
+        while not search.done:
+            voltage = search.next_voltage()
+            if voltage is not None:
+                search.add(voltage, *measure(voltage))
+        summary = search.summary()
+    """
+
+    def __init__(self, start_voltage, stop_voltage, max_points=SPOT_MAX_POINTS,
+                 voc_tolerance=SPOT_VOC_TOLERANCE, mpp_step=SPOT_MPP_STEP,
+                 mpp_tolerance=SPOT_MPP_TOLERANCE, prior=None):
+        """
+        Args:
+            start_voltage (float): Isc voltage and lowest search voltage (V).
+            stop_voltage (float): Highest search voltage (V).
+            max_points (int): Point budget for the whole measurement.
+            voc_tolerance (float): Final width of the Voc bracket (V).
+            mpp_step (float): Initial step of the MPP search (V).
+            mpp_tolerance (float): Smallest step of the MPP search (V).
+            prior (dict, optional): iv_summary() of a previous sweep of the same pixel.
+        """
+        self.start_voltage = float(start_voltage)
+        self.stop_voltage = float(stop_voltage)
+        self.max_points = int(max_points)
+        self.voc_tolerance = voc_tolerance
+        self.mpp_step = mpp_step
+        self.mpp_tolerance = mpp_tolerance
+        self.prior = prior or {}
+        self.points = []  # (set voltage, measured voltage, current)
+        self.phase = "isc"
+        self.done = False
+        self._stop = None
+        self._voc = float("nan")
+        self._lo = None  # Highest point with positive current
+        self._hi = None  # Lowest point with zero or negative current
+        self._probes = []
+        self._upper = self.stop_voltage
+        self._guess = None
+        self._best = None  # (set voltage, power) of the best MPP search point
+        self._tried = []
+        self._step = mpp_step
+        self._direction = 1
+        self._reversed = False
+
+    def __len__(self):
+        return len(self.points)
+
+    def next_voltage(self):
+        """Return the set voltage to measure next, or None once done."""
+        if not self.done and len(self.points) >= self.max_points:
+            self._finish("budget")
+        if self.done:
+            return None
+        if self.phase == "isc":
+            return self.start_voltage
+        if self.phase == "voc":
+            upper = self._hi[0] if self._hi is not None else self.stop_voltage
+            while self._probes:
+                probe = self._probes.pop(0)
+                if self._lo[0] < probe < upper:
+                    return probe
+            if self._hi is None:
+                return self.stop_voltage
+            return (self._lo[0] + self._hi[0]) / 2
+        if self._best is None:
+            guess = self._clip(self._guess)
+            known = self._measured(guess)
+            if known is None:
+                return guess
+            self._update_mpp(known)
+        while self._step >= self.mpp_tolerance:
+            candidate = self._clip(min(self._best[0] + self._direction * self._step, self._upper))
+            if any(abs(candidate - tried) <= 1e-9 for tried in self._tried):
+                self._reject()
+                continue
+            known = self._measured(candidate)
+            if known is None:
+                return candidate
+            self._update_mpp(known)
+        self._finish("completed")
+        return None
+
+    def add(self, voltage, measured_voltage, current):
+        """Record the reading at a set voltage returned by next_voltage().
+
+        Args:
+            voltage (float): Set voltage (V).
+            measured_voltage (float): Measured voltage (V).
+            current (float): Measured current (A).
+        """
+        point = (float(voltage), float(measured_voltage), float(current))
+        self.points.append(point)
+
+        if self.phase == "isc":
+            self._lo = point
+            if current <= 0:
+                self._finish("no_photocurrent")
+                return
+            self.phase = "voc"
+            voc = self.prior.get("voc")
+            if voc is not None and np.isfinite(voc):
+                self._probes = [voc + SPOT_PRIOR_SPAN, voc - SPOT_PRIOR_SPAN]
+        elif self.phase == "voc":
+            if current > 0:
+                if voltage > self._lo[0]:
+                    self._lo = point
+                if self._hi is None and voltage >= self.stop_voltage:
+                    self._start_mpp()  # Voc lies above the search range
+            elif self._hi is None or voltage < self._hi[0]:
+                self._hi = point
+            if self._hi is not None and self._hi[0] - self._lo[0] <= self.voc_tolerance:
+                (v0, m0, i0), (v1, m1, i1) = self._lo, self._hi
+                self._voc = m0 + i0 * (m1 - m0) / (i0 - i1)
+                self._start_mpp(v0 + i0 * (v1 - v0) / (i0 - i1))
+        else:
+            self._update_mpp(point)
+
+    def stop(self, reason):
+        """End the measurement early, e.g. when the current limit tripped."""
+        self._finish(reason)
+
+    @property
+    def stop_reason(self):
+        """Why the measurement ended: completed, budget, no_photocurrent or a stop() reason."""
+        return self._stop
+
+    def summary(self):
+        """Get the figures of merit measured so far.
+
+        Returns:
+            dict: ``isc``, ``voc``, ``vmpp``, ``impp``, ``pmax``, ``ff`` (NaN
+            where not determined) and ``points``.
+        """
+        summary = dict.fromkeys(("isc", "voc", "vmpp", "impp", "pmax", "ff"), float("nan"))
+        summary["points"] = len(self.points)
+        if not self.points:
+            return summary
+        summary["isc"] = self.points[0][2]
+        summary["voc"] = self._voc
+        _, vmpp, impp = max(self.points, key=lambda point: point[1] * point[2])
+        summary.update(vmpp=vmpp, impp=impp, pmax=vmpp * impp)
+        if summary["voc"] > 0 and summary["isc"] > 0:
+            summary["ff"] = summary["pmax"] / (summary["voc"] * summary["isc"])
+        return summary
+
+    def _start_mpp(self, voc_set=None):
+        self.phase = "mpp"
+        self._upper = voc_set if voc_set is not None else self.stop_voltage
+        vmpp = self.prior.get("vmpp")
+        if vmpp is not None and self.start_voltage < vmpp < self._upper:
+            self._guess = vmpp
+        else:
+            self._guess = self.start_voltage + SPOT_VMPP_VOC_FRACTION * (self._upper - self.start_voltage)
+
+    def _clip(self, voltage):
+        return min(max(voltage, self.start_voltage), self.stop_voltage)
+
+    def _measured(self, voltage):
+        """The point already measured at a set voltage, or None."""
+        for point in self.points:
+            if abs(point[0] - voltage) <= 1e-9:
+                return point
+        return None
+
+    def _update_mpp(self, point):
+        self._tried.append(point[0])
+        power = point[1] * point[2]
+        if self._best is None or power > self._best[1]:
+            self._best = (point[0], power)
+            self._reversed = False
+        else:
+            self._reject()
+
+    def _reject(self):
+        if not self._reversed:
+            self._direction = -self._direction
+            self._reversed = True
+        else:
+            self._step /= 2
+            self._reversed = False
+
+    def _finish(self, reason):
+        if not self.done:
+            self.done = True
+            self._stop = reason
@@ -0,0 +1,150 @@
+import os
+os.environ['OCTOBOARD_SIMULATION'] = 'True'
+
+import threading
+import time
+import unittest
+from software.hardware import BusExecutor, OBoard, OBoardManager
+from software.hardware.constants import BUS_PRIORITY_HIGH, BUS_PRIORITY_LOW
+from software.hardware.mock_hardware import get_bus_state_by_id
+
+
+class TestBusExecutor(unittest.TestCase):
+    def setUp(self):
+        self.bus = BusExecutor(i2c_num=7)
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_call_returns_result_and_raises(self):
+        self.assertEqual(self.bus.call(lambda a, b: a + b, 2, 3), 5)
+        with self.assertRaises(ZeroDivisionError):
+            self.bus.call(lambda: 1 / 0)
+
+    def test_priority_order_of_queued_operations(self):
+        order = []
+        gate = threading.Event()
+        blocker = self.bus.submit(gate.wait)
+        futures = [
+            self.bus.submit(order.append, "low", priority=BUS_PRIORITY_LOW),
+            self.bus.submit(order.append, "normal"),
+            self.bus.submit(order.append, "high", priority=BUS_PRIORITY_HIGH),
+        ]
+        gate.set()
+        for future in [blocker] + futures:
+            future.result()
+        self.assertEqual(order, ["high", "normal", "low"])
+
+    def test_queued_operations_are_batched(self):
+        gate = threading.Event()
+        futures = [self.bus.submit(gate.wait)]
+        futures += [self.bus.submit(lambda: None, name="noop") for _ in range(5)]
+        gate.set()
+        for future in futures:
+            future.result()
+        stats = self.bus.stats()
+        self.assertEqual(stats["batched_operations"], 6)
+        self.assertLess(stats["batches"], 6)
+        self.assertEqual(stats["operations"]["noop"]["count"], 5)
+
+    def test_nested_call_runs_inline(self):
+        self.assertEqual(self.bus.call(lambda: self.bus.call(lambda: 42)), 42)
+
+    def test_reset_stats(self):
+        self.bus.call(lambda: None, name="noop")
+        stats = self.bus.reset_stats()
+        self.assertEqual(stats["operations"]["noop"]["count"], 1)
+        self.assertEqual(self.bus.stats()["operations"], {})
+
+
+class TestSharedBus(unittest.TestCase):
+    def test_boards_share_one_bus_object(self):
+        manager = OBoardManager(i2c_num=1)
+        self.assertIs(manager.bus, BusExecutor.for_bus(1))
+        self.assertTrue(all(board.i2c_num == 1 and board.bus is manager.bus
+                            for board in manager.oboards))
+        self.assertIs(OBoard(i2c_num=1, i2c_address_offset=0).bus.i2c, manager.i2c)
+
+    def test_sweep_steps_run_on_bus(self):
+        manager = OBoardManager(i2c_num=1)
+        manager.bus.reset_stats()
+        manager.run_interleaved_sweep({(0, 0): [0.0, 0.1, 0.2]}, settle_time=0)
+        operations = manager.bus.stats()["operations"]
+        self.assertEqual(operations["set_dac_values"]["count"], 3)
+        self.assertEqual(operations["acquire_raw"]["count"], 3)
+
+
+class TestBusHealth(unittest.TestCase):
+    def setUp(self):
+        self.manager = OBoardManager(i2c_num=1)
+        self.board = self.manager.oboards[0]
+        self.state = get_bus_state_by_id(1)
+        self.manager.bus.health.reset()
+
+    def tearDown(self):
+        self.state.faults.clear()
+        self.state.stuck = False
+
+    def sweep(self):
+        results = self.manager.run_interleaved_sweep({(0, 0): [0.0, 0.1, 0.2]}, settle_time=0)
+        return results[(0, 0)].columns((0, 0))
+
+    def test_transient_nack_retries_the_step(self):
+        self.state.fail(self.board.i2c_base_address[1])
+        result = self.sweep()
+        self.assertEqual(len(result["voltage"]), 3)
+        health = self.manager.bus.health.snapshot()
+        self.assertEqual((health["faults"], health["retried_operations"]), (1, 1))
+        self.assertEqual(health["boards"][self.board.ID]["errors"], 1)
+        self.assertEqual(health["boards"][self.board.ID]["reinits"], 0)
+
+    def test_unresponsive_board_is_reinitialized(self):
+        self.board.set_voltages({1: 0.3})
+        dac = self.board.channel[1].dac
+        self.state.fail(self.board.i2c_base_address[1], 2)
+        self.sweep()
+        health = self.manager.bus.health.snapshot()
+        self.assertEqual(health["boards"][self.board.ID]["reinits"], 1)
+        self.assertEqual(health["failed_operations"], 0)
+        self.assertIsNot(self.board.channel[1].dac, dac)
+        self.assertEqual(self.board.channel[1].dac.raw_value, dac.raw_value)
+
+    def test_stuck_bus_is_reopened(self):
+        self.state.stuck = True
+        result = self.sweep()
+        self.assertEqual(len(result["voltage"]), 3)
+        self.assertEqual(self.manager.bus.health.snapshot()["bus_resets"], 1)
+
+    def test_persistent_fault_gives_up(self):
+        self.state.fail(self.board.i2c_base_address[1], 1000)
+        with self.assertRaises(OSError):
+            self.sweep()
+        self.assertGreaterEqual(self.manager.bus.health.snapshot()["failed_operations"], 1)
+
+    def test_call_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.manager.bus.call(time.sleep, 0.2, timeout=0.01)
+        self.assertEqual(self.manager.bus.health.snapshot()["timeouts"], 1)
+        self.assertIn("health", self.manager.status())
+
+    def test_hung_operation_replaces_bus_thread(self):
+        bus = BusExecutor(i2c_num=7)
+        blocker, gate = threading.Event(), threading.Event()
+        bus.submit(blocker.wait)
+        # Runs in the same batch as, and after, the operation that hangs
+        queued = bus.submit(lambda: "done", priority=BUS_PRIORITY_LOW)
+        threading.Timer(0.05, blocker.set).start()
+        with self.assertRaises(TimeoutError):
+            bus.call(gate.wait, timeout=0.3)
+        self.assertEqual(queued.result(timeout=1), "done")
+        self.assertEqual(bus.call(lambda: 5, timeout=1), 5)
+        health = bus.health.snapshot()
+        self.assertEqual((health["worker_restarts"], health["bus_resets"]), (1, 1))
+
+        gate.set()  # The abandoned thread finishes its operation and exits
+        self.assertEqual(bus.call(lambda: 6, timeout=1), 6)
+        bus.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
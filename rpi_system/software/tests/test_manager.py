@@ -0,0 +1,138 @@
+import os
+os.environ['OCTOBOARD_SIMULATION'] = 'True'
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from software.hardware import OBoardManager, MultiBusManager, AdaptiveGrid
+
+
+class TestInterleavedAcquisition(unittest.TestCase):
+    def setUp(self):
+        self.manager = OBoardManager(i2c_num=1)
+
+    def test_acquire_reads_every_requested_channel(self):
+        keys = [(0, 0), (0, 5), (1, 3), (2, 7)]
+        self.manager.set_voltages({key: 0.5 for key in keys})
+        readings = self.manager.acquire(keys, mux_settle_time=0)
+        self.assertEqual(sorted(readings), sorted(keys))
+        for v, i, timestamp in readings.values():
+            self.assertAlmostEqual(v, 0.5, delta=0.01)
+            self.assertIsInstance(timestamp, str)
+
+    def test_interleaved_sweep_handles_uneven_grids(self):
+        grids = {(0, 0): [0.0, 0.1, 0.2], (1, 1): [0.0, 0.1]}
+        data = self.manager.interleaved_iv_sweep(grids, settle_time=0)
+        self.assertEqual(len(data[(0, 0)]), 3)
+        self.assertEqual(len(data[(1, 1)]), 2)
+        self.assertEqual(self.manager.oboards[0].channel[0].dac.value, 0)
+
+
+
+class TestMultiBus(unittest.TestCase):
+    def setUp(self):
+        self.manager = MultiBusManager([1, 3])
+
+    def test_boards_numbered_across_buses(self):
+        per_bus = len(self.manager.managers[0].oboards)
+        self.assertEqual(len(self.manager.oboards), 2 * per_bus)
+        self.assertEqual(self.manager.oboards[per_bus].i2c_num, 3)
+        manager, local_idx = self.manager.locate(per_bus + 1)
+        self.assertIs(manager, self.manager.managers[1])
+        self.assertEqual(local_idx, 1)
+
+    def test_sweep_results_use_global_keys(self):
+        per_bus = len(self.manager.managers[0].oboards)
+        keys = [(0, 2), (per_bus, 2), (per_bus + 1, 5)]
+        results = self.manager.run_interleaved_sweep(
+            {key: [0.1, 0.3] for key in keys}, settle_time=0,
+            current_limits={(per_bus, 2): 0.5}
+        )
+        self.assertEqual(sorted(results), sorted(keys))
+        for key in keys:
+            self.assertAlmostEqual(results[key].columns(key)["voltage"][1], 0.3, delta=0.01)
+            self.assertEqual(results[key].stop_reasons[key][0], "completed")
+
+    def test_adaptive_sweep_queued_on_bus_worker_finishes(self):
+        # As the API queues a sample: the sweep job itself runs on the bus worker
+        future = self.manager.submit(0, self.manager.run_adaptive_sweep,
+                                     {(0, 1): AdaptiveGrid(0.0, 1.0, max_points=12)}, settle_time=0)
+        grids = future.result(timeout=30)
+        self.assertGreater(len(grids[(0, 1)]), 0)
+        self.assertEqual(len(grids[(0, 1)].next_voltages()), 0)
+        self.assertEqual(self.manager.submit(0, len, "ok").result(timeout=5), 2)
+
+    def test_snapshot_reads_every_channel(self):
+        per_bus = len(self.manager.managers[0].oboards)
+        self.manager.set_voltages({(per_bus, 3): 0.4})
+        before = time.time()
+        readings = self.manager.snapshot()
+        self.assertEqual(list(readings), [(board_idx, ch) for board_idx in range(2 * per_bus)
+                                          for ch in range(8)])
+        self.assertAlmostEqual(readings[(per_bus, 3)][0], 0.4, delta=0.01)
+        self.assertTrue(all(before <= reading_time <= time.time()
+                            for _, _, reading_time in readings.values()))
+
+    def test_snapshot_starts_at_routed_channel(self):
+        self.manager.snapshot()
+        self.manager.reset_io_stats()
+        self.manager.snapshot()
+        stats = self.manager.reset_io_stats()
+        self.assertEqual(stats["mux_selects_skipped"], len(self.manager.oboards))
+
+    def test_snapshot_yields_bus_between_mux_slots(self):
+        manager = self.manager.managers[0]
+        manager.bus.reset_stats()
+        snapshot = manager.submit_snapshot()
+        finished_first = manager.bus.submit(snapshot.done)  # Same priority, queued after slot 0
+        self.assertFalse(finished_first.result(timeout=5))
+        self.assertEqual(len(snapshot.result(timeout=5)), 8 * len(manager.oboards))
+        self.assertEqual(manager.bus.stats()["operations"]["snapshot"]["count"], 8)
+
+
+
+class TestBoardBringUp(unittest.TestCase):
+    def setUp(self):
+        self.cache = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache)
+
+    def test_background_setup_becomes_ready(self):
+        manager = OBoardManager(i2c_num=1, possible_offsets=range(3), background=True)
+        self.assertTrue(manager.ready.wait(10))
+        self.assertEqual(manager.status()["state"], "ready")
+        self.assertEqual(manager.offsets(), [0, 1, 2])
+
+    def test_scan_cache_written_and_used(self):
+        OBoardManager(i2c_num=1, possible_offsets=range(2), scan_cache=self.cache)
+        with open(os.path.join(self.cache, "scan_i2c-1.json")) as f:
+            self.assertEqual(json.load(f)["offsets"], [0, 1])
+        manager = OBoardManager(i2c_num=1, possible_offsets=range(3), scan_cache=self.cache)
+        self.assertEqual(manager.offsets(), [0, 1, 2])
+
+    def test_rescan_appends_new_boards(self):
+        manager = OBoardManager(i2c_num=1, possible_offsets=[1, 3])
+        manager.possible_offsets = range(4)
+        self.assertEqual(manager.rescan(), [0, 2])
+        # Boards in use keep their index; new ones follow in offset order
+        self.assertEqual([board.offset for board in manager.oboards], [1, 3, 0, 2])
+        self.assertEqual(manager.rescan(), [])
+
+    def test_multi_bus_rescan_keeps_global_indices(self):
+        manager = MultiBusManager([1, 3], possible_offsets=[1, 3])
+        before = manager.oboards
+        for bus_manager in manager.managers:
+            bus_manager.possible_offsets = range(3)
+        self.assertEqual(manager.rescan(), {1: [0, 2], 3: [0, 2]})
+        self.assertEqual(manager.oboards[:len(before)], before)
+        self.assertEqual([(board.i2c_num, board.offset) for board in manager.oboards[len(before):]],
+                         [(1, 0), (1, 2), (3, 0), (3, 2)])
+        bus_manager, local_idx = manager.locate(len(before))
+        self.assertIs(bus_manager.oboards[local_idx], manager.oboards[len(before)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import os
+os.environ['OCTOBOARD_SIMULATION'] = 'True'
+
+import time
+import unittest
+import numpy as np
+from software.hardware import OBoardManager, MultiBusManager, MPPTEngine, MPPTState, MPPT_STRATEGIES, \
+    SweepPlan, iv_summary, mpp_curvature, warm_start_step
+
+
+class TestMPPTEngine(unittest.TestCase):
+    def setUp(self):
+        self.manager = OBoardManager(i2c_num=1)
+
+    def test_channels_converge_to_mpp(self):
+        keys = [(0, 0), (1, 3), (2, 7)]
+        engine = MPPTEngine(self.manager, channels=keys, settle_time=0)
+        for _ in range(60):
+            engine.step()
+
+        stats = engine.stats()
+        self.assertEqual(sorted(stats["channels"]), keys)
+        data = self.manager.interleaved_iv_sweep({key: np.arange(0, 1.0, 0.01) for key in keys},
+                                                 settle_time=0)
+        for key in keys:
+            reference = iv_summary([p["voltage"] for p in data[key]],
+                                   [p["current"] for p in data[key]])
+            reading = stats["channels"][key]
+            self.assertEqual(reading["updates"], 60)
+            self.assertAlmostEqual(reading["set_voltage"], reference["vmpp"], delta=0.05)
+            self.assertGreater(reading["power"], 0.95 * reference["pmax"])
+
+    def test_warm_start_converges_faster(self):
+        np.random.seed(0)  # Simulated ADC noise
+        keys = [(board_idx, ch) for board_idx in range(4) for ch in range(2)]
+        data = self.manager.interleaved_iv_sweep({key: np.arange(0, 1.0, 0.02) for key in keys},
+                                                 settle_time=0)
+        summaries = {}
+        for key in keys:
+            voltage = [p["voltage"] for p in data[key]]
+            current = [p["current"] for p in data[key]]
+            summaries[key] = dict(iv_summary(voltage, current), curvature=mpp_curvature(voltage, current))
+
+        passes = {}
+        for warm in (False, True):
+            for board_idx, ch in keys:
+                self.manager.oboards[board_idx].channel[ch].warm_start(0.0)
+            engine = MPPTEngine(self.manager, channels=keys, settle_time=0)
+            if warm:
+                engine.warm_start(summaries)
+            for _ in range(30):
+                engine.step()
+            convergence = engine.stats()["convergence"]
+            self.assertEqual(convergence["converging"], 0)
+            passes[warm] = convergence["passes_mean"]
+            self.assertEqual(engine.stats()["channels"][keys[0]]["warm"], warm)
+        self.assertLess(passes[True], passes[False])
+
+    def test_every_strategy_tracks_mpp(self):
+        keys = [(0, 0), (1, 3)]
+        data = self.manager.interleaved_iv_sweep({key: np.arange(0, 1.0, 0.01) for key in keys},
+                                                 settle_time=0)
+        for name in MPPT_STRATEGIES:
+            with self.subTest(strategy=name):
+                for board_idx, ch in keys:
+                    self.manager.oboards[board_idx].channel[ch].warm_start(0.0)
+                engine = MPPTEngine(self.manager, channels=keys, settle_time=0, strategy=name)
+                for _ in range(40):
+                    engine.step()
+                stats = engine.stats()
+                self.assertEqual(stats["convergence"]["converging"], 0)
+                for key in keys:
+                    reference = iv_summary([p["voltage"] for p in data[key]],
+                                           [p["current"] for p in data[key]])
+                    self.assertGreater(stats["channels"][key]["power"], 0.95 * reference["pmax"])
+
+    def test_strategy_per_channel(self):
+        engine = MPPTEngine(self.manager, channels=[(0, 0), (0, 1)], settle_time=0,
+                            strategy={(0, 1): "golden_section"})
+        engine.step()
+        channels = engine.stats()["channels"]
+        self.assertEqual(channels[(0, 0)]["strategy"], "perturb_observe")
+        self.assertEqual(channels[(0, 1)]["strategy"], "golden_section")
+        with self.assertRaises(ValueError):
+            MPPTEngine(self.manager, channels=[(0, 0)], strategy="newton")
+
+    def test_warm_start_step(self):
+        self.assertAlmostEqual(warm_start_step(0.01, -0.4, tolerance=0.005), np.sqrt(0.00025))
+        self.assertEqual(warm_start_step(0.01, float("nan")), warm_start_step(0.0, -0.4))
+
+    def test_background_loop_reports_rate(self):
+        engine = MPPTEngine(self.manager, channels=[(0, 0), (0, 1)], rate=20, settle_time=0)
+        engine.start()
+        time.sleep(1.0)
+        engine.stop()
+        self.assertFalse(engine.running)
+
+        stats = engine.stats()
+        bus = stats["buses"][1]
+        self.assertGreater(bus["passes"], 5)
+        self.assertEqual(bus["errors"], 0)
+        self.assertLessEqual(stats["rate"], 25)
+        self.assertEqual(stats["channels"][(0, 0)]["updates"], bus["passes"])
+
+    def test_pause_and_resume(self):
+        keys = [(0, 0), (0, 1)]
+        engine = MPPTEngine(self.manager, channels=keys, settle_time=0)
+        for _ in range(5):
+            engine.step()
+        engine.pause([(0, 1)])
+        set_voltage = engine.stats()["channels"][(0, 1)]["set_voltage"]
+        self.manager.oboards[0].channel[1].set_voltage(0.0)  # e.g. a sweep of the channel
+        for _ in range(5):
+            engine.step()
+        channels = engine.stats()["channels"]
+        self.assertEqual(channels[(0, 0)]["updates"], 10)
+        self.assertEqual(channels[(0, 1)]["updates"], 5)
+        self.assertFalse(channels[(0, 1)]["active"])
+        self.assertEqual(engine.stats()["convergence"]["converging"]
+                         + engine.stats()["convergence"]["converged"], 1)
+
+        engine.resume([(0, 1)], summaries={(0, 1): {"vmpp": 0.5, "pmax": 0.01}, (0, 0): {"vmpp": 0.1}})
+        engine.step()
+        channels = engine.stats()["channels"]
+        self.assertTrue(channels[(0, 1)]["warm"])
+        self.assertFalse(channels[(0, 0)]["warm"])
+        self.assertAlmostEqual(channels[(0, 1)]["set_voltage"], 0.5)
+        self.assertNotAlmostEqual(channels[(0, 1)]["set_voltage"], set_voltage)
+        # The DAC is written again although the set point did not change while paused
+        self.assertAlmostEqual(channels[(0, 1)]["voltage"], 0.5, delta=0.05)
+
+        engine.pause()
+        updates = engine.stats()["channels"][(0, 0)]["updates"]
+        engine.step()
+        self.assertEqual(engine.stats()["channels"][(0, 0)]["updates"], updates)
+
+    def test_set_strategy_while_tracking(self):
+        engine = MPPTEngine(self.manager, channels=[(0, 0), (0, 1)], settle_time=0)
+        engine.step()
+        engine.set_strategy([(0, 1)], "incremental_conductance")
+        engine.step()
+        channels = engine.stats()["channels"]
+        self.assertEqual(channels[(0, 0)]["strategy"], "perturb_observe")
+        self.assertEqual(channels[(0, 1)]["strategy"], "incremental_conductance")
+        with self.assertRaises(ValueError):
+            engine.set_strategy([(0, 0)], "newton")
+
+    def test_multi_bus_tracks_every_bus(self):
+        manager = MultiBusManager([1, 3])
+        per_bus = len(manager.managers[0].oboards)
+        keys = [(0, 0), (per_bus, 0)]
+        engine = MPPTEngine(manager, channels=keys, settle_time=0)
+        engine.step()
+        stats = engine.stats()
+        self.assertEqual(sorted(stats["buses"]), [1, 3])
+        self.assertEqual(sorted(stats["channels"]), keys)
+
+
+class TestMPPTState(unittest.TestCase):
+    def setUp(self):
+        self.manager = OBoardManager(i2c_num=1)
+
+    def test_update_matches_channel_step(self):
+        channels = {(0, ch): self.manager.oboards[0].channel[ch] for ch in range(8)}
+        reference_board = OBoardManager(i2c_num=1).oboards[0]
+        reference = {(0, ch): reference_board.channel[ch] for ch in range(8)}
+        state = MPPTState(channels)
+        rng = np.random.default_rng(1)
+        volts_per_code = channels[(0, 0)].convert_to_voltage(1)
+        for _ in range(30):
+            raw_v = rng.integers(0, 20000, 8)
+            raw_c = rng.integers(0, 200, 8)
+            voltage, current = state.update(raw_v, raw_c)
+            for row, channel in enumerate(reference.values()):
+                channel.mppt_step(raw_v[row] * volts_per_code,
+                                  raw_c[row] * volts_per_code / channel.R_shunt)
+                self.assertAlmostEqual(state.voltage[row], channel.last_v)
+                self.assertAlmostEqual(state.step[row], channel.dv)
+            self.assertAlmostEqual(voltage[0], raw_v[0] * volts_per_code)
+
+    def test_store_writes_channel_attributes(self):
+        channel = self.manager.oboards[1].channel[2]
+        state = MPPTState({(1, 2): channel})
+        state.update(np.array([8000]), np.array([100]))
+        state.store()
+        self.assertEqual(channel.last_v, state.voltage[0])
+        self.assertEqual(channel.last_dir, state.direction[0])
+
+    def test_dac_values_clip_to_limits(self):
+        state = MPPTState({(0, 0): self.manager.oboards[0].channel[0]})
+        state.voltage = np.array([5.0])
+        self.assertEqual(state.dac_values()[0], SweepPlan([5.0]).dac_values[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
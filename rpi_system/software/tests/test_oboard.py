@@ -0,0 +1,216 @@
+import os
+os.environ['OCTOBOARD_SIMULATION'] = 'True'
+
+import unittest
+from software.hardware import OBoard, BusExecutor
+from software.hardware.constants import ADC_MUX_MIN_SETTLE, ADC_MUX_SETTLE_CONVERSIONS
+
+
+class TestLockstepSweep(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+
+    def test_returns_one_point_per_voltage_per_channel(self):
+        voltages = [0.0, 0.1, 0.2]
+        data = self.board.lockstep_iv_sweep([0, 1, 2, 3], voltages, settle_time=0)
+        self.assertEqual(sorted(data), [0, 1, 2, 3])
+        for points in data.values():
+            self.assertEqual(len(points), len(voltages))
+            self.assertEqual(set(points[0]), {"timestamp", "voltage", "current", "power"})
+
+    def test_current_limit_drops_channel(self):
+        data = self.board.lockstep_iv_sweep([4, 5], [0.0, 0.1], settle_time=0,
+                                            current_limit=0.0)
+        self.assertEqual(data, {4: [], 5: []})
+        self.assertEqual(self.board.channel[4].dac.value, 0)
+
+
+class TestMuxCache(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+
+    def test_repeated_select_is_skipped(self):
+        self.assertTrue(self.board.aMux_select_channel(3, settle=False))
+        self.assertFalse(self.board.aMux_select_channel(3, settle=False))
+        self.assertEqual(self.board.io_stats["mux_selects_skipped"], 1)
+        self.assertEqual(self.board.io_stats["sleep_time_saved"], self.board.adc_settle_time())
+
+    def test_address_written_as_port(self):
+        self.board.aMux_select_channel(1, settle=False)
+        self.board.aMux_select_channel(6, settle=False)
+        self.assertEqual((self.board.Mux.gpioa >> 4) & 0x07, 6)
+
+    def test_reset_io_stats(self):
+        self.board.channel[0].read_voltage()
+        self.board.channel[0].read_current()
+        stats = self.board.reset_io_stats()
+        self.assertEqual(stats["mux_selects"], 2)
+        self.assertGreater(stats["sleep_time_saved"], 0)
+        self.assertEqual(self.board.io_stats["mux_selects"], 0)
+
+
+class TestGpioLatch(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+        self.bus = self.board.Mux._bus
+
+    def test_gain_change_is_one_write(self):
+        self.board.softdac.gain = 0
+        before = self.bus.transactions
+        self.board.softdac.gain = 5
+        self.assertEqual(self.bus.transactions - before, 1)
+        self.assertEqual(self.board.Mux.gpiob & 0x0F, 0b0101)
+
+    def test_same_gain_does_no_traffic(self):
+        self.board.softdac.gain = 3
+        before = self.bus.transactions
+        self.board.softdac.gain = 3
+        self.assertEqual(self.bus.transactions, before)
+        self.assertEqual(self.board.io_stats["gpio_writes_skipped"], 1)
+
+    def test_mux_and_gain_share_latch(self):
+        self.board.softdac.gain = 7
+        self.board.aMux_select_channel(2, settle=False)
+        self.assertEqual(self.board.softdac.gain, 7)
+        self.assertEqual(self.board.Mux.gpio & 0x0F70, (0b0111 << 8) | (2 << 4))
+
+    def test_combined_select_and_gain_is_one_write(self):
+        self.board.aMux_select_channel(0, settle=False, softdac_gain=0)
+        before = self.bus.transactions
+        self.board.aMux_select_channel(5, settle=False, softdac_gain=2)
+        self.assertEqual(self.bus.transactions - before, 1)
+        self.assertEqual(self.board.Mux.gpio & 0x0F70, (0b0010 << 8) | (5 << 4))
+
+
+class TestDirectTransport(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0,
+                            bus=BusExecutor(i2c_num=1, fast_path=True))
+        self.bus = self.board.Mux._bus
+
+    def test_dac_write_is_one_transaction(self):
+        before = self.bus.transactions
+        self.board.channel[5].set_voltage(0.3)
+        self.assertEqual(self.bus.transactions - before, 1)
+        self.assertEqual(self.board.channel[5].dac.raw_value,
+                         self.board.channel[5].voltage_to_dac_value(0.3) >> 4)
+
+    def test_set_voltage_uses_transport(self):
+        writes = []
+        dac_write = self.board.dac_write
+        self.board.dac_write = lambda ch, value: (writes.append((ch, value)), dac_write(ch, value))
+        self.board.channel[4].set_voltage(5.0)  # Clamped to the voltage limits
+        self.assertEqual(writes, [(4, self.board.channel[4].voltage_to_dac_value(5.0))])
+
+    def test_read_vi_matches_voltage(self):
+        self.board.channel[1].set_voltage(0.4)
+        self.board.set_voltages({2: 0.2, 3: 0.6})
+        for ch, voltage in ((1, 0.4), (2, 0.2), (3, 0.6)):
+            v, i, timestamp = self.board.channel[ch].read_vi()
+            self.assertAlmostEqual(v, voltage, delta=0.01)
+
+
+class TestReadVI(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+
+    def test_single_mux_select_per_point(self):
+        self.board.channel[2].set_voltage(0.4)
+        v, i, timestamp = self.board.channel[2].read_vi()
+        self.assertAlmostEqual(v, 0.4, delta=0.01)
+        self.assertGreater(i, 0)
+        self.assertEqual(self.board.io_stats["mux_selects"], 1)
+
+    def test_batched_read(self):
+        readings = self.board.read_vi([0, 1, 7])
+        self.assertEqual(sorted(readings), [0, 1, 7])
+        self.assertEqual(self.board.io_stats["mux_selects"], 3)
+
+
+class TestAdcConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+
+    def test_gain_and_data_rate_are_independent(self):
+        gain = self.board.Adc.gain
+        previous = self.board.configure_adc(data_rate=860)
+        self.assertEqual(self.board.Adc.data_rate, 860)
+        self.assertEqual(self.board.Adc.gain, gain)
+        self.board.configure_adc(*previous)
+        self.assertEqual(self.board.Adc.data_rate, previous[1])
+
+    def test_invalid_data_rate(self):
+        with self.assertRaises(ValueError):
+            self.board.configure_adc(data_rate=100)
+
+    def test_sweep_restores_data_rate(self):
+        rate = self.board.Adc.data_rate
+        self.board.lockstep_iv_sweep([0], [0.1], settle_time=0, data_rate=860)
+        self.assertEqual(self.board.Adc.data_rate, rate)
+
+    def test_mux_settle_has_floor(self):
+        previous = self.board.configure_adc(data_rate=860)
+        self.assertEqual(self.board.adc_settle_time(), ADC_MUX_MIN_SETTLE)
+        self.board.configure_adc(data_rate=8)
+        self.assertAlmostEqual(self.board.adc_settle_time(), ADC_MUX_SETTLE_CONVERSIONS / 8)
+        self.board.configure_adc(*previous)
+
+
+class TestSetVoltages(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+
+    def test_fast_write_updates_all_requested_channels(self):
+        voltages = {0: 0.2, 2: 0.4, 3: 0.6, 5: 0.8, 6: 1.0}
+        self.board.set_voltages(voltages)
+        for ch, v in voltages.items():
+            channel = self.board.channel[ch]
+            self.assertEqual(channel.dac.raw_value, channel.voltage_to_dac_value(v) >> 4)
+
+    def test_untouched_channels_keep_their_code(self):
+        self.board.channel[1].set_voltage(0.5)
+        code = self.board.channel[1].dac.raw_value
+        self.board.set_voltages({0: 0.1, 2: 0.3})
+        self.assertEqual(self.board.channel[1].dac.raw_value, code)
+
+
+
+class TestAutoRange(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+        self.channel = self.board.channel[0]
+
+    def test_gain_selection(self):
+        self.assertEqual(OBoard.autorange_gain(32767, 16), 8)   # Saturated: one step wider
+        self.assertEqual(OBoard.autorange_gain(32767, 2 / 3), 2 / 3)
+        self.assertEqual(OBoard.autorange_gain(1000, 1), 16)    # Small: narrowest that fits
+        self.assertEqual(OBoard.autorange_gain(20000, 2), 2)
+
+    def test_saturated_current_is_retried_at_wider_range(self):
+        self.channel.set_voltage(0.9)  # Past Voc: tens of mA of reverse current
+        self.channel.gain_c = 16  # +/-0.256 V over 20 Ohm: saturates above 12.8 mA
+        v, i, timestamp = self.channel.read_vi()
+        self.assertGreater(abs(i), 0.0128 * 1.1)
+        self.assertGreater(self.board.io_stats["adc_range_retries"], 0)
+        self.assertLess(self.channel.gain_c, 16)
+
+    def test_ranges_are_remembered_per_channel(self):
+        self.channel.set_voltage(0.2)
+        self.channel.read_vi()
+        self.board.reset_io_stats()
+        self.channel.read_vi()
+        self.assertEqual(self.board.io_stats["adc_range_retries"], 0)
+        # Voltage and current pairs alternate, so each conversion changes the config
+        self.assertEqual(self.board.io_stats["adc_config_changes"], 2)
+
+    def test_disabled_uses_board_gain(self):
+        self.board.autorange = False
+        self.channel.gain_c = 16
+        self.channel.set_voltage(0.2)
+        self.channel.read_vi()
+        self.assertEqual(self.channel.pga_gain(0), self.board.Adc.gain)
+        self.assertEqual(self.board.io_stats["adc_range_retries"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
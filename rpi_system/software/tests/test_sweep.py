@@ -0,0 +1,281 @@
+import os
+os.environ['OCTOBOARD_SIMULATION'] = 'True'
+
+import time
+import unittest
+import numpy as np
+from software.hardware import OBoard, OBoardManager, SweepPlan, AdaptiveGrid, SettleCriterion, Oversampling, TerminationPolicy, SpotSearch, iv_summary, mpp_curvature
+
+
+class TestSweepPlan(unittest.TestCase):
+    def test_plans_are_cached_by_config(self):
+        plan = SweepPlan.for_config(0.0, 1.2, 0.01)
+        self.assertIs(plan, SweepPlan.for_config(0.0, 1.2, 0.01))
+        self.assertIsNot(plan, SweepPlan.for_config(0.0, 1.2, 0.02))
+        self.assertEqual(len(plan), len(np.arange(0.0, 1.21, 0.01)))
+
+    def test_dac_values_match_channel_conversion(self):
+        board = OBoard(i2c_num=1, i2c_address_offset=0)
+        plan = SweepPlan([0.0, 0.33, 0.9, 5.0])
+        for voltage, dac_value in zip(plan.voltages, plan.dac_values):
+            self.assertEqual(dac_value, board.channel[0].voltage_to_dac_value(voltage))
+
+
+class TestSweepResult(unittest.TestCase):
+    def test_vectorized_conversion_matches_channel(self):
+        board = OBoard(i2c_num=1, i2c_address_offset=0)
+        result = board.run_sweep([0, 1], SweepPlan([0.0, 0.1, 0.2]), settle_time=0)
+        channel = board.channel[1]
+        columns = result.columns(1)
+        self.assertEqual(len(columns["timestamp"]), 3)
+        for step in range(3):
+            self.assertAlmostEqual(columns["voltage"][step],
+                                   channel.convert_to_voltage(result.raw_voltage[1, step]))
+            self.assertAlmostEqual(columns["current"][step],
+                                   channel.convert_to_current(result.raw_current[1, step]))
+
+
+def diode_current(voltage):
+    """Ideal test curve: Isc 10 mA, Voc 0.8 V."""
+    return 0.01 - 0.01 * np.expm1(np.asarray(voltage) / 0.04) / np.expm1(0.8 / 0.04)
+
+
+class TestIVSummary(unittest.TestCase):
+    def test_figures_of_merit(self):
+        voltage = np.linspace(0, 1.0, 1001)
+        summary = iv_summary(voltage, diode_current(voltage))
+        self.assertAlmostEqual(summary["isc"], 0.01, places=6)
+        self.assertAlmostEqual(summary["voc"], 0.8, places=3)
+        self.assertAlmostEqual(summary["ff"], summary["pmax"] / (0.8 * 0.01), places=3)
+
+    def test_voc_outside_range_is_nan(self):
+        voltage = np.linspace(0, 0.5, 11)
+        summary = iv_summary(voltage, diode_current(voltage))
+        self.assertTrue(np.isnan(summary["voc"]))
+        self.assertTrue(np.isnan(summary["ff"]))
+
+    def test_mpp_curvature(self):
+        fine = np.linspace(0, 1.0, 10001)
+        power = fine * diode_current(fine)
+        m = np.argmax(power)
+        exact = (power[m + 10] - 2 * power[m] + power[m - 10]) / (fine[10] - fine[0]) ** 2
+        voltage = np.linspace(0, 1.0, 201)
+        self.assertAlmostEqual(mpp_curvature(voltage, diode_current(voltage)), exact, delta=0.1 * abs(exact))
+        self.assertTrue(np.isnan(mpp_curvature([0.0, 0.5], [0.01, 0.005])))
+
+
+class TestAdaptiveGrid(unittest.TestCase):
+    def run_grid(self, grid, current_limit=None):
+        while not grid.done:
+            voltages = grid.next_voltages()
+            measured = voltages
+            if current_limit is not None:
+                tripped = np.flatnonzero(np.abs(diode_current(voltages)) > current_limit)
+                if len(tripped):
+                    measured = voltages[:tripped[0]]  # Sweep stops at the limit
+            grid.add(voltages, {"voltage": measured, "current": diode_current(measured)})
+        return grid
+
+    def test_converges_within_budget(self):
+        reference = iv_summary(np.linspace(0, 1.2, 121), diode_current(np.linspace(0, 1.2, 121)))
+        grid = self.run_grid(AdaptiveGrid(0.0, 1.2, max_points=40))
+        summary = grid.summary()
+        self.assertLessEqual(len(grid), 40)
+        self.assertLess(len(grid), 121)
+        self.assertAlmostEqual(summary["pmax"], reference["pmax"], delta=0.01 * reference["pmax"])
+        self.assertAlmostEqual(summary["voc"], 0.8, delta=0.01)
+        self.assertTrue(np.all(np.diff(grid.columns()["voltage"]) > 0))
+
+    def test_prior_focuses_first_pass(self):
+        prior = iv_summary(np.linspace(0, 1.2, 121), diode_current(np.linspace(0, 1.2, 121)))
+        voltages = AdaptiveGrid(0.0, 1.2, prior=prior).next_voltages()
+        self.assertTrue(np.any(np.abs(voltages - prior["vmpp"]) < 1e-9))
+        self.assertTrue(np.any(np.abs(voltages - prior["voc"]) < 1e-9))
+
+    def test_current_limit_bisects_towards_voc(self):
+        grid = self.run_grid(AdaptiveGrid(0.0, 1.2, max_points=40), current_limit=0.02)
+        self.assertAlmostEqual(grid.summary()["voc"], 0.8, delta=0.01)
+
+    def test_manager_runs_grids_on_hardware(self):
+        manager = OBoardManager(i2c_num=1)
+        keys = [(0, 0), (1, 2)]
+        grids = manager.run_adaptive_sweep(
+            {key: AdaptiveGrid(0.0, 1.2) for key in keys}, settle_time=0,
+            current_limits={key: 0.05 for key in keys}
+        )
+        for key in keys:
+            self.assertTrue(grids[key].done)
+            self.assertGreater(grids[key].summary()["pmax"], 0)
+
+
+class TestSpotSearch(unittest.TestCase):
+    def run_search(self, search, current=diode_current):
+        while not search.done:
+            voltage = search.next_voltage()
+            if voltage is not None:
+                search.add(voltage, voltage, float(current(np.array([voltage]))[0]))
+        return search
+
+    def test_matches_dense_sweep_with_few_points(self):
+        v = np.linspace(0, 1.2, 1201)
+        reference = iv_summary(v, diode_current(v))
+        search = self.run_search(SpotSearch(0.0, 1.2))
+        summary = search.summary()
+        self.assertEqual(search.stop_reason, "completed")
+        self.assertLessEqual(summary["points"], 30)
+        self.assertAlmostEqual(summary["isc"], reference["isc"], places=9)
+        self.assertAlmostEqual(summary["voc"], reference["voc"], delta=0.002)
+        self.assertAlmostEqual(summary["pmax"], reference["pmax"], delta=0.002 * reference["pmax"])
+
+    def test_prior_saves_points(self):
+        v = np.linspace(0, 1.2, 121)
+        prior = iv_summary(v, diode_current(v))
+        without = self.run_search(SpotSearch(0.0, 1.2))
+        with_prior = self.run_search(SpotSearch(0.0, 1.2, prior=prior))
+        self.assertLess(len(with_prior), len(without))
+        self.assertAlmostEqual(with_prior.summary()["voc"], without.summary()["voc"], delta=0.002)
+
+    def test_requests_stay_in_range_and_are_not_repeated(self):
+        for voc in (0.79, 0.9):
+            with self.subTest(prior_voc=voc):
+                requested = []
+                search = SpotSearch(0.0, 0.8, prior={"voc": voc, "vmpp": 0.7})
+
+                def current(v):
+                    requested.append(float(v[0]))
+                    return diode_current(v)
+                self.run_search(search, current=current)
+                self.assertLessEqual(max(requested), 0.8)
+                self.assertEqual(len(set(requested)), len(requested))
+                self.assertEqual(len(search), len(requested))
+
+    def test_budget_and_dark_cell(self):
+        search = self.run_search(SpotSearch(0.0, 1.2, max_points=5))
+        self.assertEqual((len(search), search.stop_reason), (5, "budget"))
+        dark = self.run_search(SpotSearch(0.0, 1.2), current=lambda v: -1e-6 * v)
+        self.assertEqual((len(dark), dark.stop_reason), (1, "no_photocurrent"))
+        self.assertTrue(np.isnan(dark.summary()["voc"]))
+
+    def test_board_runs_searches_in_lockstep(self):
+        board = OBoard(i2c_num=1, i2c_address_offset=0)
+        searches = {ch: SpotSearch(0.0, 1.2) for ch in (0, 1)}
+        summaries = board.run_spot(searches, settle_time=0)
+        for ch in (0, 1):
+            self.assertEqual(searches[ch].stop_reason, "completed")
+            self.assertGreater(summaries[ch]["pmax"], 0)
+            self.assertEqual(board.channel[ch].dac.value, 0)
+
+
+class TestSettleCriterion(unittest.TestCase):
+    def setUp(self):
+        self.channel = OBoard(i2c_num=1, i2c_address_offset=0).channel[0]
+        self.lsb_codes = 1 << (16 - self.channel.board.Adc.bits)
+
+    def reader(self, sequence):
+        """Read function returning the next raw voltage code of ``sequence`` each call."""
+        readings = iter(sequence)
+        def read(keys):
+            code = next(readings) * self.lsb_codes
+            return {key: (code, 100 * self.lsb_codes, time.monotonic()) for key in keys}
+        return read
+
+    def test_stops_once_readings_agree(self):
+        # One LSB is far below the default tolerance
+        settle = SettleCriterion(max_time=10, min_time=0, consecutive=1)
+        read = self.reader([1000, 500, 400, 400, 401, 0])
+        settled = settle.wait(read, {0: self.channel}, time.monotonic())
+        raw_v, raw_c, timestamp, settle_time = settled[0]
+        self.assertEqual(raw_v, 400 * self.lsb_codes)
+        self.assertGreaterEqual(settle_time, 0)
+
+    def test_max_time_bounds_the_dwell(self):
+        settle = SettleCriterion(max_time=0.01, min_time=0)
+        read = self.reader(range(0, 10 ** 7, 1000))
+        start = time.monotonic()
+        settled = settle.wait(read, {0: self.channel}, start)
+        self.assertGreaterEqual(settled[0][3], 0.01)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_sweep_records_settle_times(self):
+        board = self.channel.board
+        result = board.run_sweep([0, 3], SweepPlan([0.1, 0.5]), settle=SettleCriterion(max_time=0.05))
+        columns = result.columns(3)
+        self.assertEqual(len(columns["settle_time"]), 2)
+        self.assertFalse(np.any(np.isnan(columns["settle_time"])))
+        self.assertNotIn("settle_time", board.run_sweep([0], SweepPlan([0.1]), settle_time=0).columns(0))
+
+
+
+class TestOversampling(unittest.TestCase):
+    def setUp(self):
+        self.board = OBoard(i2c_num=1, i2c_address_offset=0)
+        self.channel = self.board.channel[0]
+
+    def test_constant_readings_stop_at_min_samples(self):
+        oversampling = Oversampling(16, min_samples=3)
+        raw_v, raw_c, stats, done = oversampling.reduce(self.channel, [100, 100], [50, 50])
+        self.assertFalse(done)
+        raw_v, raw_c, stats, done = oversampling.reduce(self.channel, [100] * 3, [50] * 3)
+        self.assertTrue(done)
+        self.assertEqual((raw_v, raw_c), (100, 50))
+        self.assertEqual(stats, (3, 0, 0))
+
+    def test_noisy_readings_use_max_samples(self):
+        oversampling = Oversampling(4, stderr_voltage=1e-9, stderr_current=1e-12)
+        self.assertFalse(oversampling.reduce(self.channel, [0, 1000, 0], [0, 1000, 0])[3])
+        self.assertTrue(oversampling.reduce(self.channel, [0, 1000, 0, 1000], [0, 1000, 0, 1000])[3])
+
+    def test_sweep_reports_samples_and_standard_error(self):
+        result = self.board.run_sweep([0, 1], SweepPlan([0.2, 0.6]), settle_time=0,
+                                      oversampling=Oversampling(5, stderr_voltage=1e-9))
+        columns = result.columns(1)
+        np.testing.assert_array_equal(columns["samples"], [5, 5])
+        self.assertTrue(np.all(columns["stderr_voltage"] > 0))
+        self.assertAlmostEqual(columns["voltage"][1], 0.6, delta=0.01)
+
+    def test_acquire_oversampled_per_channel(self):
+        manager = OBoardManager(i2c_num=1)
+        keys = [(0, 0), (1, 1)]
+        readings = manager.acquire_oversampled(keys, {(0, 0): Oversampling(6, stderr_voltage=1e-9)})
+        self.assertEqual(readings[(0, 0)][3][0], 6)
+        self.assertEqual(readings[(1, 1)][3][0], 1)
+
+
+
+class TestTerminationPolicy(unittest.TestCase):
+    def test_stops_points_past_voc(self):
+        policy = TerminationPolicy(points_past_voc=2, predict_current_limit=False)
+        voltages = [0.7, 0.75, 0.8, 0.85, 0.9]
+        currents = [0.008, 0.004, -0.001, -0.01, -0.03]
+        self.assertIsNone(policy.check(voltages[:3], currents[:3], 0.85))
+        self.assertEqual(policy.check(voltages[:4], currents[:4], 0.9), "voc")
+
+    def test_predicts_current_limit_before_exceeding_it(self):
+        policy = TerminationPolicy()
+        voltage = np.arange(0.0, 1.2, 0.01)
+        current = diode_current(voltage)
+        for n in range(3, len(voltage)):
+            if policy.check(voltage[:n], current[:n], voltage[n], current_limit=0.02):
+                break
+        self.assertLessEqual(abs(current[n - 1]), 0.02)
+        self.assertLessEqual(abs(current[n]), 0.05)  # Stopped close to the limit, not far before
+
+    def test_sweep_records_stop_reasons(self):
+        manager = OBoardManager(i2c_num=1)
+        keys = [(0, 0), (0, 1)]
+        results = manager.run_interleaved_sweep(
+            {key: SweepPlan.for_config(0.0, 1.2, 0.01) for key in keys}, settle_time=0,
+            current_limits={key: 0.02 for key in keys},
+            termination={(0, 0): TerminationPolicy(points_past_voc=2)}
+        )
+        reason, stop_voltage = results[(0, 0)].stop_reasons[(0, 0)]
+        self.assertEqual(reason, "voc")
+        self.assertLess(results[(0, 0)].columns((0, 0))["current"][-1], 0)
+        self.assertEqual(results[(0, 1)].stop_reasons[(0, 1)][0], "current_limit")
+
+        result = manager.oboards[0].run_sweep([2], SweepPlan([0.1, 0.2]), settle_time=0)
+        self.assertEqual(result.stop_reasons[2], ("completed", 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
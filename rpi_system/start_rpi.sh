@@ -8,6 +8,7 @@ export MAIN_PC_IP="${MAIN_PC_IP:-192.168.2.1}"      # Main PC IP address (direct
 export API_PORT="${API_PORT:-8001}"                 # API port (8001 for RPi1, 8002 for RPi2, 8003 for RPi3)
 export OCTOBOARD_SIMULATION="${OCTOBOARD_SIMULATION:-False}"  # False for real hardware, True for testing
 export OCTOBOARD_I2C_BUS="${OCTOBOARD_I2C_BUS:-1}"  # I2C bus number (usually 1)
+export OCTOBOARD_I2C_BUSES="${OCTOBOARD_I2C_BUSES:-$OCTOBOARD_I2C_BUS}"  # Comma-separated buses, swept in parallel
 
 # Colors for output
 GREEN='\033[0;32m'
@@ -21,7 +22,7 @@ echo -e "RPi ID: ${YELLOW}$RPI_ID${NC}"
 echo -e "Main PC IP: ${YELLOW}$MAIN_PC_IP${NC}"
 echo -e "API Port: ${YELLOW}$API_PORT${NC}"
 echo -e "Simulation Mode: ${YELLOW}$OCTOBOARD_SIMULATION${NC}"
-echo -e "I2C Bus: ${YELLOW}$OCTOBOARD_I2C_BUS${NC}"
+echo -e "I2C Buses: ${YELLOW}$OCTOBOARD_I2C_BUSES${NC}"
 echo "========================================="
 
 # Check if venv exists